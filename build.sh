@@ -24,6 +24,14 @@ echo -e "${YELLOW}[3/3]${NC} 正在建置 MCP Server Image..."
 docker build -f zap-mcp/Dockerfile.mcp -t zap-mcp-server:latest ./zap-mcp
 echo -e "${GREEN}✓${NC} MCP Server Image 建置完成"
 
+# 選用：建置內建 Reporter 的 MCP Server (inprocess 報告生成模式)
+if [ "${BUILD_INPROCESS_REPORTER:-false}" = "true" ]; then
+    echo ""
+    echo -e "${YELLOW}[+]${NC} 正在建置內建 Reporter 的 MCP Server Image..."
+    docker build -f zap-mcp/Dockerfile.mcp-reporter -t zap-mcp-server:inprocess ./zap-reporter
+    echo -e "${GREEN}✓${NC} MCP Server (inprocess) Image 建置完成"
+fi
+
 echo ""
 echo "========================================"
 echo -e "${GREEN}建置完成！${NC}"
@@ -32,6 +40,9 @@ echo ""
 echo "可用映像檔:"
 echo "  - zap-reporter:latest"
 echo "  - zap-mcp-server:latest"
+if [ "${BUILD_INPROCESS_REPORTER:-false}" = "true" ]; then
+    echo "  - zap-mcp-server:inprocess"
+fi
 echo ""
 echo "共用 Volume:"
 echo "  - zap_shared_data"
@@ -0,0 +1,90 @@
+"""
+AI 建議分批提交基準測試
+以 --findings 個弱點、每次提交 --batch 個的方式量測單次驗證 + 合併 + 寫檔的耗時，
+並與每次整批重送全部弱點 (舊流程) 比較。報告生成以空函式代替，不啟動 Reporter。
+
+用法:
+    python benchmarks/insights_merge.py --findings 500 --batch 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting.insights_store import InsightsStore, parse_solutions  # noqa: E402
+
+
+def _solution(i: int) -> str:
+    return f"### 弱點分析\n第 {i} 個弱點的說明。\n\n### 修復建議\n" + "更新設定並重新測試。" * 20
+
+
+def _submit_all(store: InsightsStore, batches) -> list:
+    timings = []
+    for batch in batches:
+        started = time.perf_counter()
+        entries, errors = parse_solutions(json.dumps(batch, ensure_ascii=False))
+        if errors:
+            raise ValueError(errors)
+        store.submit(entries)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="AI 建議分批提交基準測試")
+    parser.add_argument("--findings", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=5, help="每次提交的弱點數")
+    args = parser.parse_args()
+
+    names = [f"Synthetic Finding {i:04d}" for i in range(args.findings)]
+    batches = [
+        {name: _solution(i) for i, name in enumerate(names[start:start + args.batch], start)}
+        for start in range(0, len(names), args.batch)
+    ]
+    renders = []
+
+    with tempfile.TemporaryDirectory(prefix="zap-insights-") as data_dir:
+        store = InsightsStore(data_dir, debounce=3600, render=lambda reason: (renders.append(reason) or (True, "")),
+                              is_busy=lambda: False)
+        incremental = _submit_all(store, batches)
+        store.flush()
+        size = os.path.getsize(store.path)
+
+    # 舊流程: 每次都重送目前為止的全部弱點並整檔覆寫
+    with tempfile.TemporaryDirectory(prefix="zap-insights-") as data_dir:
+        store = InsightsStore(data_dir, debounce=3600, render=lambda reason: (True, ""), is_busy=lambda: False)
+        cumulative, full = {}, []
+        for batch in batches:
+            cumulative.update(batch)
+            started = time.perf_counter()
+            entries, _ = parse_solutions(json.dumps(cumulative, ensure_ascii=False))
+            store.submit(entries, replace=True)
+            full.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "findings": args.findings,
+        "batch": args.batch,
+        "submissions": len(batches),
+        "renders": len(renders),
+        "insights_bytes": size,
+        "incremental_ms": {
+            "median": round(statistics.median(incremental) * 1000, 3),
+            "max": round(max(incremental) * 1000, 3),
+            "total": round(sum(incremental) * 1000, 1),
+        },
+        "resend_all_ms": {
+            "median": round(statistics.median(full) * 1000, 3),
+            "max": round(max(full) * 1000, 3),
+            "total": round(sum(full) * 1000, 1),
+        },
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
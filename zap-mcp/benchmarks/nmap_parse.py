@@ -0,0 +1,122 @@
+"""
+Nmap XML 解析基準測試：整份載入 (ET.parse) vs 串流解析 (iterparse)
+產生合成的大型網段掃描結果 (-sV -sC --script=vulners 格式)，每種解析方式在獨立子程序中執行，
+量測耗時與尖峰記憶體 (RSS)；串流解析在不同主機數量下的記憶體用量應維持平坦。
+
+用法:
+    python benchmarks/nmap_parse.py --hosts 65536
+    python benchmarks/nmap_parse.py --hosts 65536 --legacy   # 一併量測 ET.parse (需數 GB 記憶體)
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICES = [("22", "ssh", "OpenSSH", "8.9p1 Ubuntu 3ubuntu0.6"), ("80", "http", "nginx", "1.18.0"),
+            ("443", "http", "Apache httpd", "2.4.52"), ("3306", "mysql", "MySQL", "8.0.36")]
+
+STREAM_PROBE = r"""
+import sys, json, time, resource
+sys.path.insert(0, sys.argv[2])
+from tools.nmap_parser import iter_nmap_hosts
+started = time.perf_counter()
+status = {}
+hosts = ports = cves = 0
+for host in iter_nmap_hosts(sys.argv[1], status=status):
+    hosts += 1
+    ports += len(host["ports"])
+    cves += sum(len(p["cves"]) for p in host["ports"])
+print(json.dumps({"seconds": time.perf_counter() - started, "hosts": hosts, "ports": ports, "cves": cves,
+                  "complete": status["complete"], "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+LEGACY_PROBE = r"""
+import sys, json, time, resource
+import xml.etree.ElementTree as ET
+sys.path.insert(0, sys.argv[2])
+from tools.nmap_parser import _host_record
+started = time.perf_counter()
+root = ET.parse(sys.argv[1]).getroot()
+hosts = len([_host_record(h) for h in root.findall("host")])
+print(json.dumps({"seconds": time.perf_counter() - started, "hosts": hosts,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def write_synthetic_xml(path: str, hosts: int, seed: int = 1, truncate: bool = False):
+    """逐段寫出合成的 Nmap XML (不在記憶體中組出整份文件)"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<nmaprun scanner="nmap" args="nmap -sV -sC --script=vulners -O --open 10.0.0.0/16" version="7.94">\n')
+        for i in range(hosts):
+            ip = f"10.{(i >> 8) & 255}.{i & 255}.{rng.randint(1, 254)}"
+            f.write(f'<host><status state="up" reason="syn-ack"/><address addr="{ip}" addrtype="ipv4"/>'
+                    f'<hostnames><hostname name="host{i}.corp.test" type="PTR"/></hostnames><ports>')
+            for port, name, product, version in rng.sample(SERVICES, rng.randint(1, 3)):
+                f.write(f'<port protocol="tcp" portid="{port}"><state state="open" reason="syn-ack"/>'
+                        f'<service name="{name}" product="{product}" version="{version}" method="probed" conf="10"/>'
+                        f'<script id="vulners" output="..."><table key="cpe:/a:{name}:{name}:{version}">')
+                for c in range(rng.randint(0, 6)):
+                    f.write(f'<table><elem key="id">CVE-2023-{rng.randint(1000, 99999)}</elem>'
+                            f'<elem key="cvss">{rng.uniform(2, 10):.1f}</elem><elem key="type">cve</elem>'
+                            f'<elem key="is_exploit">{"true" if c == 0 and rng.random() < 0.2 else "false"}</elem></table>')
+                f.write('</table></script></port>')
+            f.write('</ports><os><osmatch name="Linux 5.0 - 5.14" accuracy="96"/></os></host>\n')
+        if truncate:
+            f.write('<host><status state="up"/><address addr="10.255.255.1" addrtype="ipv4"/><ports><port protoc')
+            return
+        f.write('<runstats><finished time="0" elapsed="0"/><hosts up="%d" down="0" total="%d"/></runstats>\n' % (hosts, hosts))
+        f.write('</nmaprun>\n')
+
+
+def _probe(code: str, path: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code, path, ROOT], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Nmap XML 解析基準測試")
+    parser.add_argument("--hosts", type=int, default=65536)
+    parser.add_argument("--legacy", action="store_true", help="一併量測整份載入的 ET.parse")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="nmap-bench-")
+    results = {"stream": []}
+
+    # 不同主機數量下的串流解析 (記憶體應維持平坦)
+    sizes = sorted({max(args.hosts // 16, 1), max(args.hosts // 4, 1), args.hosts})
+    for hosts in sizes:
+        path = os.path.join(work_dir, f"nmap_{hosts}.xml")
+        write_synthetic_xml(path, hosts)
+        result = _probe(STREAM_PROBE, path)
+        result["xml_mb"] = round(os.path.getsize(path) / 1048576, 1)
+        results["stream"].append(result)
+        print(f"stream {hosts:>6} hosts ({result['xml_mb']} MiB): {result['seconds']:.2f}s  peak {result['peak_rss_mb']:.0f} MiB")
+
+    if args.legacy:
+        result = _probe(LEGACY_PROBE, os.path.join(work_dir, f"nmap_{args.hosts}.xml"))
+        results["legacy"] = result
+        print(f"ET.parse {args.hosts:>6} hosts: {result['seconds']:.2f}s  peak {result['peak_rss_mb']:.0f} MiB")
+
+    # 截斷的檔案: 回傳已完整解析的主機
+    truncated = os.path.join(work_dir, "nmap_truncated.xml")
+    write_synthetic_xml(truncated, 1000, truncate=True)
+    results["truncated"] = _probe(STREAM_PROBE, truncated)
+    print(f"truncated: {results['truncated']['hosts']} hosts, complete={results['truncated']['complete']}")
+
+    for name in os.listdir(work_dir):
+        os.remove(os.path.join(work_dir, name))
+    os.rmdir(work_dir)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
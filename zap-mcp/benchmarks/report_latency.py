@@ -0,0 +1,86 @@
+"""
+報告生成延遲基準測試：container 模式 vs inprocess 模式
+
+需在 MCP 伺服器容器內 (或掛載相同 Volume 的環境) 執行，且共用 Volume 中已有 ZAP-Report.json。
+
+用法:
+    python benchmarks/report_latency.py --runs 3
+    python benchmarks/report_latency.py --modes inprocess --runs 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docker_utils import DockerClient  # noqa: E402
+from docker_utils.client import REPORTER_CONTAINER_NAME  # noqa: E402
+from reporting import local_pool  # noqa: E402
+
+
+def _wait(is_running, timeout: float) -> bool:
+    """輪詢直到任務結束"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not is_running():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _run_container() -> float:
+    started = time.perf_counter()
+    ok, msg = DockerClient.run_reporter_detached()
+    if not ok:
+        raise RuntimeError(msg)
+    # 容器啟動後才會出現在 docker ps 中，先等待其出現
+    time.sleep(0.2)
+    if not _wait(lambda: DockerClient.is_container_running(REPORTER_CONTAINER_NAME), 600):
+        raise RuntimeError("container 模式逾時")
+    return time.perf_counter() - started
+
+
+def _run_inprocess() -> float:
+    started = time.perf_counter()
+    ok, msg = local_pool.start("benchmark")
+    if not ok:
+        raise RuntimeError(msg)
+    if not _wait(local_pool.is_running, 600):
+        raise RuntimeError("inprocess 模式逾時")
+    result = local_pool.get_last_result() or {}
+    if result.get("status") != "done":
+        raise RuntimeError(f"inprocess 模式失敗: {result}")
+    return time.perf_counter() - started
+
+
+RUNNERS = {"container": _run_container, "inprocess": _run_inprocess}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="報告生成延遲基準測試")
+    parser.add_argument("--modes", default="container,inprocess", help="以逗號分隔的模式")
+    parser.add_argument("--runs", type=int, default=3, help="每種模式的執行次數")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes.split(","):
+        if mode == "inprocess":
+            # 行程池啟動與依賴載入只在伺服器啟動時發生一次，不計入單次報告延遲
+            local_pool.warm_up()
+        timings = [RUNNERS[mode]() for _ in range(args.runs)]
+        results[mode] = {
+            "runs": [round(t, 3) for t in timings],
+            "median": round(statistics.median(timings), 3),
+            "min": round(min(timings), 3),
+        }
+        print(f"{mode:>10}: median {results[mode]['median']:.3f}s  min {results[mode]['min']:.3f}s")
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
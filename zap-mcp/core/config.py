@@ -14,6 +14,34 @@ OUTPUT_DIR = os.getenv("ZAP_OUTPUT_DIR", "/output")
 SCAN_CONTAINER_NAME = os.getenv("ZAP_SCAN_CONTAINER", "zap-scanner-job")
 REPORTER_IMAGE = os.getenv("ZAP_REPORTER_IMAGE", "zap-reporter:latest")
 ZAP_IMAGE = os.getenv("ZAP_IMAGE", "zaproxy/zap-stable")
+HELPER_IMAGE = os.getenv("ZAP_HELPER_IMAGE", "alpine")
+
+# ZAP 容器內的工作目錄 (共用 Volume 掛載點)
+ZAP_WORK_DIR = "/zap/wrk"
+
+# 預編譯掃描設定檔 (Scan Profile) 存放目錄 (位於共用 Volume 內)
+PROFILE_DIR_NAME = os.getenv("ZAP_PROFILE_DIR", "profiles")
+
+# 報告生成模式:
+#   container (每份報告啟動一個容器) / daemon (常駐預載的 Reporter 容器) /
+#   inprocess (MCP 伺服器內的本機行程池，需使用含 Reporter 的映像檔)
+REPORTER_MODE = os.getenv("ZAP_REPORTER_MODE", "container").lower()
+REPORTER_DAEMON_CONTAINER_NAME = os.getenv("ZAP_REPORTER_DAEMON_CONTAINER", "zap-reporter-daemon")
+REPORT_QUEUE_DIR_NAME = "queue"
+
+# inprocess 模式設定
+REPORTER_CODE_DIR = os.getenv("ZAP_REPORTER_CODE_DIR", "/app/reporter")
+REPORTER_POOL_WORKERS = int(os.getenv("ZAP_REPORTER_WORKERS", "1"))
+REPORT_JOB_TIMEOUT = int(os.getenv("ZAP_REPORT_TIMEOUT", "600"))  # 秒
+
+# AI 建議暫存: 依弱點合併多次提交，最後一次提交後靜置指定秒數才觸發一次報告生成
+AI_INSIGHTS_FILENAME = "ai_insights.json"
+AI_INSIGHTS_DEBOUNCE = float(os.getenv("ZAP_AI_INSIGHTS_DEBOUNCE", "10"))  # 秒
+
+# 啟動預熱設定 (背景拉取映像檔、建立 Volume)
+WARMUP_ENABLED = os.getenv("ZAP_WARMUP", "true").lower() == "true"
+WARMUP_DRY_RUN = os.getenv("ZAP_WARMUP_DRY_RUN", "false").lower() == "true"
+WARMUP_WAIT_TIMEOUT = int(os.getenv("ZAP_WARMUP_WAIT_TIMEOUT", "20"))  # 秒
 
 # MCP 伺服器設定
 MCP_SERVER_NAME = "ZAP Security All-in-One (Async Mode)"
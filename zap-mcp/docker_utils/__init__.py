@@ -1,3 +1,4 @@
 # ZAP MCP Docker Utilities
 from .client import DockerClient
 from .progress import parse_zap_progress
+from .warmup import start_warmup, wait_for_warmup, get_warmup_status
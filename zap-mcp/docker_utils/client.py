@@ -5,7 +5,10 @@ import subprocess
 import json
 from typing import Optional, List, Tuple
 
-from core.config import SHARED_VOLUME_NAME, SCAN_CONTAINER_NAME, REPORTER_IMAGE, ZAP_IMAGE
+from core.config import (
+    SHARED_VOLUME_NAME, SCAN_CONTAINER_NAME, REPORTER_IMAGE, ZAP_IMAGE, ZAP_WORK_DIR, HELPER_IMAGE,
+    REPORTER_DAEMON_CONTAINER_NAME
+)
 from core.logging_config import logger
 
 REPORTER_CONTAINER_NAME = "zap-reporter-job"
@@ -44,20 +47,57 @@ class DockerClient:
         return stdout + stderr
 
     @staticmethod
-    def run_zap_scan(target_url: str, scan_type: str = "baseline", aggressive: bool = False, zap_configs: Optional[List[str]] = None) -> Tuple[bool, str]:
-        """啟動 ZAP 掃描 (背景執行)"""
+    def image_exists(image: str) -> bool:
+        """檢查本機是否已有指定映像檔"""
+        returncode, _, _ = DockerClient.run_command(["docker", "image", "inspect", image])
+        return returncode == 0
+
+    @staticmethod
+    def pull_image(image: str) -> Tuple[bool, str]:
+        """拉取映像檔"""
+        returncode, _, stderr = DockerClient.run_command(["docker", "pull", image])
+        if returncode != 0: return False, stderr.strip()
+        return True, "已拉取"
+
+    @staticmethod
+    def volume_exists(volume_name: str = SHARED_VOLUME_NAME) -> bool:
+        """檢查 Volume 是否存在"""
+        returncode, _, _ = DockerClient.run_command(["docker", "volume", "inspect", volume_name])
+        return returncode == 0
+
+    @staticmethod
+    def create_volume(volume_name: str = SHARED_VOLUME_NAME) -> bool:
+        """建立 Volume (已存在時不影響)"""
+        returncode, _, _ = DockerClient.run_command(["docker", "volume", "create", volume_name])
+        return returncode == 0
+
+    @staticmethod
+    def dry_run_image(image: str, command: List[str]) -> bool:
+        """以一次性容器執行指定命令，預先將映像檔各層載入 Page Cache"""
+        cmd = ["docker", "run", "--rm", image] + command
+        returncode, _, _ = DockerClient.run_command(cmd)
+        return returncode == 0
+
+    @staticmethod
+    def run_zap_scan(target_url: str, scan_type: str = "baseline", aggressive: bool = False, config_files: Optional[List[str]] = None) -> Tuple[bool, str]:
+        """
+        啟動 ZAP 掃描 (背景執行)
+
+        config_files 為預編譯的 ZAP 設定檔 (容器內路徑)，透過 -configfile 載入，
+        取代逐項傳入的 -config 參數。
+        """
         script_name = "zap-full-scan.py" if scan_type == "full" else "zap-baseline.py"
         cmd = [
             "docker", "run", "-d",
             "--name", SCAN_CONTAINER_NAME,
             "-u", "0",
             "--dns", "8.8.8.8",
-            "-v", f"{SHARED_VOLUME_NAME}:/zap/wrk:rw",
+            "-v", f"{SHARED_VOLUME_NAME}:{ZAP_WORK_DIR}:rw",
             "-t", ZAP_IMAGE,
             script_name, "-t", target_url, "-J", "ZAP-Report.json", "-I"
         ]
         if aggressive: cmd.extend(["-j", "-a"])
-        if zap_configs: cmd.extend(["-z", " ".join(zap_configs)])
+        if config_files: cmd.extend(["-z", " ".join(f"-configfile {path}" for path in config_files)])
 
         logger.info(f"執行 ZAP 掃描: {' '.join(cmd[:10])}...")
         returncode, stdout, stderr = DockerClient.run_command(cmd)
@@ -81,13 +121,34 @@ class DockerClient:
         if returncode != 0: return False, f"啟動失敗: {stderr}"
         return True, "報告生成任務已在背景啟動"
 
+    @staticmethod
+    def ensure_reporter_daemon() -> Tuple[bool, str]:
+        """確保常駐 Reporter 容器正在運行 (未運行時啟動)"""
+        if DockerClient.is_container_running(REPORTER_DAEMON_CONTAINER_NAME):
+            return True, "常駐 Reporter 已在運行"
+
+        DockerClient.remove_container(REPORTER_DAEMON_CONTAINER_NAME)
+        cmd = [
+            "docker", "run", "-d",
+            "--name", REPORTER_DAEMON_CONTAINER_NAME,
+            "--restart", "unless-stopped",
+            "-v", f"{SHARED_VOLUME_NAME}:/app/data",
+            REPORTER_IMAGE,
+            "python", "main.py", "--daemon"
+        ]
+
+        logger.info("啟動常駐 Reporter 容器...")
+        returncode, stdout, stderr = DockerClient.run_command(cmd)
+        if returncode != 0: return False, f"啟動失敗: {stderr}"
+        return True, "常駐 Reporter 已啟動"
+
     @staticmethod
     def check_file_exists(filename_pattern: str) -> bool:
         """檢查 Volume 內是否存在特定檔案 (支援 wildcard)"""
         cmd = [
             "docker", "run", "--rm",
             "-v", f"{SHARED_VOLUME_NAME}:/data",
-            "alpine", "sh", "-c", f"ls /data/{filename_pattern}"
+            HELPER_IMAGE, "sh", "-c", f"ls /data/{filename_pattern}"
         ]
         returncode, _, _ = DockerClient.run_command(cmd)
         return returncode == 0
@@ -101,7 +162,7 @@ class DockerClient:
         cmd = [
             "docker", "run", "--rm",
             "-v", f"{SHARED_VOLUME_NAME}:/data",
-            "alpine", "cat", f"/data/{filename}"
+            HELPER_IMAGE, "cat", f"/data/{filename}"
         ]
         returncode, stdout, stderr = DockerClient.run_command(cmd)
         
@@ -0,0 +1,137 @@
+"""
+Docker 環境預熱模組
+伺服器啟動時於背景檢查並拉取映像檔、建立共用 Volume，避免首次掃描時長時間卡住
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .client import DockerClient
+from core.config import ZAP_IMAGE, REPORTER_IMAGE, HELPER_IMAGE, SHARED_VOLUME_NAME, WARMUP_DRY_RUN
+from core.logging_config import logger
+
+# 預熱時以一次性容器執行的命令 (載入映像檔各層與主要依賴)
+DRY_RUN_COMMANDS: Dict[str, List[str]] = {
+    ZAP_IMAGE: ["zap.sh", "-cmd", "-version"],
+    REPORTER_IMAGE: ["python", "-c", "import report_builder"],
+    HELPER_IMAGE: ["true"],
+}
+
+_lock = threading.Lock()
+_done = threading.Event()
+_thread: Optional[threading.Thread] = None
+_state = {
+    "status": "pending",  # pending / running / done / failed
+    "started_at": None,
+    "finished_at": None,
+    "steps": [],
+}
+
+
+def _record_step(name: str, ok: bool, detail: str, started: float):
+    """記錄單一預熱步驟結果"""
+    with _lock:
+        _state["steps"].append({
+            "name": name,
+            "ok": ok,
+            "detail": detail,
+            "elapsed": round(time.time() - started, 1),
+        })
+
+
+def _ensure_image(image: str) -> bool:
+    """確認映像檔存在，缺少時拉取"""
+    started = time.time()
+    if DockerClient.image_exists(image):
+        _record_step(f"image:{image}", True, "已存在", started)
+        return True
+
+    logger.info(f"預熱: 拉取映像檔 {image}...")
+    ok, detail = DockerClient.pull_image(image)
+    if not ok:
+        logger.warning(f"預熱: 拉取 {image} 失敗: {detail}")
+    _record_step(f"image:{image}", ok, detail, started)
+    return ok
+
+
+def _ensure_volume() -> bool:
+    """確認共用 Volume 存在，缺少時建立"""
+    started = time.time()
+    if DockerClient.volume_exists(SHARED_VOLUME_NAME):
+        _record_step(f"volume:{SHARED_VOLUME_NAME}", True, "已存在", started)
+        return True
+
+    ok = DockerClient.create_volume(SHARED_VOLUME_NAME)
+    _record_step(f"volume:{SHARED_VOLUME_NAME}", ok, "已建立" if ok else "建立失敗", started)
+    return ok
+
+
+def _run_warmup():
+    """預熱主流程 (於背景執行緒中執行)"""
+    with _lock:
+        _state["status"] = "running"
+        _state["started_at"] = time.time()
+
+    all_ok = False
+    try:
+        all_ok = _ensure_volume()
+        for image in (ZAP_IMAGE, REPORTER_IMAGE, HELPER_IMAGE):
+            image_ok = _ensure_image(image)
+            all_ok = all_ok and image_ok
+
+            if image_ok and WARMUP_DRY_RUN:
+                started = time.time()
+                ok = DockerClient.dry_run_image(image, DRY_RUN_COMMANDS.get(image, ["true"]))
+                _record_step(f"dry-run:{image}", ok, "完成" if ok else "執行失敗", started)
+    except Exception as e:
+        logger.error(f"環境預熱異常: {e}")
+        _record_step("warmup", False, str(e), time.time())
+    finally:
+        with _lock:
+            _state["status"] = "done" if all_ok else "failed"
+            _state["finished_at"] = time.time()
+            elapsed = _state["finished_at"] - _state["started_at"]
+        logger.info(f"環境預熱結束: {_state['status']} ({elapsed:.1f}s)")
+        _done.set()
+
+
+def start_warmup() -> bool:
+    """
+    啟動背景預熱 (重複呼叫不會重複啟動)
+
+    Returns:
+        bool: 是否為本次呼叫啟動
+    """
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=_run_warmup, name="zap-warmup", daemon=True)
+    _thread.start()
+    logger.info("已於背景啟動環境預熱...")
+    return True
+
+
+def wait_for_warmup(timeout: float) -> bool:
+    """
+    等待預熱結束
+
+    未啟動預熱時立即回傳 True；預熱失敗同樣視為結束 (交由後續 docker run 自行處理)。
+
+    Args:
+        timeout: 最長等待秒數
+
+    Returns:
+        bool: 預熱是否已結束
+    """
+    if _thread is None:
+        return True
+    return _done.wait(timeout)
+
+
+def get_warmup_status() -> dict:
+    """取得預熱狀態快照"""
+    with _lock:
+        snapshot = dict(_state)
+        snapshot["steps"] = list(_state["steps"])
+    return snapshot
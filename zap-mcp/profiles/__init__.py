@@ -0,0 +1,2 @@
+# ZAP MCP Scan Profiles
+from .scan_profile import compile_scan_profile, get_profile_settings, write_run_settings, clear_run_settings
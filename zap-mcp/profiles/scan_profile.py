@@ -0,0 +1,155 @@
+"""
+ZAP 掃描設定檔 (Scan Profile) 編譯模組
+將掃描參數編譯為 ZAP 設定檔並存放於共用 Volume，以內容雜湊值命名供重複使用。
+認證資訊不寫入可重用的設定檔，而是寫入單次掃描專用的設定檔，掃描結束後刪除。
+"""
+import os
+import glob
+import hashlib
+import secrets
+from typing import Dict, Optional, Tuple
+
+from core.config import INTERNAL_DATA_DIR, ZAP_WORK_DIR, PROFILE_DIR_NAME
+from core.logging_config import logger
+
+# 單次掃描設定檔 (含認證資訊) 的檔名前綴
+RUN_SETTINGS_PREFIX = "run-"
+
+# 設定檔格式版本 (格式變更時遞增，使舊檔自動失效)
+PROFILE_FORMAT_VERSION = 1
+
+# 具名掃描設定檔 (設定鍵 -> 值)
+SCAN_PROFILES: Dict[str, Dict[str, str]] = {
+    "baseline-aggressive": {
+        "scanner.threadPerHost": "20",  # 增加執行緒 (加速但高負載)
+        "spider.thread": "10",
+    },
+    "full-aggressive": {
+        "scanner.threadPerHost": "10",
+        "spider.thread": "10",
+        "scanner.strength": "HIGH",
+        "scanner.alertThreshold": "LOW",
+        "rules.sqli.level": "HIGH",  # 測試 SQL Injection
+        "rules.xss.level": "HIGH",  # 測試 XSS
+        "rules.pathtraversal.level": "HIGH",  # 測試路徑遍歷
+    },
+}
+
+
+def get_profile_settings(name: str) -> Dict[str, str]:
+    """
+    取得具名掃描設定檔的設定內容
+
+    Args:
+        name: 設定檔名稱 (如 full-aggressive)
+
+    Returns:
+        dict: 設定鍵值 (找不到時回傳空字典)
+    """
+    return dict(SCAN_PROFILES.get(name, {}))
+
+
+def _escape_property(value: str) -> str:
+    """跳脫 Java Properties 格式的特殊字元"""
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _render_profile(settings: Dict[str, str]) -> str:
+    """將設定內容轉為排序後的 Properties 文字 (內容相同即雜湊相同)"""
+    lines = [f"# ZAP-MCP compiled scan profile (format v{PROFILE_FORMAT_VERSION})"]
+    for key in sorted(settings):
+        lines.append(f"{key}={_escape_property(settings[key])}")
+    return "\n".join(lines) + "\n"
+
+
+def compile_scan_profile(
+    name: str,
+    settings: Dict[str, str],
+    profile_dir: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    將掃描設定編譯為 ZAP 設定檔 (-configfile)，已存在相同雜湊的檔案時直接重用
+
+    Args:
+        name: 設定檔名稱 (僅用於日誌)
+        settings: ZAP 設定鍵值
+        profile_dir: 本機設定檔目錄 (預設為共用 Volume 內的 profiles/)
+
+    Returns:
+        tuple: (設定檔雜湊值, ZAP 容器內的設定檔路徑)
+    """
+    content = _render_profile(settings)
+    profile_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    filename = f"{profile_hash}.prop"
+
+    local_dir = _local_dir(profile_dir)
+    local_path = os.path.join(local_dir, filename)
+
+    if os.path.exists(local_path):
+        logger.info(f"重用已編譯的掃描設定檔: {name} ({profile_hash})")
+    else:
+        _write_private(local_path, content)
+        logger.info(f"已編譯掃描設定檔: {name} ({profile_hash}, {len(settings)} 項設定)")
+
+    return profile_hash, _container_path(filename)
+
+
+def _local_dir(profile_dir: Optional[str]) -> str:
+    return profile_dir or os.path.join(INTERNAL_DATA_DIR, PROFILE_DIR_NAME)
+
+
+def _container_path(filename: str) -> str:
+    return f"{ZAP_WORK_DIR}/{PROFILE_DIR_NAME}/{filename}"
+
+
+def _write_private(local_path: str, content: str):
+    """以暫存檔置換寫入，權限限制為僅擁有者可讀寫"""
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    tmp_path = f"{local_path}.tmp.{os.getpid()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, local_path)
+
+
+def write_run_settings(settings: Dict[str, str], profile_dir: Optional[str] = None) -> str:
+    """
+    寫入單次掃描專用的設定檔 (認證資訊等不可快取的設定，隨機命名且不重用)
+
+    Args:
+        settings: ZAP 設定鍵值
+        profile_dir: 本機設定檔目錄 (預設為共用 Volume 內的 profiles/)
+
+    Returns:
+        str: ZAP 容器內的設定檔路徑
+    """
+    filename = f"{RUN_SETTINGS_PREFIX}{secrets.token_hex(8)}.prop"
+    _write_private(os.path.join(_local_dir(profile_dir), filename), _render_profile(settings))
+    return _container_path(filename)
+
+
+def clear_run_settings(profile_dir: Optional[str] = None) -> int:
+    """
+    刪除單次掃描專用的設定檔 (掃描容器結束或啟動新掃描時呼叫)
+
+    Args:
+        profile_dir: 本機設定檔目錄 (預設為共用 Volume 內的 profiles/)
+
+    Returns:
+        int: 刪除的檔案數量
+    """
+    removed = 0
+    for path in glob.glob(os.path.join(_local_dir(profile_dir), f"{RUN_SETTINGS_PREFIX}*")):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            logger.warning(f"刪除掃描設定檔失敗: {path} - {e}")
+    if removed:
+        logger.info(f"已刪除 {removed} 個單次掃描設定檔")
+    return removed
@@ -0,0 +1,3 @@
+# ZAP MCP Report Generation
+from .backend import prepare_report_backend, start_report_generation, is_report_generating
+from .insights_store import InsightsStore, get_insights_store, parse_solutions
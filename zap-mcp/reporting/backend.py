@@ -0,0 +1,60 @@
+"""
+報告生成後端
+依 ZAP_REPORTER_MODE 選擇每次啟動容器 (container)、交由常駐 Reporter (daemon)
+或於 MCP 伺服器內的本機行程池 (inprocess) 生成報告
+"""
+from typing import Tuple
+
+from core.config import REPORTER_MODE
+from core.logging_config import logger
+from docker_utils import DockerClient
+from docker_utils.client import REPORTER_CONTAINER_NAME
+from .job_queue import enqueue_report_job, has_pending_report_jobs
+from . import local_pool
+
+
+def prepare_report_backend() -> Tuple[bool, str]:
+    """
+    預先準備報告後端 (daemon 模式下啟動常駐 Reporter，使其能在掃描完成時立即生成報告)
+
+    Returns:
+        tuple: (是否成功, 訊息)
+    """
+    if REPORTER_MODE == "daemon":
+        return DockerClient.ensure_reporter_daemon()
+    if REPORTER_MODE == "inprocess":
+        local_pool.warm_up()
+    return True, "無需準備"
+
+
+def start_report_generation(reason: str = "mcp") -> Tuple[bool, str]:
+    """
+    啟動報告生成 (背景執行)
+
+    Args:
+        reason: 觸發來源 (記錄於任務中)
+
+    Returns:
+        tuple: (是否成功, 訊息)
+    """
+    if REPORTER_MODE == "daemon":
+        success, message = DockerClient.ensure_reporter_daemon()
+        if not success:
+            return False, message
+        job_id = enqueue_report_job(reason)
+        logger.info(f"已排入報告任務: {job_id} ({reason})")
+        return True, f"報告任務已排入常駐 Reporter ({job_id})"
+
+    if REPORTER_MODE == "inprocess":
+        return local_pool.start(reason)
+
+    return DockerClient.run_reporter_detached()
+
+
+def is_report_generating() -> bool:
+    """報告是否正在生成中"""
+    if REPORTER_MODE == "daemon":
+        return has_pending_report_jobs()
+    if REPORTER_MODE == "inprocess":
+        return local_pool.is_running()
+    return DockerClient.is_container_running(REPORTER_CONTAINER_NAME)
@@ -0,0 +1,291 @@
+"""
+AI 建議暫存 (依弱點合併)
+AI 可分多次提交少量弱點的建議，每次提交只驗證並合併到 ai_insights.json，
+記錄內容有變更的弱點 (dirty)；最後一次提交後靜置 AI_INSIGHTS_DEBOUNCE 秒才觸發一次報告生成。
+Reporter 的片段快取只會重新渲染 AI 建議有變更的弱點區塊。
+
+同一弱點以名稱 (忽略大小寫與多餘空白) 視為同一筆；內容為 null 或空字串表示移除該弱點的建議。
+掃描結果 (ZAP-Report.json) 比暫存的建議更新時，視為新的掃描並清空舊建議。
+"""
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from core.config import INTERNAL_DATA_DIR, AI_INSIGHTS_FILENAME, AI_INSIGHTS_DEBOUNCE
+from core.logging_config import logger
+from .backend import start_report_generation, is_report_generating
+
+ZAP_REPORT_FILENAME = "ZAP-Report.json"
+
+
+def finding_key(name: str) -> str:
+    """弱點鍵值 (忽略大小寫與多餘空白)"""
+    return " ".join(name.casefold().split())
+
+
+def parse_solutions(raw: str) -> Tuple[Dict[str, Optional[str]], List[str]]:
+    """
+    解析並驗證 AI 提交的建議
+
+    Args:
+        raw: JSON 字串 (弱點名稱 -> 建議，或此格式的列表)
+
+    Returns:
+        tuple: (弱點名稱 -> 建議內容 (None 表示移除), 錯誤訊息列表)
+    """
+    try:
+        data = json.loads(raw) if raw else {}
+    except json.JSONDecodeError as e:
+        return {}, [f"solutions 不是有效的 JSON: {e}"]
+
+    items = data if isinstance(data, list) else [data]
+    entries: Dict[str, Optional[str]] = {}
+    errors = []
+    for item in items:
+        if not isinstance(item, dict):
+            errors.append("solutions 必須是物件 (弱點名稱 -> 建議) 或物件列表")
+            continue
+        for name, content in item.items():
+            if not name.strip():
+                errors.append("弱點名稱不可為空白")
+            elif content is not None and not isinstance(content, str):
+                errors.append(f"{name}: 建議內容必須是字串或 null")
+            else:
+                # 空字串或只有空白視同 null (移除該弱點的建議)
+                entries[name.strip()] = (content or "").strip() or None
+    return entries, errors
+
+
+class InsightsStore:
+    """AI 建議暫存 (MCP 伺服器內共用單一實例)"""
+
+    def __init__(
+        self,
+        data_dir: str = INTERNAL_DATA_DIR,
+        debounce: float = AI_INSIGHTS_DEBOUNCE,
+        render: Callable[[str], Tuple[bool, str]] = start_report_generation,
+        is_busy: Callable[[], bool] = is_report_generating
+    ):
+        """
+        Args:
+            data_dir: 共用 Volume 的資料目錄
+            debounce: 最後一次提交後等待的秒數
+            render: 啟動報告生成的函式 (回傳 (是否成功, 訊息))
+            is_busy: 報告是否正在生成中 (生成中時延後觸發)
+        """
+        self.path = os.path.join(data_dir, AI_INSIGHTS_FILENAME)
+        self.report_path = os.path.join(data_dir, ZAP_REPORT_FILENAME)
+        self.debounce = debounce
+        self._render = render
+        self._is_busy = is_busy
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+        self._stamp: Optional[tuple] = None
+        self._scan_mtime = 0.0
+        self._keys: Dict[str, str] = {}
+        self.dirty: Set[str] = set()
+        self._summary_dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._due: Optional[float] = None
+
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _report_mtime(self) -> float:
+        try:
+            return os.path.getmtime(self.report_path)
+        except OSError:
+            return 0.0
+
+    def _load(self) -> dict:
+        """讀取目前的建議 (建議與掃描結果自上次讀寫後皆未變更時沿用記憶體內容；呼叫端需持有 _lock)"""
+        stamp = self._file_stamp(self.path)
+        scan_mtime = self._report_mtime()
+        if self._data is not None and stamp == self._stamp and scan_mtime == self._scan_mtime:
+            return self._data
+
+        data = {}
+        if stamp is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"讀取 AI 建議失敗，重新建立: {e}")
+                data = {}
+
+        # 掃描結果比建議更新時視為新的掃描 (舊版檔案沒有 scan_mtime，以檔案時間比較)
+        if data and data.get("scan_mtime", os.path.getmtime(self.path)) < scan_mtime:
+            logger.info("偵測到新的掃描結果，清空舊的 AI 建議")
+            data = {}
+
+        raw = data.get("solutions") or {}
+        solutions: Dict[str, str] = {}
+        for item in (raw if isinstance(raw, list) else [raw]):
+            if isinstance(item, dict):
+                solutions.update((k, v) for k, v in item.items() if isinstance(k, str) and v)
+
+        self._data = {"executive_summary": data.get("executive_summary") or "", "solutions": solutions}
+        self._keys = {finding_key(name): name for name in solutions}
+        self._stamp = stamp
+        self._scan_mtime = scan_mtime
+        return self._data
+
+    def _save(self):
+        """以暫存檔置換寫入 (Reporter 不會讀到寫入中的檔案；呼叫端需持有 _lock)"""
+        payload = dict(self._data, updated_at=time.time(), scan_mtime=self._scan_mtime)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._stamp = self._file_stamp(self.path)
+
+    def submit(self, entries: Dict[str, Optional[str]], executive_summary: Optional[str] = None,
+               replace: bool = False) -> dict:
+        """
+        合併建議並排程報告生成
+
+        Args:
+            entries: parse_solutions 解析後的建議
+            executive_summary: 執行摘要 (None 表示不變更)
+            replace: 是否捨棄既有的全部建議 (整批提交)
+
+        Returns:
+            dict: {"updated", "removed", "unchanged", "total", "dirty", "render_in"}
+        """
+        with self._lock:
+            data = self._load()
+            solutions = data["solutions"]
+            updated = removed = unchanged = 0
+
+            if replace:
+                self.dirty.update(solutions)
+                solutions.clear()
+                self._keys.clear()
+
+            for name, content in entries.items():
+                key = finding_key(name)
+                current = self._keys.get(key)
+                if content is None:
+                    if current is not None:
+                        del solutions[current]
+                        del self._keys[key]
+                        self.dirty.add(current)
+                        removed += 1
+                    continue
+                if current is not None and solutions[current] == content:
+                    unchanged += 1
+                    continue
+                # 名稱寫法不同時以最新提交的寫法為準
+                if current is not None and current != name:
+                    del solutions[current]
+                    self.dirty.discard(current)
+                solutions[name] = content
+                self._keys[key] = name
+                self.dirty.add(name)
+                updated += 1
+
+            summary_changed = executive_summary is not None and executive_summary != data["executive_summary"]
+            if summary_changed:
+                data["executive_summary"] = executive_summary
+                self._summary_dirty = True
+
+            if updated or removed or replace or summary_changed:
+                self._save()
+            if self._has_changes():
+                self._schedule()
+
+            return {
+                "updated": updated,
+                "removed": removed,
+                "unchanged": unchanged,
+                "total": len(solutions),
+                "dirty": len(self.dirty),
+                "render_in": self._render_in(),
+            }
+
+    def _has_changes(self) -> bool:
+        return bool(self.dirty) or self._summary_dirty
+
+    def _render_in(self) -> Optional[float]:
+        return max(0.0, round(self._due - time.time(), 1)) if self._due else None
+
+    def _schedule(self, delay: Optional[float] = None):
+        """(重新) 排程報告生成 (呼叫端需持有 _lock)"""
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = self.debounce if delay is None else delay
+        self._due = time.time() + delay
+        self._timer = threading.Timer(delay, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        """靜置時間到: 報告未在生成中時啟動一次生成，否則延後"""
+        with self._lock:
+            self._timer = self._due = None
+            if not self._has_changes():
+                return
+            if self._is_busy():
+                self._schedule()
+                return
+            self._start_render()
+
+    def _start_render(self) -> Tuple[bool, str]:
+        """啟動報告生成並清除 dirty (失敗時保留，下次提交或 flush 再試；呼叫端需持有 _lock)"""
+        success, message = self._render("ai_insights")
+        if success:
+            logger.info(f"AI 建議已合併 ({len(self.dirty)} 個弱點有變更)，啟動報告生成: {message}")
+            self.dirty.clear()
+            self._summary_dirty = False
+        else:
+            logger.error(f"AI 建議合併後啟動報告生成失敗: {message}")
+        return success, message
+
+    def flush(self) -> Tuple[bool, str]:
+        """
+        立即啟動報告生成 (不等待靜置時間；報告正在生成中時保留變更並延後觸發)
+
+        Returns:
+            tuple: (是否成功, 訊息)
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = self._due = None
+            if self._is_busy():
+                self._schedule()
+                return True, f"報告正在生成中，完成後約 {self.debounce:.0f} 秒內將以最新建議重新生成"
+            return self._start_render()
+
+    def pending(self) -> Optional[dict]:
+        """
+        尚未觸發報告生成的變更
+
+        Returns:
+            dict: {"dirty": 有變更的弱點數, "render_in": 預計觸發的剩餘秒數}，無變更時回傳 None
+        """
+        with self._lock:
+            if not self._has_changes():
+                return None
+            return {"dirty": len(self.dirty), "render_in": self._render_in()}
+
+
+_store: Optional[InsightsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_insights_store() -> InsightsStore:
+    """取得全局 AI 建議暫存"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InsightsStore()
+        return _store
@@ -0,0 +1,41 @@
+"""
+常駐 Reporter 任務佇列 (MCP 端)
+任務以 JSON 檔案形式寫入共用 Volume 的佇列目錄，由 Reporter 常駐程序取用
+"""
+import os
+import json
+import time
+import uuid
+
+from core.config import INTERNAL_DATA_DIR, REPORT_QUEUE_DIR_NAME
+
+QUEUE_DIR = os.path.join(INTERNAL_DATA_DIR, REPORT_QUEUE_DIR_NAME)
+
+
+def enqueue_report_job(reason: str) -> str:
+    """
+    建立報告任務
+
+    Args:
+        reason: 任務來源 (如 scan_complete / ai_insights)
+
+    Returns:
+        str: 任務 ID
+    """
+    os.makedirs(QUEUE_DIR, exist_ok=True)
+    job_id = f"{time.strftime('%y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    job_path = os.path.join(QUEUE_DIR, f"{job_id}.job")
+
+    # 先寫暫存檔再改名，避免常駐程序讀到半成品
+    tmp_path = f"{job_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"job_id": job_id, "reason": reason, "created_at": time.time()}, f)
+    os.replace(tmp_path, job_path)
+    return job_id
+
+
+def has_pending_report_jobs() -> bool:
+    """佇列中是否有待處理或執行中的任務"""
+    if not os.path.isdir(QUEUE_DIR):
+        return False
+    return any(name.endswith((".job", ".running")) for name in os.listdir(QUEUE_DIR))
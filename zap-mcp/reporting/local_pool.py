@@ -0,0 +1,171 @@
+"""
+行程內 (In-process) 報告生成後端
+於 MCP 伺服器內以本機行程池執行 zap-reporter 流程，省去啟動 Docker 容器的開銷。
+需 MCP 映像檔內含 Reporter 程式碼與依賴 (見 Dockerfile.mcp-reporter)。
+"""
+import os
+import sys
+import time
+import threading
+import multiprocessing
+from typing import Optional, Tuple
+
+from core.config import REPORTER_CODE_DIR, REPORTER_POOL_WORKERS, REPORT_JOB_TIMEOUT
+from core.logging_config import logger
+
+_lock = threading.Lock()
+_pool = None
+_job = None  # {"result": AsyncResult, "started_at": float, "reason": str}
+_pending_reason: Optional[str] = None  # 任務進行中收到的請求，完成後再生成一次
+_last_result: Optional[dict] = None
+
+
+def _init_worker(code_dir: str):
+    """工作行程初始化：載入 Reporter 程式碼與重量級依賴 (僅在行程啟動時執行一次)"""
+    if code_dir not in sys.path:
+        sys.path.insert(0, code_dir)
+    import main  # noqa: F401
+    import report_builder  # noqa: F401  (python-docx / matplotlib / deep_translator)
+
+
+def _run_in_worker() -> Optional[str]:
+    """於工作行程中執行與 Reporter 容器相同的流程，回傳報告路徑"""
+    from main import run_report
+    from services.translator import get_translator
+
+    # 其他任務可能已寫入新的翻譯快取
+    get_translator().reload_cache()
+    return run_report()
+
+
+def is_available() -> bool:
+    """MCP 映像檔內是否有 Reporter 程式碼"""
+    return os.path.exists(os.path.join(REPORTER_CODE_DIR, "main.py"))
+
+
+def _get_pool():
+    """取得 (必要時建立) 行程池；使用 spawn 避免複製 MCP 伺服器的執行緒狀態"""
+    global _pool
+    if _pool is None:
+        ctx = multiprocessing.get_context("spawn")
+        _pool = ctx.Pool(
+            processes=REPORTER_POOL_WORKERS,
+            initializer=_init_worker,
+            initargs=(REPORTER_CODE_DIR,)
+        )
+    return _pool
+
+
+def _reset_pool():
+    """終止並丟棄行程池 (逾時或工作行程崩潰時使用)"""
+    global _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+
+
+def warm_up():
+    """預先啟動行程池，讓工作行程在首次任務前完成依賴載入"""
+    if not is_available():
+        return
+    with _lock:
+        _get_pool()
+
+
+def _collect_finished():
+    """檢查目前任務狀態，完成或逾時時記錄結果，並啟動等待中的重新生成 (呼叫端需持有 _lock)"""
+    global _job, _last_result, _pending_reason
+    if _job is None:
+        return
+
+    elapsed = time.time() - _job["started_at"]
+    async_result = _job["result"]
+
+    if async_result.ready():
+        try:
+            output = async_result.get()
+            status = "done" if output else "failed"
+        except Exception as e:
+            logger.error(f"行程內報告生成失敗: {e}")
+            output, status = None, "failed"
+    elif elapsed > REPORT_JOB_TIMEOUT:
+        # 逾時 (或工作行程崩潰導致結果永遠不會回傳)：重建行程池以隔離影響
+        logger.error(f"行程內報告生成逾時 ({elapsed:.0f}s)，重建行程池")
+        _reset_pool()
+        output, status = None, "timeout"
+    else:
+        return
+
+    _last_result = {
+        "status": status,
+        "output": os.path.basename(output) if output else None,
+        "elapsed": round(elapsed, 2),
+        "reason": _job["reason"],
+    }
+    logger.info(f"行程內報告生成結束: {_last_result}")
+    _job = None
+
+    if _pending_reason is not None:
+        reason, _pending_reason = _pending_reason, None
+        success, message = _submit(reason)
+        if not success:
+            logger.error(f"重新生成報告失敗 ({reason}): {message}")
+
+
+def _watch(job: dict):
+    """等待任務完成 (或逾時) 後立即收尾，讓等待中的重新生成不必等到下次查詢狀態"""
+    job["result"].wait(REPORT_JOB_TIMEOUT + 1)
+    with _lock:
+        if _job is job:
+            _collect_finished()
+
+
+def _submit(reason: str) -> Tuple[bool, str]:
+    """提交任務到行程池 (呼叫端需持有 _lock)"""
+    global _job
+    try:
+        async_result = _get_pool().apply_async(_run_in_worker)
+    except Exception as e:
+        _reset_pool()
+        return False, f"啟動失敗: {e}"
+
+    _job = {"result": async_result, "started_at": time.time(), "reason": reason}
+    threading.Thread(target=_watch, args=(_job,), daemon=True).start()
+    return True, "報告生成任務已在本機行程池啟動"
+
+
+def start(reason: str) -> Tuple[bool, str]:
+    """
+    提交報告生成任務 (非阻塞)
+
+    Args:
+        reason: 觸發來源
+
+    Returns:
+        tuple: (是否成功, 訊息)；任務進行中時排入一次重新生成 (多次請求合併為一次)
+    """
+    global _pending_reason
+    if not is_available():
+        return False, f"找不到 Reporter 程式碼 ({REPORTER_CODE_DIR})，請改用 container 模式"
+
+    with _lock:
+        _collect_finished()
+        if _job is not None:
+            _pending_reason = reason
+            return True, "報告生成任務進行中，完成後將以最新資料再生成一次"
+        return _submit(reason)
+
+
+def is_running() -> bool:
+    """是否有行程內任務正在執行"""
+    with _lock:
+        _collect_finished()
+        return _job is not None
+
+
+def get_last_result() -> Optional[dict]:
+    """取得最近一次任務結果"""
+    with _lock:
+        _collect_finished()
+        return dict(_last_result) if _last_result else None
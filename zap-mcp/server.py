@@ -6,7 +6,8 @@ from mcp.server.fastmcp import FastMCP
 
 # 初始化核心模組
 from core import logger, setup_exception_handler
-from core.config import MCP_SERVER_NAME
+from core.config import MCP_SERVER_NAME, WARMUP_ENABLED
+from docker_utils import start_warmup
 
 # 載入工具函數
 from tools import (
@@ -16,7 +17,9 @@ from tools import (
     check_status_and_generate_report,
     get_report_for_analysis,
     generate_report_with_ai_insights,
-    retrieve_report
+    submit_ai_insights,
+    retrieve_report,
+    check_warmup_status
 )
 
 # 設定全局異常處理
@@ -84,11 +87,23 @@ def ai_insights(executive_summary: str, solutions: str) -> str:
     return generate_report_with_ai_insights(executive_summary, solutions)
 
 
+@mcp.tool()
+def ai_insights_submit(solutions: str, executive_summary: str = "", render_now: bool = False) -> str:
+    """【流程第五步 (分批)】依弱點合併部分 AI 建議；停止提交後自動生成一次報告，最後一批可設 render_now。"""
+    return submit_ai_insights(solutions, executive_summary, render_now)
+
+
 @mcp.tool()
 def export_report() -> str:
     """【流程第六步】匯出所有報告檔案。"""
     return retrieve_report()
 
+
+@mcp.tool()
+def warmup_status() -> str:
+    """【輔助工具】查詢映像檔與 Volume 預熱狀態。"""
+    return check_warmup_status()
+
 async def shutdown(signal, loop):
     logger.info(f"收到信號 {signal.name}，正在關閉伺服器...")
     loop.stop()
@@ -98,6 +113,10 @@ async def shutdown(signal, loop):
 # ==========================================
 
 if __name__ == "__main__":
+    # 背景預熱映像檔與 Volume (放在主程式入口，避免 inprocess 模式的 spawn 子行程重複執行)
+    if WARMUP_ENABLED:
+        start_warmup()
+
     try:
         mcp.run()
     except KeyboardInterrupt:
@@ -4,5 +4,6 @@ from .auth_tool import perform_login_and_get_cookie
 from .scan_tool import start_scan_job
 from .status_tool import check_status_and_generate_report
 from .analysis_tool import get_report_for_analysis
-from .ai_insights_tool import generate_report_with_ai_insights
+from .ai_insights_tool import generate_report_with_ai_insights, submit_ai_insights
 from .export_tool import retrieve_report
+from .warmup_tool import check_warmup_status
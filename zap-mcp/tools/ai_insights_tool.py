@@ -1,12 +1,61 @@
 """
 AI 建議注入工具 (Async Fix)
+建議依弱點合併於 ai_insights.json (見 reporting.insights_store)：
+- submit_ai_insights: 分批提交少量弱點，靜置後自動觸發一次報告生成
+- generate_report_with_ai_insights: 整批取代全部建議並立即生成報告
 """
-import os
-import json
-
-from core.config import INTERNAL_DATA_DIR
 from core.logging_config import logger
-from docker_utils import DockerClient
+from reporting import get_insights_store, parse_solutions
+
+
+def _format_errors(errors) -> str:
+    shown = "\n".join(f"- {e}" for e in errors[:10])
+    more = f"\n- ... 另有 {len(errors) - 10} 個錯誤" if len(errors) > 10 else ""
+    return f"錯誤：solutions 驗證失敗，本次提交未合併。\n{shown}{more}"
+
+
+def submit_ai_insights(solutions: str, executive_summary: str = "", render_now: bool = False) -> str:
+    """
+    分批提交 AI 建議 (依弱點合併，不需一次送出全部弱點)
+
+    Args:
+        solutions: JSON 格式的解決方案 (弱點名稱 -> 建議；null 表示移除該弱點的建議)
+        executive_summary: AI 生成的執行摘要 (空字串表示不變更)
+        render_now: 是否立即生成報告 (最後一批時使用，不等待靜置時間)
+
+    Returns:
+        str: 合併結果訊息
+    """
+    try:
+        entries, errors = parse_solutions(solutions)
+        if errors:
+            return _format_errors(errors)
+
+        store = get_insights_store()
+        result = store.submit(entries, executive_summary or None)
+        logger.info(f"AI 建議已合併: {result}")
+
+        lines = [
+            f"**已合併 AI 建議**：更新 {result['updated']}、移除 {result['removed']}、"
+            f"未變更 {result['unchanged']} (目前共 {result['total']} 個弱點)"
+        ]
+        if render_now:
+            success, message = store.flush()
+            if not success:
+                return "\n".join(lines + [f"啟動報告生成失敗: {message}"])
+            lines.append(f"{message}，請稍後使用 `check_status` 確認是否完成。")
+        elif result['render_in'] is not None:
+            lines.append(
+                f"{result['dirty']} 個弱點待重新渲染；最後一次提交後約 {result['render_in']:.0f} 秒自動生成報告。"
+                f"可繼續提交其他弱點，或以 render_now=true 立即生成。"
+            )
+        else:
+            lines.append("內容皆未變更，無需重新生成報告。")
+        return "\n".join(lines)
+
+    except Exception as e:
+        logger.error(f"工具執行錯誤: {e}")
+        return f"工具執行錯誤: {str(e)}"
 
 
 def generate_report_with_ai_insights(executive_summary: str, solutions: str) -> str:
@@ -22,34 +71,25 @@ def generate_report_with_ai_insights(executive_summary: str, solutions: str) ->
     """
     try:
         # 1. 驗證與解析 JSON
-        try:
-            solutions_dict = json.loads(solutions)
-        except json.JSONDecodeError:
-            return "錯誤：solutions 參數必須是有效的 JSON 字串。"
+        entries, errors = parse_solutions(solutions)
+        if errors:
+            return _format_errors(errors)
 
-        # 2. 儲存 AI 資料到 Volume
-        ai_data = {
-            "executive_summary": executive_summary,
-            "solutions": solutions_dict
-        }
-
-        local_ai_path = os.path.join(INTERNAL_DATA_DIR, "ai_insights.json")
-        with open(local_ai_path, "w", encoding="utf-8") as f:
-            json.dump(ai_data, f, ensure_ascii=False, indent=2)
+        # 2. 整批取代暫存的建議 (寫入 Volume)
+        store = get_insights_store()
+        result = store.submit(entries, executive_summary, replace=True)
 
         logger.info("AI 數據已儲存，背景啟動 Reporter...")
 
-        # 3. [Fix] 改用 run_reporter_detached (背景執行)，避免 MCP 超時
-        success, message = DockerClient.run_reporter_detached()
-        
+        # 3. [Fix] 背景啟動報告生成，避免 MCP 超時 (不等待靜置時間)
+        success, message = store.flush()
+
         if not success:
             return f"啟動報告生成失敗: {message}"
 
-        solution_count = len(solutions_dict) if isinstance(solutions_dict, dict) else len(solutions_dict)
-        
         return f"""
 **AI 智慧報告生成任務已啟動！**
-已注入 {solution_count} 個建議。
+已注入 {result['total']} 個建議。({message})
 
 **SYSTEM NOTE:** 報告生成正在背景進行中。
 請 **等待約 10-20 秒**，然後使用 `check_status` 確認是否完成。
@@ -58,4 +98,4 @@ def generate_report_with_ai_insights(executive_summary: str, solutions: str) ->
 
     except Exception as e:
         logger.error(f"工具執行錯誤: {e}")
-        return f"工具執行錯誤: {str(e)}"
\ No newline at end of file
+        return f"工具執行錯誤: {str(e)}"
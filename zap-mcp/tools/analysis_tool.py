@@ -3,122 +3,101 @@
 """
 import os
 import json
-import xml.etree.ElementTree as ET
 from typing import Optional
 
 from core.config import OUTPUT_DIR
 from core.logging_config import logger
 from docker_utils import DockerClient
+from tools.nmap_parser import parse_nmap_xml
+from tools.nmap_sidecar import NMAP_SIDECAR_FILENAME, SIDECAR_VERSION, load_nmap_sidecar
 
+# Nmap 未偵測到作業系統時，依服務版本字串推測的關鍵字
+OS_HINT_KEYWORDS = ['Ubuntu', 'Debian', 'CentOS', 'Windows', 'FreeBSD']
 
-import xml.etree.ElementTree as ET
 
-def parse_nmap_with_cve(xml_content: str) -> str:
-    if not xml_content:
+def summarize_nmap(nmap_data: Optional[dict]) -> str:
+    """
+    將 Nmap 正規化結果 (Sidecar) 轉換為含 CVE 的 Markdown 摘要
+
+    Args:
+        nmap_data: Nmap 正規化結果 (hosts / complete)
+
+    Returns:
+        str: Markdown 摘要
+    """
+    if not nmap_data:
         return "無資料"
 
     try:
-        root = ET.fromstring(xml_content)
         summary = ["## Nmap 深度掃描報告 (含 CVE 漏洞分析)"]
-        
-        for host in root.findall('host'):
+
+        for host in nmap_data['hosts']:
             # --- 1. 基礎主機資訊 ---
-            address = host.find('address').get('addr')
-            
-            # OS 偵測 (包含先前的修正邏輯)
-            os_name = "Unknown"
-            os_elem = host.find('os')
-            if os_elem and os_elem.find('osmatch'):
-                os_name = os_elem.find('osmatch').get('name')
-            
+            os_name = host['os'][0] if host['os'] else "Unknown"
+
             # Service Fingerprinting (輔助 OS 判斷)
-            detected_hints = []
-            ports_elem = host.find('ports')
-            
-            # 先掃描一次服務來確認 OS (若 Nmap 未偵測到)
-            if ports_elem and os_name == "Unknown":
-                for port in ports_elem.findall('port'):
-                    service = port.find('service')
-                    if service is not None:
-                        extra = service.get('extrainfo', '') + " " + service.get('product', '')
-                        keywords = ['Ubuntu', 'Debian', 'CentOS', 'Windows', 'FreeBSD']
-                        for kw in keywords:
-                            if kw.lower() in extra.lower():
-                                detected_hints.append(kw)
+            if os_name == "Unknown":
+                detected_hints = set()
+                for port in host['ports']:
+                    extra = f"{port['extrainfo']} {port['product']}".lower()
+                    detected_hints.update(kw for kw in OS_HINT_KEYWORDS if kw.lower() in extra)
                 if detected_hints:
-                    os_name = f"Inferred: {', '.join(set(detected_hints))}"
+                    os_name = f"Inferred: {', '.join(detected_hints)}"
+
+            summary.append(f"\n### 目標: {host['ip']} (OS: {os_name})")
 
-            summary.append(f"\n### 目標: {address} (OS: {os_name})")
-            
             # --- 2. 端口與 CVE 解析 ---
-            if ports_elem:
-                for port in ports_elem.findall('port'):
-                    state = port.find('state').get('state')
-                    if state != 'open':
-                        continue
-
-                    portid = port.get('portid')
-                    proto = port.get('protocol')
-                    
-                    # 服務資訊
-                    svc_elem = port.find('service')
-                    svc_name = svc_elem.get('name') if svc_elem is not None else "unknown"
-                    svc_ver = f"{svc_elem.get('product', '')} {svc_elem.get('version', '')}".strip()
-                    
-                    port_header = f"- **Port {portid}/{proto}**: {svc_name} ({svc_ver})"
-                    summary.append(port_header)
-
-                    # --- [關鍵新增] 解析 vulners script ---
-                    # 尋找該端口下的 script 標籤
-                    found_cves = []
-                    for script in port.findall('script'):
-                        if script.get('id') == 'vulners':
-                            # vulners 的結構通常是巢狀 table
-                            # 第一層 table 對應 CPE
-                            for cpe_table in script.findall('table'):
-                                # 第二層 table 對應具體漏洞
-                                for vuln_table in cpe_table.findall('table'):
-                                    vuln_id = ""
-                                    cvss = "0.0"
-                                    is_exploit = "false"
-                                    
-                                    for elem in vuln_table.findall('elem'):
-                                        key = elem.get('key')
-                                        if key == 'id':
-                                            vuln_id = elem.text
-                                        elif key == 'cvss':
-                                            cvss = elem.text
-                                        elif key == 'is_exploit':
-                                            is_exploit = elem.text
-                                    
-                                    # 篩選條件：只顯示高風險 (CVSS >= 7.0) 或有 Exploit 的漏洞
-                                    try:
-                                        if float(cvss) >= 7.0 or is_exploit == 'true':
-                                            found_cves.append({'id': vuln_id, 'cvss': cvss, 'exploit': is_exploit})
-                                    except ValueError:
-                                        pass # 忽略無法轉換分數的項目
-
-                    # 將 CVE 排序 (分數高到低) 並加入報告
-                    if found_cves:
-                        # 依照 CVSS 分數排序
-                        found_cves.sort(key=lambda x: float(x['cvss']), reverse=True)
-                        
-                        summary.append("  > **高風險漏洞偵測:**")
-                        # 限制顯示數量以免洗版 (例如只顯示前 5 個最嚴重的)
-                        for cve in found_cves[:5]: 
-                            exploit_mark = "EXPLOIT" if cve['exploit'] == 'true' else ""
-                            summary.append(f"  * [{cve['cvss']}] **{cve['id']}** {exploit_mark}")
-                        
-                        if len(found_cves) > 5:
-                            summary.append(f"  * ... 以及其他 {len(found_cves)-5} 個漏洞")
-                    else:
-                        summary.append("  > 未偵測到已知的高風險 CVE。")
+            for port in host['ports']:
+                svc_ver = f"{port['product']} {port['version']}".strip()
+                summary.append(f"- **Port {port['port']}/{port['protocol']}**: {port['service']} ({svc_ver})")
+
+                # 篩選條件：只顯示高風險 (CVSS >= 7.0) 或有 Exploit 的漏洞 (Sidecar 已依 CVSS 排序)
+                found_cves = [c for c in port['cves'] if c['cvss'] >= 7.0 or c['is_exploit']]
+                if found_cves:
+                    summary.append("  > **高風險漏洞偵測:**")
+                    # 限制顯示數量以免洗版 (只顯示前 5 個最嚴重的)
+                    for cve in found_cves[:5]:
+                        exploit_mark = "EXPLOIT" if cve['is_exploit'] else ""
+                        summary.append(f"  * [{cve['cvss']}] **{cve['id']}** {exploit_mark}")
+
+                    if len(found_cves) > 5:
+                        summary.append(f"  * ... 以及其他 {len(found_cves)-5} 個漏洞")
+                else:
+                    summary.append("  > 未偵測到已知的高風險 CVE。")
+
+        if not nmap_data.get('complete', True):
+            summary.append("\n> 注意：Nmap 結果檔案不完整 (掃描可能中斷)，以上僅包含已完整記錄的主機。")
 
         return "\n".join(summary)
 
     except Exception as e:
         return f"解析錯誤: {e}"
 
+
+def _load_nmap_data() -> Optional[dict]:
+    """
+    讀取 Nmap 正規化結果
+    本機掛載的資料目錄直接讀取 (必要時重建) Sidecar；否則經由 Volume 讀取 Sidecar，
+    舊版掃描沒有 Sidecar 時才讀取純文字 XML 解析
+    """
+    local = load_nmap_sidecar()
+    if local is not None:
+        return local
+
+    sidecar = DockerClient.read_json_from_volume(NMAP_SIDECAR_FILENAME)
+    if sidecar and sidecar.get('version') == SIDECAR_VERSION:
+        return sidecar
+
+    xml_content = DockerClient.read_file_from_volume("nmap_result.xml")
+    if not xml_content:
+        return None
+    result = parse_nmap_xml(xml_content)
+    for host in result['hosts']:
+        for port in host['ports']:
+            port['cves'].sort(key=lambda c: (-c['cvss'], c['id']))
+    return result
+
+
 def _parse_zap_json(json_data: dict) -> str:
     """
     解析 ZAP JSON 內容並轉換為 Markdown 摘要
@@ -174,10 +153,8 @@ def get_report_for_analysis() -> str:
         str: 整合後的 Markdown 報告
     """
     try:
-        # 1. 讀取並解析 Nmap 報告
-        # 注意：我們使用 read_file_from_volume (讀取純文字/XML)，不是 read_json
-        nmap_content = DockerClient.read_file_from_volume("nmap_result.xml")
-        nmap_md = parse_nmap_with_cve(nmap_content)
+        # 1. 讀取 Nmap 正規化結果
+        nmap_md = summarize_nmap(_load_nmap_data())
 
         # 2. 讀取並解析 ZAP 報告
         zap_data = DockerClient.read_json_from_volume("ZAP-Report.json")
@@ -0,0 +1,145 @@
+"""
+Nmap XML 串流解析器
+以 iterparse 逐一處理 <host>，處理完立即清除元素，記憶體用量不隨主機數量成長
+(大型網段的 -sV -sC --script=vulners 結果可達數 GB)。
+檔案被截斷 (掃描中斷或仍在寫入) 時，回傳已完整解析的主機並標記為不完整。
+"""
+import io
+import xml.etree.ElementTree as ET
+from typing import IO, Dict, Iterator, List, Optional, Union
+
+from core.logging_config import logger
+
+Source = Union[str, bytes, IO[bytes]]
+
+
+def _open_source(source: Source):
+    """檔案路徑、XML 字串 / 位元組或已開啟的檔案"""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, str) and source.lstrip().startswith('<'):
+        return io.BytesIO(source.encode('utf-8'))
+    return source
+
+
+def _cves(port: ET.Element) -> List[dict]:
+    """vulners script 的 CVE (巢狀 table: CPE -> 漏洞)"""
+    cves = []
+    for script in port.iter('script'):
+        if script.get('id') != 'vulners':
+            continue
+        for cpe_table in script.findall('table'):
+            for row in cpe_table.findall('table'):
+                fields = {elem.get('key'): elem.text for elem in row.findall('elem')}
+                if not fields.get('id'):
+                    continue
+                try:
+                    cvss = float(fields.get('cvss') or 0.0)
+                except ValueError:
+                    cvss = 0.0
+                cves.append({
+                    "id": fields['id'],
+                    "cvss": cvss,
+                    "is_exploit": fields.get('is_exploit') == 'true',
+                })
+    return cves
+
+
+def _host_record(host: ET.Element) -> dict:
+    """將單一 <host> 轉換為精簡記錄 (僅保留開放的連接埠)"""
+    ip = ""
+    for address in host.findall('address'):
+        if address.get('addrtype') in ('ipv4', 'ipv6'):
+            ip = address.get('addr', '')
+            break
+
+    hostname = ""
+    hn = host.find('hostnames/hostname')
+    if hn is not None:
+        hostname = hn.get('name', '')
+
+    status = host.find('status')
+    os_matches = [m.get('name', '') for m in host.findall('os/osmatch')]
+
+    ports = []
+    for port in host.findall('ports/port'):
+        state = port.find('state')
+        if state is None or state.get('state') != 'open':
+            continue
+        service = port.find('service')
+        svc = service.attrib if service is not None else {}
+        ports.append({
+            "port": port.get('portid', ''),
+            "protocol": port.get('protocol', ''),
+            "service": svc.get('name', 'unknown'),
+            "product": svc.get('product', ''),
+            "version": svc.get('version', ''),
+            "extrainfo": svc.get('extrainfo', ''),
+            "tunnel": svc.get('tunnel', ''),
+            "cves": _cves(port),
+        })
+
+    return {
+        "ip": ip,
+        "hostname": hostname,
+        "state": status.get('state', '') if status is not None else '',
+        "os": os_matches,
+        "ports": ports,
+    }
+
+
+def iter_nmap_hosts(source: Source, only_up: bool = True, status: Optional[Dict] = None) -> Iterator[dict]:
+    """
+    逐一產生 Nmap 主機記錄
+
+    Args:
+        source: XML 檔案路徑、XML 內容或已開啟的二進位檔案
+        only_up: 是否只回傳狀態為 up 的主機
+        status: 若提供，解析結束後寫入 complete (XML 是否完整) 與 error
+
+    Yields:
+        dict: 主機記錄 {ip, hostname, state, os, ports: [{port, protocol, service, product, version, cves}]}
+    """
+    if status is None:
+        status = {}
+    status.update(complete=False, error="")
+
+    try:
+        context = ET.iterparse(_open_source(source), events=('start', 'end'))
+        _, root = next(context)
+        for event, elem in context:
+            if event != 'end':
+                continue
+            if elem.tag == 'host':
+                record = _host_record(elem)
+                # 已處理的主機自根節點移除，樹狀結構不會累積
+                root.clear()
+                if not only_up or record['state'] == 'up':
+                    yield record
+            elif elem.tag == 'runstats':
+                root.clear()
+        status['complete'] = True
+    except ET.ParseError as e:
+        status['error'] = str(e)
+        logger.warning(f"Nmap XML 不完整 (掃描可能中斷)，僅回傳已解析的主機: {e}")
+    except StopIteration:
+        status['error'] = "empty document"
+    except OSError as e:
+        status['error'] = str(e)
+        logger.error(f"讀取 Nmap XML 失敗: {e}")
+
+
+def parse_nmap_xml(source: Source, only_up: bool = True) -> Dict:
+    """
+    解析完整的 Nmap XML
+
+    Args:
+        source: XML 檔案路徑、XML 內容或已開啟的二進位檔案
+        only_up: 是否只回傳狀態為 up 的主機
+
+    Returns:
+        dict: {"hosts": [...], "complete": bool, "error": str}
+    """
+    status: Dict = {}
+    hosts = list(iter_nmap_hosts(source, only_up, status))
+    return {"hosts": hosts, "complete": status['complete'], "error": status['error']}
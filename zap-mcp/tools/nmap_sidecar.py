@@ -0,0 +1,190 @@
+"""
+Nmap 正規化結果 (Sidecar)
+Nmap 結束後只解析一次 nmap_result.xml，寫出帶版本號的精簡 JSON (nmap_result.json)，
+內含主機、OS 推測、服務、Web URL 與依 CVSS 排序的 CVE。
+偵察工具、分析工具與 Reporter 都讀取此檔，不再各自解析 XML。
+
+Sidecar 記錄來源 XML 的大小與修改時間；來源變更 (重新掃描) 時視為過期並重新產生。
+Reporter 映像內的 services/nmap_sidecar.py 產生相同格式 (SIDECAR_VERSION 需一致)。
+
+用法 (nmap_tool 以此包裝背景執行的 Nmap，結束後立即產生 Sidecar):
+    python -c "import sys; from tools.nmap_sidecar import main; sys.exit(main())" \
+        --xml nmap_result.xml -- nmap -sV ... -oX nmap_result.xml target
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from core.config import INTERNAL_DATA_DIR
+from core.logging_config import logger
+from tools.nmap_parser import iter_nmap_hosts
+
+# 格式變更時遞增 (需與 Reporter 的 services/nmap_sidecar.py 一致)
+SIDECAR_VERSION = 1
+
+NMAP_XML_FILENAME = "nmap_result.xml"
+NMAP_SIDECAR_FILENAME = "nmap_result.json"
+
+# 視為 Web 服務的服務名稱 (其餘如 ssh / ftp / smtp 略過)
+WEB_SERVICES = ("http", "http-alt", "http-proxy", "soap", "glrpc", "unknown")
+
+
+def web_url(hostname: str, port: dict) -> Optional[str]:
+    """
+    依服務判斷 Web URL (非 Web 服務回傳 None)
+
+    Args:
+        hostname: 主機名稱或 IP
+        port: 連接埠記錄 (port / service / tunnel)
+
+    Returns:
+        str: URL (標準連接埠省略埠號)
+    """
+    port_id = port['port']
+    service_name = port['service']
+
+    protocol = "http"
+    if "https" in service_name or "ssl" in service_name or port.get('tunnel') == "ssl":
+        protocol = "https"
+    elif service_name not in WEB_SERVICES:
+        return None
+
+    # 針對 443 強制 https, 80 強制 http
+    if port_id == "443":
+        protocol = "https"
+    elif port_id == "80":
+        protocol = "http"
+
+    if (protocol, port_id) in (("http", "80"), ("https", "443")):
+        return f"{protocol}://{hostname}"
+    return f"{protocol}://{hostname}:{port_id}"
+
+
+def _source_info(xml_path: str) -> dict:
+    stat = os.stat(xml_path)
+    return {"file": os.path.basename(xml_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def build_sidecar(xml_path: str) -> dict:
+    """
+    串流解析 Nmap XML 並產生正規化結果
+
+    Args:
+        xml_path: Nmap XML 路徑
+
+    Returns:
+        dict: {version, generated_at, source, complete, hosts, web_urls}
+    """
+    source = _source_info(xml_path)
+    status = {}
+    hosts: List[dict] = []
+    web_urls: List[str] = []
+
+    for record in iter_nmap_hosts(xml_path, status=status):
+        name = record['hostname'] or record['ip']
+        ports = []
+        for port in record['ports']:
+            ports.append({
+                "port": port['port'],
+                "protocol": port['protocol'],
+                "service": port['service'],
+                "product": port['product'],
+                "version": port['version'],
+                "extrainfo": port['extrainfo'],
+                "tunnel": port['tunnel'],
+                "cves": sorted(port['cves'], key=lambda c: (-c['cvss'], c['id'])),
+            })
+            url = web_url(name, port) if name else None
+            if url:
+                web_urls.append(url)
+        hosts.append({"ip": record['ip'], "hostname": record['hostname'], "os": record['os'], "ports": ports})
+
+    return {
+        "version": SIDECAR_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "source": source,
+        "complete": status.get('complete', False),
+        "hosts": hosts,
+        "web_urls": list(dict.fromkeys(web_urls)),
+    }
+
+
+def write_sidecar(sidecar: dict, sidecar_path: str):
+    """以暫存檔 + 改名的方式寫入，讀取端不會看到半成品"""
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, sidecar_path)
+
+
+def _is_current(sidecar: dict, xml_path: str) -> bool:
+    if sidecar.get('version') != SIDECAR_VERSION:
+        return False
+    if not os.path.exists(xml_path):
+        return True
+    source = _source_info(xml_path)
+    recorded = sidecar.get('source', {})
+    return recorded.get('size') == source['size'] and recorded.get('mtime') == source['mtime']
+
+
+def load_nmap_sidecar(data_dir: str = INTERNAL_DATA_DIR, refresh: bool = True) -> Optional[dict]:
+    """
+    讀取 Nmap 正規化結果 (不存在或來源 XML 已變更時重新產生)
+
+    Args:
+        data_dir: 資料目錄
+        refresh: Sidecar 過期時是否重新解析 XML 並寫回
+
+    Returns:
+        dict: 正規化結果，沒有 Nmap 結果時回傳 None
+    """
+    xml_path = os.path.join(data_dir, NMAP_XML_FILENAME)
+    sidecar_path = os.path.join(data_dir, NMAP_SIDECAR_FILENAME)
+
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        if _is_current(sidecar, xml_path):
+            return sidecar
+    except (OSError, ValueError):
+        pass
+
+    if not refresh or not os.path.exists(xml_path):
+        return None
+
+    sidecar = build_sidecar(xml_path)
+    try:
+        write_sidecar(sidecar, sidecar_path)
+    except OSError as e:
+        logger.warning(f"寫入 Nmap Sidecar 失敗: {e}")
+    return sidecar
+
+
+def main() -> int:
+    """執行 Nmap (可選) 並產生 Sidecar"""
+    parser = argparse.ArgumentParser(prog="nmap_sidecar", description="產生 Nmap 正規化結果 (Sidecar)")
+    parser.add_argument("--xml", default=os.path.join(INTERNAL_DATA_DIR, NMAP_XML_FILENAME), help="Nmap XML 路徑")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="先執行的 Nmap 指令 (以 -- 分隔)")
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    returncode = 0
+    if command:
+        returncode = subprocess.run(command).returncode
+
+    if not os.path.exists(args.xml):
+        logger.warning(f"找不到 Nmap XML，不產生 Sidecar: {args.xml}")
+        return returncode or 1
+
+    sidecar = build_sidecar(args.xml)
+    write_sidecar(sidecar, os.path.join(os.path.dirname(args.xml), NMAP_SIDECAR_FILENAME))
+    logger.info(f"Nmap Sidecar 已產生: {len(sidecar['hosts'])} 台主機，{len(sidecar['web_urls'])} 個 Web 服務")
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
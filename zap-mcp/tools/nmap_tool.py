@@ -3,16 +3,18 @@ Nmap 偵察工具 (Async / Non-blocking 版) - 修正版
 解決 MCP Timeout 問題，支援背景執行、狀態檢查與 XML 容錯解析
 """
 import os
+import sys
 import subprocess
-import xml.etree.ElementTree as ET
 from typing import Optional
 
 from core.config import INTERNAL_DATA_DIR
 from core.logging_config import logger
 from validators import is_safe_host
+from tools.nmap_sidecar import NMAP_XML_FILENAME, NMAP_SIDECAR_FILENAME, load_nmap_sidecar
 
 # 定義輸出檔案路徑
-NMAP_XML_OUTPUT = os.path.join(INTERNAL_DATA_DIR, "nmap_result.xml")
+NMAP_XML_OUTPUT = os.path.join(INTERNAL_DATA_DIR, NMAP_XML_FILENAME)
+NMAP_SIDECAR_OUTPUT = os.path.join(INTERNAL_DATA_DIR, NMAP_SIDECAR_FILENAME)
 NMAP_LOG_FILE = os.path.join(INTERNAL_DATA_DIR, "nmap_run.log")
 
 
@@ -39,6 +41,9 @@ def _cleanup_old_files():
         if os.path.exists(NMAP_XML_OUTPUT):
             os.remove(NMAP_XML_OUTPUT)
             logger.info(f"已刪除舊的 XML 結果: {NMAP_XML_OUTPUT}")
+
+        if os.path.exists(NMAP_SIDECAR_OUTPUT):
+            os.remove(NMAP_SIDECAR_OUTPUT)
         
         if os.path.exists(NMAP_LOG_FILE):
             os.remove(NMAP_LOG_FILE)
@@ -49,93 +54,47 @@ def _cleanup_old_files():
 
 def _parse_nmap_results() -> str:
     """
-    解析 Nmap XML 輸出檔案並回傳摘要
-    具備容錯機制，可處理不完整的 XML
+    讀取 Nmap 正規化結果 (Sidecar) 並回傳摘要
+    Sidecar 由背景掃描結束時產生；缺少或過期時才解析 XML (可處理不完整的 XML)
     
     Returns:
         str: 發現的 Web 服務列表或錯誤訊息
     """
-    if not os.path.exists(NMAP_XML_OUTPUT):
+    if not os.path.exists(NMAP_XML_OUTPUT) and not os.path.exists(NMAP_SIDECAR_OUTPUT):
         return "尚未產生掃描結果 (檔案不存在)。"
 
     try:
-        # 解析 XML
-        tree = ET.parse(NMAP_XML_OUTPUT)
-        root = tree.getroot()
-        
-        discovered_urls = []
-        raw_services = []
-
-        for host in root.findall('host'):
-            # 嘗試取得 Hostname 或 IP
-            hostnames = host.find('hostnames')
-            hostname = None
-            if hostnames:
-                for hn in hostnames.findall('hostname'):
-                    hostname = hn.get('name')
-                    break
-            
-            # 若無 hostname 則使用 IP
-            if not hostname:
-                address = host.find('address')
-                if address is not None:
-                    hostname = address.get('addr')
-
-            if not hostname:
-                continue
-
-            ports_elem = host.find('ports')
-            if ports_elem:
-                for port in ports_elem.findall('port'):
-                    port_id = port.get('portid')
-                    service = port.find('service')
-                    service_name = service.get('name') if service is not None else "unknown"
-                    
-                    # 記錄原始服務以便除錯
-                    raw_services.append(f"Port {port_id}: {service_name}")
-
-                    # 判斷是否為 Web 服務 (HTTP/HTTPS)
-                    protocol = "http"
-                    if "https" in service_name or "ssl" in service_name:
-                        protocol = "https"
-                    elif service_name not in ["http", "http-alt", "http-proxy", "soap", "glrpc", "unknown"]:
-                        # 跳過明顯非 Web 的服務 (如 ssh, ftp, smtp)
-                        continue
-
-                    # 針對 443 強制 https, 80 強制 http
-                    if port_id == "443":
-                        protocol = "https"
-                    elif port_id == "80":
-                        protocol = "http"
-
-                    # 組合 URL
-                    url = f"{protocol}://{hostname}:{port_id}"
-                    
-                    # 對於標準端口，移除端口號讓 URL 更乾淨
-                    if (protocol == "http" and port_id == "80") or \
-                       (protocol == "https" and port_id == "443"):
-                        url = f"{protocol}://{hostname}"
-                        
-                    discovered_urls.append(url)
+        sidecar = load_nmap_sidecar()
+        if sidecar is None:
+            return "尚未產生掃描結果 (檔案不存在)。"
+
+        # 記錄原始服務以便除錯
+        raw_services = [
+            f"Port {port['port']}: {port['service']}"
+            for host in sidecar['hosts'] for port in host['ports']
+        ]
+        discovered_urls = sidecar['web_urls']
+
+        if not sidecar['complete'] and not discovered_urls and not raw_services:
+            # [關鍵修正] 處理 XML 檔案不完整的情況 (通常是因為掃描中斷)
+            return (
+                "**警告：掃描結果檔案不完整**\n"
+                "這通常是因為掃描過程被強制中斷 (Timeout 或 Memory 不足) 導致 XML 標籤未閉合。\n"
+                "建議：\n"
+                "1. 檢查 Docker 資源限制。\n"
+                "2. 嘗試縮小掃描範圍 (例如只掃描常用 Port)。"
+            )
+
+        partial_note = "" if sidecar['complete'] else "\n(掃描結果檔案不完整，僅列出已完整記錄的主機)"
 
         if not discovered_urls:
-            return f"Nmap 掃描完成。\n開放端口: {', '.join(raw_services)}\n  未發現明顯的 HTTP/HTTPS 服務。"
+            return f"Nmap 掃描完成。\n開放端口: {', '.join(raw_services)}\n  未發現明顯的 HTTP/HTTPS 服務。{partial_note}"
 
         url_list = '\n'.join(['- ' + url for url in discovered_urls])
-        return f"**偵察完成！發現 Web 服務**：\n{url_list}"
-
-    except ET.ParseError:
-        # [關鍵修正] 處理 XML 檔案不完整的情況 (通常是因為掃描中斷)
-        logger.warning("Nmap XML 解析失敗 (ParseError): 檔案可能不完整。")
-        return (
-            "**警告：掃描結果檔案不完整**\n"
-            "這通常是因為掃描過程被強制中斷 (Timeout 或 Memory 不足) 導致 XML 標籤未閉合。\n"
-            "建議：\n"
-            "1. 檢查 Docker 資源限制。\n"
-            "2. 嘗試縮小掃描範圍 (例如只掃描常用 Port)。"
-        )
+        return f"**偵察完成！發現 Web 服務**：\n{url_list}{partial_note}"
+
     except Exception as e:
-        logger.error(f"解析 Nmap XML 失敗: {e}")
+        logger.error(f"讀取 Nmap 結果失敗: {e}")
         return f"解析結果失敗: {str(e)}"
 
 
@@ -198,13 +157,21 @@ def run_nmap_recon(target_host: str, ports: str = "top-1000", force_rescan: bool
             nmap_cmd.insert(1, ports)
             nmap_cmd.insert(1, "-p")
 
+    # 由 Sidecar 包裝程式執行 Nmap，結束後立即解析一次並寫出 nmap_result.json
+    # (tools 套件初始化時已載入 nmap_sidecar，以 -c 呼叫 main 避免 -m 重複載入)
+    wrapper_cmd = [
+        sys.executable, "-c", "import sys; from tools.nmap_sidecar import main; sys.exit(main())",
+        "--xml", NMAP_XML_OUTPUT, "--", *nmap_cmd
+    ]
+
     try:
         # 使用 Popen 取代 run，實現非阻塞執行
         with open(NMAP_LOG_FILE, "w") as log_f:
             subprocess.Popen(
-                nmap_cmd,
+                wrapper_cmd,
                 stdout=log_f,
-                stderr=subprocess.STDOUT
+                stderr=subprocess.STDOUT,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             )
             
         return f"""
@@ -1,43 +1,32 @@
 """
 ZAP 掃描啟動工具
 """
-from typing import Optional, List
+from typing import Optional, Dict
 
-from core.config import SCAN_CONTAINER_NAME
+from core.config import SCAN_CONTAINER_NAME, WARMUP_WAIT_TIMEOUT
 from core.logging_config import logger
 from validators import is_safe_url
-from docker_utils import DockerClient
+from docker_utils import DockerClient, wait_for_warmup
+from profiles import compile_scan_profile, get_profile_settings, write_run_settings, clear_run_settings
+from reporting import prepare_report_backend
 
 
-def _build_auth_config(auth_header: str, auth_value: str) -> List[str]:
+def _build_auth_config(auth_header: str, auth_value: str) -> Dict[str, str]:
     """建立認證配置"""
-    return [
-        "-config", "replacer.full_list(0).description=MCP_Auth",
-        "-config", "replacer.full_list(0).enabled=true",
-        "-config", "replacer.full_list(0).matchtype=REQ_HEADER",
-        "-config", f"replacer.full_list(0).matchstr={auth_header}",
-        "-config", "replacer.full_list(0).regex=false",
-        "-config", f"replacer.full_list(0).replacement={auth_value}"
-    ]
+    return {
+        "replacer.full_list(0).description": "MCP_Auth",
+        "replacer.full_list(0).enabled": "true",
+        "replacer.full_list(0).matchtype": "REQ_HEADER",
+        "replacer.full_list(0).matchstr": auth_header,
+        "replacer.full_list(0).regex": "false",
+        "replacer.full_list(0).replacement": auth_value,
+    }
 
 
-def _build_aggressive_config(scan_type: str) -> List[str]:
+def _build_aggressive_config(scan_type: str) -> Dict[str, str]:
     """建立積極掃描配置"""
-    configs = []
-    configs.extend([
-        "-config", "scanner.threadPerHost=20", # 增加執行緒 (加速但高負載)
-        "-config", "spider.thread=10"
-    ])
-    if scan_type == "full":
-        configs.extend([
-            "-config", "scanner.strength=HIGH",
-            "-config", "scanner.threadPerHost=10",
-            "-config", "scanner.alertThreshold=LOW",
-            "-config", "rules.sqli.level=HIGH",  # 測試 SQL Injection
-            "-config", "rules.xss.level=HIGH",   # 測試 XSS
-            "-config", "rules.pathtraversal.level=HIGH" # 測試路徑遍歷
-        ])
-    return configs
+    profile = "full-aggressive" if scan_type == "full" else "baseline-aggressive"
+    return get_profile_settings(profile)
 
 
 def start_scan_job(
@@ -63,36 +52,65 @@ def start_scan_job(
     if not is_safe_url(target_url):
         return "錯誤：網址格式不合法。"
 
+    # 等待背景預熱完成，避免與映像檔拉取同時進行
+    if not wait_for_warmup(WARMUP_WAIT_TIMEOUT):
+        return """
+**環境預熱中** (正在拉取映像檔或建立 Volume)
+
+請使用 `warmup_status` 查看進度，完成後再重新啟動掃描。
+"""
+
     logger.info(f"啟動掃描: URL={target_url}, Type={scan_type}, Auth={bool(auth_value)}")
 
-    # 清理舊容器
+    # 清理舊容器與上次掃描留下的認證設定
     DockerClient.remove_container(SCAN_CONTAINER_NAME)
+    clear_run_settings()
 
     # 組建配置
-    zap_configs = []
+    zap_settings = {}
+    auth_settings = {}
     mode_desc = []
 
-    # 認證配置
+    # 認證配置 (不寫入可重用的設定檔)
     if auth_header and auth_value:
-        zap_configs.extend(_build_auth_config(auth_header, auth_value))
+        auth_settings = _build_auth_config(auth_header, auth_value)
         mode_desc.append("Authenticated")
 
     # 積極模式
     if aggressive:
         mode_desc.append("Aggressive")
-        zap_configs.extend(_build_aggressive_config(scan_type))
+        zap_settings.update(_build_aggressive_config(scan_type))
+
+    # 編譯為設定檔 (相同設定重複掃描時直接重用)；認證設定寫入單次掃描專用的設定檔，掃描結束後刪除
+    config_files = []
+    try:
+        if zap_settings:
+            profile_name = "-".join([scan_type, "aggressive"])
+            config_files.append(compile_scan_profile(profile_name, zap_settings)[1])
+        if auth_settings:
+            config_files.append(write_run_settings(auth_settings))
+    except OSError as e:
+        logger.error(f"編譯掃描設定檔失敗: {e}")
+        clear_run_settings()
+        return f"錯誤：無法寫入掃描設定檔 ({e})"
 
     # 執行掃描
     success, message = DockerClient.run_zap_scan(
         target_url=target_url,
         scan_type=scan_type,
         aggressive=aggressive,
-        zap_configs=zap_configs if zap_configs else None
+        config_files=config_files
     )
 
     if not success:
+        clear_run_settings()
         return message
 
+    # 預先啟動報告後端，掃描一完成即可開始生成報告
+    backend_ok, backend_msg = prepare_report_backend()
+    if not backend_ok:
+        logger.warning(f"報告後端準備失敗: {backend_msg}")
+
     # 組建模式描述
     mode_text = " / ".join(mode_desc) if mode_desc else "Standard"
 
@@ -1,14 +1,15 @@
 """
 掃描狀態檢查工具 (Async Fix)
 """
-from core.config import SCAN_CONTAINER_NAME
+from core.config import SCAN_CONTAINER_NAME, WARMUP_WAIT_TIMEOUT
 from core.logging_config import logger
-from docker_utils import DockerClient, parse_zap_progress
+from docker_utils import DockerClient, parse_zap_progress, wait_for_warmup
+from reporting import start_report_generation, is_report_generating, get_insights_store
+from profiles import clear_run_settings
 from tools.nmap_tool import is_nmap_running, _parse_nmap_results, NMAP_XML_OUTPUT
+from tools.nmap_sidecar import load_nmap_sidecar
 import os
 
-REPORTER_CONTAINER_NAME = "zap-reporter-job"
-
 def check_status_and_generate_report() -> str:
     """
     【流程第三步】檢查進度與報告狀態。
@@ -22,6 +23,8 @@ def check_status_and_generate_report() -> str:
     elif os.path.exists(NMAP_XML_OUTPUT):
         # 簡單判斷：如果沒在跑，但有檔案，可能是剛跑完
         # 這裡不自動回傳詳細結果以免洗版，只提示已完成
+        # 確保 Sidecar 已產生 (包裝程式異常結束時由此補建)
+        load_nmap_sidecar()
         status_report.append("**Nmap 偵察**: 已完成 (Ready)")
 
     # 1. 檢查 ZAP 掃描器狀態
@@ -34,13 +37,27 @@ def check_status_and_generate_report() -> str:
 請等待 30 秒後再檢查。
 """
 
+    # 掃描已結束，刪除含認證資訊的單次掃描設定檔
+    clear_run_settings()
+
     # 2. 檢查報告生成器狀態
-    if DockerClient.is_container_running(REPORTER_CONTAINER_NAME):
+    if is_report_generating():
         return """
 ⚙**報告生成中** (Status: Generating Report)
 正在進行 AI 分析、翻譯與圖表繪製...
 
 請等待 10 秒後再檢查。
+"""
+
+    # AI 建議分批提交中 (靜置後才會觸發報告生成)
+    pending = get_insights_store().pending()
+    if pending:
+        when = f"約 {pending['render_in']:.0f} 秒後" if pending['render_in'] is not None else "下次提交後"
+        return f"""
+**AI 建議合併中** (Status: Pending Insights)
+{pending['dirty']} 個弱點的建議已更新，將於{when}自動生成報告。
+
+請等待後再檢查，或以 `ai_insights_submit` 的 render_now=true 立即生成。
 """
 
     # 3. 檢查最終報告是否已產生 (檢查是否有名為 Scan_Report_*.docx 的檔案)
@@ -66,7 +83,9 @@ def check_status_and_generate_report() -> str:
 
     # 4. 掃描結束但報告未產生 -> 啟動報告生成器 (背景執行)
     if DockerClient.check_file_exists("ZAP-Report.json"):
-        success, msg = DockerClient.run_reporter_detached()
+        if not wait_for_warmup(WARMUP_WAIT_TIMEOUT):
+            return "**環境預熱中**，報告生成器映像檔尚未就緒。\n請使用 `warmup_status` 查看進度。"
+        success, msg = start_report_generation("scan_complete")
         if success:
             return "**掃描已完成，正在啟動報告生成器...**\n請在 10 秒後再次檢查狀態。"
         else:
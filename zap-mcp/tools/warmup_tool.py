@@ -0,0 +1,40 @@
+"""
+環境預熱狀態查詢工具
+"""
+import time
+
+from docker_utils import get_warmup_status
+
+STATUS_TEXT = {
+    "pending": "尚未啟動",
+    "running": "進行中",
+    "done": "已完成",
+    "failed": "部分失敗",
+}
+
+
+def check_warmup_status() -> str:
+    """
+    【輔助工具】查詢映像檔與 Volume 預熱狀態。
+
+    Returns:
+        str: 預熱狀態摘要
+    """
+    state = get_warmup_status()
+    status = state["status"]
+
+    lines = [f"**環境預熱**: {STATUS_TEXT.get(status, status)}"]
+    if state["started_at"]:
+        end = state["finished_at"] or time.time()
+        lines.append(f"耗時: {end - state['started_at']:.1f} 秒")
+
+    for step in state["steps"]:
+        mark = "OK" if step["ok"] else "FAIL"
+        lines.append(f"- [{mark}] {step['name']}: {step['detail']} ({step['elapsed']}s)")
+
+    if status == "running":
+        lines.append("\n首次拉取映像檔可能需要數分鐘，請稍後再查詢。")
+    elif status == "failed":
+        lines.append("\n部分映像檔無法取得，請確認網路連線或執行 build.sh 建置本機映像檔。")
+
+    return "\n".join(lines)
@@ -0,0 +1,236 @@
+"""
+ZAP Reporter - 批次模式 (Batch)
+
+於指定的根目錄下尋找任務目錄 (含 ZAP-Report.json，可選 ai_insights.json / Nmap 結果)，
+以程序池同時為每個任務目錄生成報告:
+
+- 各任務於獨立的工作程序中執行，輸出與記錄檔 (batch_report.log) 寫入各自的目錄，
+  單一任務失敗不影響其他任務
+- 報告檔名精確到秒並於衝突時加上序號，不會互相覆寫
+- 父程序預先載入依賴並批次翻譯全部任務所需的文字，工作程序 (fork) 直接共用已暖機的翻譯快取
+- 結束時輸出各任務的耗時與失敗原因 (Batch_Summary_<時間>.json)
+"""
+import os
+import sys
+import json
+import time
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from config.settings import ZAP_REPORT_FILENAME, AI_INSIGHTS_FILENAME, BATCH_WORKERS
+from services.json_loader import load_json
+
+# 各任務目錄的記錄檔 (該任務的完整輸出)
+JOB_LOG_FILENAME = "batch_report.log"
+
+
+def discover_jobs(roots: Sequence[str]) -> List[str]:
+    """
+    尋找任務目錄 (根目錄本身或其下任一層含 ZAP-Report.json 的目錄，略過隱藏目錄)
+
+    Args:
+        roots: 根目錄
+
+    Returns:
+        list: 任務目錄 (已去重並排序)
+    """
+    jobs = {}
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            if ZAP_REPORT_FILENAME in filenames:
+                jobs.setdefault(os.path.realpath(dirpath), dirpath)
+    return sorted(jobs.values())
+
+
+def warm_translations(job_dirs: Sequence[str]) -> int:
+    """
+    批次翻譯全部任務的詳情頁文字並寫入翻譯快取 (各任務相同的文字只翻譯一次)
+
+    Args:
+        job_dirs: 任務目錄
+
+    Returns:
+        int: 新翻譯的片段數量
+    """
+    from services.findings import build_findings
+    from services.translator import prefetch_translations, save_translation_cache
+    from document.sections import collect_detail_texts
+
+    texts = {}
+    for job_dir in job_dirs:
+        data = load_json(os.path.join(job_dir, ZAP_REPORT_FILENAME), quiet=True)
+        if data is None:
+            continue
+        ai_data = load_json(os.path.join(job_dir, AI_INSIGHTS_FILENAME), quiet=True)
+        texts.update(dict.fromkeys(collect_detail_texts(build_findings(data), ai_data)))
+
+    translated = prefetch_translations(texts)
+    if translated:
+        save_translation_cache()
+    return translated
+
+
+def _last_log_line(log_path: str) -> Optional[str]:
+    """記錄檔的最後一行 (報告生成失敗時作為失敗原因)"""
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+    except OSError:
+        return None
+    return lines[-1] if lines else None
+
+
+def _run_job(job_dir: str, formats: Sequence[str]) -> dict:
+    """於工作程序中生成單一任務的報告 (輸出導向該任務目錄的記錄檔)"""
+    from main import run_report
+
+    started = time.perf_counter()
+    result = {"directory": job_dir, "status": "failed", "output": None, "seconds": None, "error": None}
+    log_path = os.path.join(job_dir, JOB_LOG_FILENAME)
+
+    try:
+        with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+            try:
+                output = run_report(job_dir, formats)
+            except Exception as e:
+                traceback.print_exc()
+                output = None
+                result["error"] = f"{type(e).__name__}: {e}"
+    except OSError as e:
+        result["error"] = f"無法寫入記錄檔: {e}"
+        output = None
+
+    if output:
+        result["status"] = "done"
+        result["output"] = os.path.basename(output)
+    elif result["error"] is None:
+        result["error"] = _last_log_line(log_path) or f"報告生成失敗，詳見 {JOB_LOG_FILENAME}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _pool_context():
+    """工作程序建立方式 (可用時使用 fork，沿用父程序已載入的依賴與翻譯快取)"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _crash_result(job_dir: str, error: Exception) -> dict:
+    return {
+        "directory": job_dir, "status": "failed", "output": None, "seconds": None,
+        "error": f"工作程序異常結束: {error}",
+    }
+
+
+def _run_isolated(job_dir: str, formats: Sequence[str]) -> dict:
+    """於單次使用的工作程序中執行單一任務 (程序崩潰時只有該任務記為失敗)"""
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=_pool_context()) as pool:
+            return pool.submit(_run_job, job_dir, formats).result()
+    except BrokenProcessPool as e:
+        return _crash_result(job_dir, e)
+    except OSError as e:
+        print(f"[batch] 無法建立工作程序，改於目前程序執行: {e}")
+        return _run_job(job_dir, formats)
+
+
+def _print_result(finished: int, total: int, result: dict):
+    seconds = f"{result['seconds']:.2f}s" if result['seconds'] is not None else "-"
+    detail = result['output'] if result['status'] == "done" else result['error']
+    print(f"[batch] ({finished}/{total}) {result['status']:<6} {seconds:>8}  {result['directory']}  {detail}")
+
+
+def run_batch(roots: Sequence[str], formats: Sequence[str], output_dir: str,
+              workers: int = BATCH_WORKERS) -> dict:
+    """
+    批次生成多個任務目錄的報告
+
+    Args:
+        roots: 根目錄 (遞迴尋找任務目錄)
+        formats: 輸出格式
+        output_dir: 批次摘要的輸出目錄
+        workers: 工作程序數 (1 = 單一程序依序執行)
+
+    Returns:
+        dict: 批次摘要 {"jobs", "done", "failed", "workers", "warmup_seconds", "seconds", "summary"}
+    """
+    from main import output_base_path
+
+    started = time.perf_counter()
+    job_dirs = discover_jobs(roots)
+    workers = max(1, min(workers, len(job_dirs)))
+    print(f"[batch] 找到 {len(job_dirs)} 個任務目錄，使用 {workers} 個工作程序")
+
+    # 父程序預先載入依賴並暖機翻譯快取，fork 的工作程序直接共用
+    if job_dirs and "docx" in formats:
+        import report_builder  # noqa: F401
+        translated = warm_translations(job_dirs)
+        print(f"[batch] 翻譯快取暖機完成 (新翻譯 {translated} 段，{time.perf_counter() - started:.2f}s)")
+    warmup_seconds = round(time.perf_counter() - started, 3)
+
+    results = {}
+    broken = False
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                futures = {pool.submit(_run_job, job_dir, formats): job_dir for job_dir in job_dirs}
+                for future in as_completed(futures):
+                    job_dir = futures[future]
+                    try:
+                        results[job_dir] = future.result()
+                    except BrokenProcessPool:
+                        # 任一工作程序崩潰會讓程序池內所有未完成的任務一併失敗，無法得知是哪一個任務造成
+                        broken = True
+                        continue
+                    _print_result(len(results), len(job_dirs), results[job_dir])
+        except OSError as e:
+            print(f"[batch] 無法建立程序池，剩餘任務改為單一程序執行: {e}")
+
+    if broken:
+        remaining = [job_dir for job_dir in job_dirs if job_dir not in results]
+        print(f"[batch] 工作程序異常結束，{len(remaining)} 個未完成的任務改為逐一於獨立程序重新執行")
+        for job_dir in remaining:
+            results[job_dir] = _run_isolated(job_dir, formats)
+            _print_result(len(results), len(job_dirs), results[job_dir])
+
+    for job_dir in job_dirs:
+        if job_dir not in results:
+            results[job_dir] = _run_job(job_dir, formats)
+            _print_result(len(results), len(job_dirs), results[job_dir])
+
+    jobs = [results[job_dir] for job_dir in job_dirs]
+    summary = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "formats": list(formats),
+        "workers": workers,
+        "jobs": len(jobs),
+        "done": sum(1 for job in jobs if job["status"] == "done"),
+        "failed": sum(1 for job in jobs if job["status"] != "done"),
+        "warmup_seconds": warmup_seconds,
+        "seconds": round(time.perf_counter() - started, 3),
+        "results": jobs,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = output_base_path(output_dir, "Batch_Summary") + ".json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    summary["summary"] = summary_path
+
+    print(
+        f"[batch] 完成 {summary['done']}/{summary['jobs']} 個任務，失敗 {summary['failed']} 個 "
+        f"({summary['seconds']:.2f}s)，摘要已儲存至: {summary_path}"
+    )
+    for job in jobs:
+        if job["status"] != "done":
+            print(f"[batch]   失敗: {job['directory']} - {job['error']}")
+    sys.stdout.flush()
+    return summary
+
@@ -0,0 +1,108 @@
+"""
+多份報告統計基準測試
+1. 以合成 ZAP 報告量測讀取 (JSON -> 欄位式陣列) 與統計耗時
+2. 直接產生 --rows 筆隨機弱點列，量測向量化統計在大量資料下的耗時
+
+用法:
+    python benchmarks/bench_aggregate.py --reports 20 --sites 100 --rows 1000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("TRANSLATION_BACKEND", "none")
+os.environ.setdefault("ZAP_DATA_DIR", tempfile.mkdtemp(prefix="zap-bench-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import make_zap_report  # noqa: E402
+from services.aggregation import (  # noqa: E402
+    ReportColumns, load_reports, risk_counts, site_risk_pivot, confidence_pivot,
+    top_plugins, risk_trend, target_deltas
+)
+
+
+def _time_stats(columns: ReportColumns) -> dict:
+    timings = {}
+    for name, func in (
+        ("risk_counts", lambda: risk_counts(columns)),
+        ("site_risk_pivot", lambda: site_risk_pivot(columns)),
+        ("confidence_pivot", lambda: confidence_pivot(columns)),
+        ("top_plugins", lambda: top_plugins(columns, 10)),
+        ("risk_trend", lambda: risk_trend(columns)),
+        ("target_deltas", lambda: target_deltas(columns)),
+    ):
+        started = time.perf_counter()
+        func()
+        timings[name] = round(time.perf_counter() - started, 4)
+    timings["total"] = round(sum(timings.values()), 4)
+    return timings
+
+
+def _random_columns(rows: int, sites: int, plugins: int, reports: int, seed: int) -> ReportColumns:
+    rng = np.random.default_rng(seed)
+    site = rng.integers(0, sites, rows, dtype=np.int32)
+    report = np.sort(rng.integers(0, reports, rows, dtype=np.int32))
+    # 每份報告涵蓋的網站: 有弱點的 (網站, 報告) 組合
+    scans = np.unique(site.astype(np.int64) * reports + report)
+    return ReportColumns(
+        site=site,
+        plugin=rng.integers(0, plugins, rows, dtype=np.int32),
+        risk=rng.integers(0, 4, rows, dtype=np.int8),
+        confidence=rng.integers(1, 4, rows, dtype=np.int8),
+        instances=rng.integers(1, 20, rows, dtype=np.int32),
+        report=report,
+        scan_site=(scans // reports).astype(np.int32),
+        scan_report=(scans % reports).astype(np.int32),
+        sites=[f"https://site{i:05d}.example.test" for i in range(sites)],
+        plugins=[str(10000 + i) for i in range(plugins)],
+        reports=[f"report{i}.json" for i in range(reports)],
+        report_times=1704110400 + np.arange(reports, dtype=np.int64) * 86400,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="多份報告統計基準測試")
+    parser.add_argument("--reports", type=int, default=20, help="合成報告數量")
+    parser.add_argument("--sites", type=int, default=100, help="每份合成報告的網站數量")
+    parser.add_argument("--rows", type=int, default=1000000, help="隨機弱點列數量")
+    args = parser.parse_args()
+
+    out_dir = os.environ["ZAP_DATA_DIR"]
+    paths = []
+    for i in range(args.reports):
+        report = make_zap_report(args.sites, 12, 3, seed=i)
+        report["@generated"] = f"Mon, {i % 28 + 1} Jan 2024 12:00:00"
+        path = os.path.join(out_dir, f"ZAP-Report-{i}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+        paths.append(path)
+
+    started = time.perf_counter()
+    columns = load_reports(paths)
+    load_seconds = time.perf_counter() - started
+
+    random_columns = _random_columns(args.rows, 5000, 200, 365, seed=1)
+
+    print(json.dumps({
+        "reports": {
+            "files": len(paths),
+            "rows": len(columns),
+            "load_seconds": round(load_seconds, 4),
+            "rows_per_second": int(len(columns) / load_seconds) if load_seconds else None,
+            "stats_seconds": _time_stats(columns),
+        },
+        "random": {
+            "rows": len(random_columns),
+            "stats_seconds": _time_stats(random_columns),
+        },
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
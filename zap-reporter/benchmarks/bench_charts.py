@@ -0,0 +1,89 @@
+"""
+圖表繪製基準測試：pyplot 全域狀態 + 暫存檔 vs Agg 畫布 + 記憶體快取
+每種模式在獨立子程序中執行，以量測冷啟動的匯入成本。
+
+用法:
+    python benchmarks/bench_charts.py --sites 50
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 舊版做法: 匯入 pyplot，以全域狀態繪製圓餅圖並寫入暫存檔後刪除
+LEGACY = r"""
+import os, sys, json, time, tempfile
+t0 = time.perf_counter()
+import matplotlib.pyplot as plt
+t1 = time.perf_counter()
+stats = json.loads(sys.argv[1])
+path = os.path.join(tempfile.mkdtemp(), "risk_chart.png")
+for _ in range(int(sys.argv[2])):
+    plt.figure(figsize=(4, 3))
+    plt.pie(list(stats.values()), labels=list(stats), autopct='%1.1f%%', startangle=140)
+    plt.axis('equal')
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+    plt.close()
+    os.remove(path)
+t2 = time.perf_counter()
+print(json.dumps({"import_seconds": t1 - t0, "render_seconds": t2 - t1, "charts": int(sys.argv[2])}))
+"""
+
+# 新版做法: 批次繪製圓餅圖、各網站長條圖與熱度圖，重複報告時命中快取
+CURRENT = r"""
+import sys, json, time
+sys.path.insert(0, sys.argv[3])
+from benchmarks.synthetic import make_zap_report
+from services.findings import build_findings
+from document import charts
+findings = build_findings(make_zap_report(int(sys.argv[4]), 10, 1))
+specs = {
+    "risk_pie": charts.risk_pie_payload(findings.risk_counts),
+    "site_bars": charts.site_bars_payload(findings.site_risk_counts),
+    "confidence_heatmap": charts.confidence_heatmap_payload(findings.confidence_matrix),
+}
+t0 = time.perf_counter()
+for _ in range(int(sys.argv[2])):
+    charts.render_charts(specs)
+total = time.perf_counter() - t0
+m = charts.get_chart_metrics()
+print(json.dumps({"import_seconds": m["import_seconds"], "render_seconds": total - m["import_seconds"],
+                  "charts": m["rendered"] + m["cache_hits"], "rendered": m["rendered"], "cache_hits": m["cache_hits"]}))
+"""
+
+
+def _run(code: str, *args: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="圖表繪製基準測試")
+    parser.add_argument("--sites", type=int, default=50, help="合成報告的網站數量")
+    parser.add_argument("--reports", type=int, default=5, help="同一程序中連續產生的報告份數")
+    args = parser.parse_args()
+
+    env = dict(os.environ, ZAP_DATA_DIR=tempfile.mkdtemp(prefix="zap-bench-"))
+    stats = json.dumps({"High": 3, "Medium": 8, "Low": 12, "Informational": 5})
+
+    results = {
+        "legacy_pyplot": _run(LEGACY, stats, str(args.reports), env=env),
+        "agg_cached": _run(CURRENT, stats, str(args.reports), ROOT, str(args.sites), env=env),
+    }
+    for mode, r in results.items():
+        print(f"{mode:>14}: import {r['import_seconds']:.3f}s  render {r['render_seconds']:.3f}s  ({r['charts']} charts)")
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
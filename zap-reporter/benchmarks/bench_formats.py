@@ -0,0 +1,58 @@
+"""
+輕量輸出格式基準測試
+以合成報告量測各格式 (HTML / Markdown / JSON / SARIF) 的建模與輸出耗時，
+並確認輕量寫入器不會載入 python-docx 與 matplotlib。
+
+用法:
+    python benchmarks/bench_formats.py --sites 300 --alerts 12 --instances 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("TRANSLATION_BACKEND", "none")
+os.environ.setdefault("ZAP_DATA_DIR", tempfile.mkdtemp(prefix="zap-bench-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_zap_report  # noqa: E402
+from services.findings import build_findings  # noqa: E402
+from writers import WRITERS, build_report_model, write_report  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="輕量輸出格式基準測試")
+    parser.add_argument("--sites", type=int, default=300)
+    parser.add_argument("--alerts", type=int, default=12, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=5, help="每個弱點的實例數量")
+    args = parser.parse_args()
+
+    findings = build_findings(make_zap_report(args.sites, args.alerts, args.instances))
+    out_dir = os.environ["ZAP_DATA_DIR"]
+
+    started = time.perf_counter()
+    model = build_report_model(findings)
+    results = {
+        "input": {"sites": args.sites, "alerts_per_site": args.alerts, "instances": args.instances},
+        "model_seconds": round(time.perf_counter() - started, 4),
+        "formats": {},
+    }
+
+    for fmt, (ext, _) in WRITERS.items():
+        path = os.path.join(out_dir, f"report{ext}")
+        started = time.perf_counter()
+        write_report(fmt, model, path)
+        results["formats"][fmt] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "bytes": os.path.getsize(path),
+        }
+
+    results["heavy_modules_loaded"] = sorted(m for m in ("docx", "matplotlib") if m in sys.modules)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+片段快取基準測試：重新產生報告的耗時
+以合成報告 (預設 50 個網站 x 10 個弱點、不分組 = 500 個弱點區塊) 依序量測:
+    disabled  停用片段快取 (同時使圖表快取暖機，作為對照)
+    cold      片段快取為空 (全部渲染並寫入快取)
+    warm      輸入未變更的第二次產生 (全部重用)
+    edited    修改一個弱點的受影響實例後重新產生 (只重新渲染該區塊)
+並比對各次輸出的 document.xml (去除封面的產生日期) 是否與重新渲染的結果一致。
+
+用法:
+    python benchmarks/bench_fragment_cache.py --sites 50 --alerts 10 --instances 3
+"""
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import hashlib
+import argparse
+import tempfile
+
+os.environ.setdefault("TRANSLATION_BACKEND", "none")
+os.environ.setdefault("ZAP_DATA_DIR", tempfile.mkdtemp(prefix="zap-bench-"))
+os.environ.setdefault("REPORT_GROUP_ALERTS", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_zap_report  # noqa: E402
+from config.settings import FRAGMENT_CACHE_DIR  # noqa: E402
+from document.sections import details  # noqa: E402
+from report_builder import generate_word_report  # noqa: E402
+
+
+def _body_sha1(path: str) -> str:
+    with zipfile.ZipFile(path) as package:
+        xml = package.read("word/document.xml")
+    return hashlib.sha1(re.sub("產生日期: [^<]*".encode("utf-8"), b"", xml)).hexdigest()
+
+
+def _run(name: str, json_path: str, out_dir: str, cache_dir: str) -> dict:
+    details.FRAGMENT_CACHE_DIR = cache_dir
+    output = os.path.join(out_dir, f"report_{name}.docx")
+    started = time.perf_counter()
+    generate_word_report(json_path, output)
+    return {"seconds": round(time.perf_counter() - started, 3), "document_sha1": _body_sha1(output)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="片段快取基準測試")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--alerts", type=int, default=10, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=3, help="每個弱點的實例數量")
+    args = parser.parse_args()
+
+    out_dir = os.environ["ZAP_DATA_DIR"]
+    report = make_zap_report(args.sites, args.alerts, args.instances)
+    json_path = os.path.join(out_dir, "ZAP-Report.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+    results = {
+        "input": {"sites": args.sites, "alerts_per_site": args.alerts, "instances": args.instances},
+        "disabled": _run("disabled", json_path, out_dir, ""),
+        "cold": _run("cold", json_path, out_dir, FRAGMENT_CACHE_DIR),
+        "warm": _run("warm", json_path, out_dir, FRAGMENT_CACHE_DIR),
+    }
+
+    report["site"][0]["alerts"][0]["instances"][0]["uri"] += "?retest=1"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    results["edited"] = _run("edited", json_path, out_dir, FRAGMENT_CACHE_DIR)
+    results["edited_disabled"] = _run("edited_disabled", json_path, out_dir, "")
+
+    for name in ("cold", "warm"):
+        results[name]["identical"] = results[name]["document_sha1"] == results["disabled"]["document_sha1"]
+    results["edited"]["identical"] = (
+        results["edited"]["document_sha1"] == results["edited_disabled"]["document_sha1"]
+    )
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
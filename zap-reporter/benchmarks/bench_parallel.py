@@ -0,0 +1,86 @@
+"""
+弱點詳情頁平行渲染基準測試
+以合成的多網站報告量測 1..N 個工作程序渲染詳情頁的耗時與加速比 (停用線上翻譯)，
+並確認各種工作程序數產生的內容與單一程序渲染完全一致。
+預設停用弱點分組，使每個網站的每個弱點各自成為一個區塊。
+
+用法:
+    python benchmarks/bench_parallel.py --sites 100 --alerts 12 --max-workers 8
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+
+os.environ.setdefault("TRANSLATION_BACKEND", "none")
+os.environ.setdefault("ZAP_DATA_DIR", tempfile.mkdtemp(prefix="zap-bench-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree  # noqa: E402
+
+from benchmarks.synthetic import make_zap_report  # noqa: E402
+from services.findings import build_findings  # noqa: E402
+from document.template import new_document  # noqa: E402
+from document.sections import add_details_section  # noqa: E402
+from document.sections import details  # noqa: E402
+
+
+def _run(findings, workers: int, out_dir: str) -> dict:
+    doc = new_document()
+
+    started = time.perf_counter()
+    add_details_section(doc, findings, workers=workers, cache_dir="")
+    built = time.perf_counter() - started
+
+    path = os.path.join(out_dir, f"details_w{workers}.docx")
+    doc.save(path)
+    total = time.perf_counter() - started
+
+    body = etree.tostring(doc.element.body)
+    return {
+        "workers": workers,
+        "build_seconds": round(built, 3),
+        "total_seconds": round(total, 3),
+        "tables": len(doc.tables),
+        "body_sha1": hashlib.sha1(body).hexdigest(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="弱點詳情頁平行渲染基準測試")
+    parser.add_argument("--sites", type=int, default=100)
+    parser.add_argument("--alerts", type=int, default=12, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=3, help="每個弱點的實例數量")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--grouped", action="store_true", help="啟用弱點分組")
+    args = parser.parse_args()
+
+    details.DETAIL_GROUP_ALERTS = args.grouped
+    findings = build_findings(make_zap_report(args.sites, args.alerts, args.instances))
+    out_dir = os.environ["ZAP_DATA_DIR"]
+
+    counts = sorted({1, args.max_workers} | {n for n in (2, 4, 8, 16) if n < args.max_workers})
+    runs = []
+    for workers in counts:
+        result = _run(findings, workers, out_dir)
+        result["speedup"] = round(runs[0]["build_seconds"] / result["build_seconds"], 2) if runs else 1.0
+        runs.append(result)
+        print(f"{workers:>3} workers: {result['build_seconds']:.2f}s  x{result['speedup']}")
+
+    results = {
+        "input": {
+            "sites": args.sites, "alerts_per_site": args.alerts,
+            "instances": args.instances, "grouped": args.grouped, "cpus": os.cpu_count()
+        },
+        "identical": len({r["body_sha1"] for r in runs}) == 1,
+        "runs": runs,
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
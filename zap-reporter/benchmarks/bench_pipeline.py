@@ -0,0 +1,278 @@
+"""
+報告流程分段基準測試
+以合成輸入 (ZAP 報告、Nmap XML、ai_insights.json) 依序執行報告流程的每個階段，
+記錄各階段的耗時、tracemalloc 尖峰記憶體與累計尖峰 RSS，輸出 JSON 供不同 commit 間比較。
+
+階段:
+    import             載入 python-docx / matplotlib 等依賴
+    load               讀取 ZAP JSON
+    normalise          建立弱點模型 (build_findings)
+    nmap               解析 Nmap XML 並寫入正規化結果
+    ai_match           讀取 AI 建議、建立查找索引並對應各弱點
+    translate          批次翻譯詳情頁文字 (替身後端，不連網；--translate-latency 模擬每批延遲)
+    charts             繪製摘要頁圖表 (停用磁碟快取)
+    section_cover / section_summary / section_details   產生 Word 各區塊 (摘要頁的圖表已於 charts 繪製)
+    save               儲存 DOCX
+    model / write_<格式>  輕量格式的共用模型與各寫入器
+
+片段快取預設停用 (量測完整渲染)；每次執行使用新的暫存資料目錄，翻譯與圖表快取皆為冷啟動。
+
+用法:
+    python benchmarks/bench_pipeline.py --sites 200 --alerts 10 -o bench.json
+    python benchmarks/bench_pipeline.py --sites 200 --alerts 10 --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+os.environ.setdefault("TRANSLATION_BACKEND", "none")
+os.environ.setdefault("TRANSLATION_RATE", "0")
+os.environ.setdefault("FRAGMENT_CACHE_DIR", "")
+os.environ.setdefault("ZAP_DATA_DIR", tempfile.mkdtemp(prefix="zap-bench-"))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_zap_report, make_nmap_xml, make_ai_insights  # noqa: E402
+from config.settings import ZAP_REPORT_FILENAME, AI_INSIGHTS_FILENAME, NMAP_REPORT_FILENAME  # noqa: E402
+from services.translation_engine import TranslationBackend, TranslationEngine  # noqa: E402
+
+FORMATS = ("docx", "md", "html", "json", "sarif")
+
+
+class StubBackend(TranslationBackend):
+    """翻譯替身: 於原文前加上標記，可模擬每批請求的延遲"""
+
+    name = "stub"
+    max_chars = 1 << 30
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.batches = 0
+
+    def translate_batch(self, texts):
+        self.batches += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"〔譯〕{t}" for t in texts]
+
+
+class StageRecorder:
+    """依序記錄各階段的耗時與記憶體"""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        if trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - started
+        record = {"seconds": round(seconds, 4)}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["py_peak_mb"] = round((peak - base) / 1048576, 2)
+            record["py_retained_mb"] = round((current - base) / 1048576, 2) or 0.0
+        record["rss_peak_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        self.stages[name] = record
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _write_inputs(data_dir: str, args) -> dict:
+    """寫出合成輸入，回傳各檔案大小"""
+    report = make_zap_report(args.sites, args.alerts, args.instances, args.seed, args.text_length, args.custom_rules)
+    files = {ZAP_REPORT_FILENAME: json.dumps(report)}
+    if args.hosts:
+        files[NMAP_REPORT_FILENAME] = make_nmap_xml(args.hosts, args.seed)
+    if args.ai_coverage > 0:
+        files[AI_INSIGHTS_FILENAME] = json.dumps(make_ai_insights(report, args.ai_coverage, args.seed),
+                                                 ensure_ascii=False)
+    for name, content in files.items():
+        with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+            f.write(content)
+    return {name: os.path.getsize(os.path.join(data_dir, name)) for name in files}
+
+
+def run_pipeline(data_dir: str, formats, recorder: StageRecorder, latency: float) -> dict:
+    """依序執行各階段，回傳輸出摘要"""
+    with recorder.stage("import"):
+        import report_builder  # noqa: F401
+        from docx import Document  # noqa: F401
+        from document.charts import preload_chart_backend
+        from document.template import new_document
+        from document.sections import (
+            add_cover_page, add_summary_section, add_details_section, collect_detail_texts, match_ai_solutions
+        )
+        from document.charts import render_charts, risk_pie_payload, site_bars_payload, confidence_heatmap_payload
+        from services.findings import build_findings
+        from services.nmap_sidecar import load_nmap_sidecar
+        from services.ai_matching import build_ai_index
+        from services.translator import get_translator, prefetch_translations
+        from writers import WRITERS, build_report_model, write_report
+        preload_chart_backend()
+
+    backend = StubBackend(latency)
+    get_translator().engine = TranslationEngine(backend)
+
+    with recorder.stage("load"):
+        with open(os.path.join(data_dir, ZAP_REPORT_FILENAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    with recorder.stage("normalise"):
+        findings = build_findings(data)
+    del data
+
+    with recorder.stage("nmap"):
+        nmap_data = load_nmap_sidecar(data_dir)
+
+    with recorder.stage("ai_match"):
+        ai_path = os.path.join(data_dir, AI_INSIGHTS_FILENAME)
+        ai_data = None
+        if os.path.exists(ai_path):
+            with open(ai_path, "r", encoding="utf-8") as f:
+                ai_data = json.load(f)
+        ai_index = build_ai_index(ai_data, findings=findings)
+        matches = match_ai_solutions(findings, ai_index)
+
+    with recorder.stage("translate"):
+        translated = prefetch_translations(collect_detail_texts(findings, ai_data, ai_index))
+
+    output_base = os.path.join(data_dir, "Bench_Report")
+    summary = {
+        "alerts": findings.total,
+        "groups": len(findings.groups()),
+        "nmap_hosts": len(nmap_data["hosts"]) if nmap_data else 0,
+        "ai_matched": sum(1 for _, match in matches if match.content),
+        "translated_segments": translated,
+        "translate_batches": backend.batches,
+        "outputs": {},
+    }
+
+    if "docx" in formats:
+        with recorder.stage("charts"):
+            render_charts({
+                "risk_pie": risk_pie_payload(findings.risk_counts),
+                "site_bars": site_bars_payload(findings.site_risk_counts),
+                "confidence_heatmap": confidence_heatmap_payload(findings.confidence_matrix),
+            })
+
+        doc = new_document()
+        with recorder.stage("section_cover"):
+            add_cover_page(doc, findings, data_dir, "Benchmark")
+        with recorder.stage("section_summary"):
+            add_summary_section(doc, findings, data_dir, ai_data, nmap_data)
+        with recorder.stage("section_details"):
+            add_details_section(doc, findings, ai_data, ai_index=ai_index)
+        with recorder.stage("save"):
+            doc.save(output_base + ".docx")
+        summary["outputs"]["docx"] = os.path.getsize(output_base + ".docx")
+        del doc
+
+    light_formats = [fmt for fmt in formats if fmt != "docx"]
+    if light_formats:
+        with recorder.stage("model"):
+            model = build_report_model(findings, nmap_data, ai_data)
+        for fmt in light_formats:
+            path = output_base + WRITERS[fmt][0]
+            with recorder.stage(f"write_{fmt}"):
+                write_report(fmt, model, path)
+            summary["outputs"][fmt] = os.path.getsize(path)
+
+    return summary
+
+
+def _compare(current: dict, baseline: dict):
+    """列出與基準結果相比的各階段差異"""
+    print(f"\n與 {baseline.get('commit') or '基準'} 比較 (目前 {current.get('commit') or '-'}):")
+    print(f"{'階段':<18}{'基準 s':>10}{'目前 s':>10}{'差異':>9}{'基準 MB':>10}{'目前 MB':>10}")
+    for name, record in current["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            print(f"{name:<18}{'-':>10}{record['seconds']:>10.3f}")
+            continue
+        delta = (record["seconds"] - old["seconds"]) / old["seconds"] * 100 if old["seconds"] else 0.0
+        print(
+            f"{name:<18}{old['seconds']:>10.3f}{record['seconds']:>10.3f}{delta:>+8.1f}%"
+            f"{old.get('py_peak_mb', 0):>10.1f}{record.get('py_peak_mb', 0):>10.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="報告流程分段基準測試")
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--alerts", type=int, default=10, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=5, help="每個弱點的實例數量")
+    parser.add_argument("--text-length", type=int, default=None, help="描述與修復建議的約略字元數")
+    parser.add_argument("--custom-rules", type=int, default=20, help="翻譯目錄未涵蓋的規則數 (需經過翻譯)")
+    parser.add_argument("--hosts", type=int, default=20, help="Nmap 主機數量 (0 = 不產生)")
+    parser.add_argument("--ai-coverage", type=float, default=0.5, help="附上 AI 建議的規則比例 (0 = 不產生)")
+    parser.add_argument("--translate-latency", type=float, default=0.0, help="翻譯替身每批請求的延遲秒數")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--format", default=",".join(FORMATS), help="輸出格式 (逗號分隔)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="停用 tracemalloc (耗時較準確，但不記錄各階段記憶體)")
+    parser.add_argument("-o", "--output", help="結果 JSON 輸出路徑")
+    parser.add_argument("--compare", help="與先前輸出的結果 JSON 比較")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.format.split(",") if f.strip()]
+    data_dir = os.environ["ZAP_DATA_DIR"]
+    input_sizes = _write_inputs(data_dir, args)
+
+    recorder = StageRecorder(trace_memory=not args.no_tracemalloc)
+    started = time.perf_counter()
+    summary = run_pipeline(data_dir, formats, recorder, args.translate_latency)
+    total = time.perf_counter() - started
+
+    result = {
+        "commit": _git_commit(),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "tracemalloc": recorder.trace_memory,
+        "params": {
+            "sites": args.sites, "alerts_per_site": args.alerts, "instances": args.instances,
+            "text_length": args.text_length, "custom_rules": args.custom_rules, "hosts": args.hosts,
+            "ai_coverage": args.ai_coverage, "translate_latency": args.translate_latency,
+            "seed": args.seed, "formats": formats,
+        },
+        "inputs": input_sizes,
+        "summary": summary,
+        "stages": recorder.stages,
+        "total_seconds": round(total, 4),
+    }
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            _compare(result, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Reporter 啟動基準測試
+於獨立子程序中量測匯入報告模組與繪製第一張圖表的耗時，比較:
+  cold: 空的 MPLCONFIGDIR (等同舊版每次執行都清除字型快取)
+  warm: 預先以 build_font_cache() 建立的字型快取 (映像建置時的做法)
+
+用法:
+    python benchmarks/bench_startup.py --runs 3
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import sys, json, time
+t0 = time.perf_counter()
+import report_builder
+t1 = time.perf_counter()
+mpl_on_import = 'matplotlib' in sys.modules
+from document.charts import render_chart
+render_chart("risk_pie", (("High", 3), ("Medium", 5)))
+t2 = time.perf_counter()
+print(json.dumps({"import_seconds": t1 - t0, "first_chart_seconds": t2 - t1, "matplotlib_on_import": mpl_on_import}))
+"""
+
+
+def _probe(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _summarize(samples: list) -> dict:
+    return {
+        "import_seconds": round(statistics.median(s["import_seconds"] for s in samples), 3),
+        "first_chart_seconds": round(statistics.median(s["first_chart_seconds"] for s in samples), 3),
+        "matplotlib_on_import": any(s["matplotlib_on_import"] for s in samples),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reporter 啟動基準測試")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    base_env = dict(os.environ, TRANSLATION_BACKEND="none")
+
+    cold = []
+    for _ in range(args.runs):
+        mpl_dir = tempfile.mkdtemp(prefix="mpl-cold-")
+        # 圖表快取也需清空，否則第一張圖表會直接命中快取
+        cold.append(_probe(dict(base_env, MPLCONFIGDIR=mpl_dir, ZAP_DATA_DIR=tempfile.mkdtemp())))
+        shutil.rmtree(mpl_dir, ignore_errors=True)
+
+    mpl_dir = tempfile.mkdtemp(prefix="mpl-warm-")
+    subprocess.run(
+        [sys.executable, "-c", "from config.fonts import build_font_cache; build_font_cache()"],
+        cwd=ROOT, env=dict(base_env, MPLCONFIGDIR=mpl_dir), check=True, capture_output=True
+    )
+    warm = [
+        _probe(dict(base_env, MPLCONFIGDIR=mpl_dir, ZAP_DATA_DIR=tempfile.mkdtemp()))
+        for _ in range(args.runs)
+    ]
+    shutil.rmtree(mpl_dir, ignore_errors=True)
+
+    results = {"cold_font_cache": _summarize(cold), "prebuilt_font_cache": _summarize(warm)}
+    for mode, r in results.items():
+        print(f"{mode:>20}: import {r['import_seconds']:.3f}s  first chart {r['first_chart_seconds']:.3f}s")
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Word 寫入方式基準測試：python-docx 完整 DOM vs 串流寫入
+每種模式在獨立子程序中產生同一份合成報告，量測耗時、尖峰記憶體 (RSS) 與檔案大小。
+預設停用弱點分組，使每個網站的每個弱點各自成為一個區塊。
+
+用法:
+    python benchmarks/bench_writer.py --sites 200 --alerts 12
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import sys, json, time, resource
+from report_builder import generate_word_report
+started = time.perf_counter()
+ok = generate_word_report(sys.argv[1], sys.argv[2])
+elapsed = time.perf_counter() - started
+print(json.dumps({"ok": ok, "seconds": elapsed, "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Word 寫入方式基準測試")
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--alerts", type=int, default=12, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=3, help="每個弱點的實例數量")
+    parser.add_argument("--grouped", action="store_true", help="啟用弱點分組")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from benchmarks.synthetic import make_zap_report
+
+    work_dir = tempfile.mkdtemp(prefix="zap-bench-")
+    json_path = os.path.join(work_dir, "ZAP-Report.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(make_zap_report(args.sites, args.alerts, args.instances), f)
+
+    results = {"input": {"sites": args.sites, "alerts_per_site": args.alerts, "grouped": args.grouped}}
+    for writer in ("dom", "stream"):
+        output = os.path.join(work_dir, f"report_{writer}.docx")
+        env = dict(
+            os.environ, ZAP_DATA_DIR=work_dir, TRANSLATION_BACKEND="none", REPORT_WRITER=writer,
+            REPORT_GROUP_ALERTS="true" if args.grouped else "false"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE, json_path, output], cwd=ROOT, env=env,
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        result["docx_bytes"] = os.path.getsize(output) if os.path.exists(output) else 0
+        results[writer] = result
+        print(f"{writer:>6}: {result['seconds']:.2f}s  peak {result['peak_rss_mb']:.0f} MiB  {result['docx_bytes'] / 1024:.0f} KiB")
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
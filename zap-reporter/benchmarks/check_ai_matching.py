@@ -0,0 +1,84 @@
+"""
+AI 建議對應檢查
+以固定案例確認 services.ai_matching 的對應結果: 名稱寫法不同時仍能對應，
+同系列的其他弱點 (XSS 各類型、SQL Injection 各資料庫) 不會套用彼此的建議。
+
+用法:
+    python benchmarks/check_ai_matching.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.ai_matching import AISolutionIndex, build_ai_index  # noqa: E402
+from services.findings import build_findings  # noqa: E402
+
+
+def _report(alerts):
+    """由 (pluginid, alertRef, 名稱) 建立單一網站的 ZAP 報告"""
+    return build_findings({"site": [{
+        "@name": "https://example.test", "@host": "example.test",
+        "alerts": [
+            {"pluginid": plugin, "alertRef": ref, "alert": name, "riskdesc": "High (Medium)"}
+            for plugin, ref, name in alerts
+        ],
+    }]})
+
+
+# (AI 鍵值, 弱點名稱, pluginId, alertRef, 預期對應方式)
+SINGLE_CASES = [
+    ("Cross-Site Scripting (Reflected)", "Cross Site Scripting (Reflected)", "40012", "40012", "name"),
+    ("Cookie No HttpOnly Flag", "Cookie without HttpOnly Flag", "10010", "10010", "fuzzy"),
+    ("Missing Anti-clickjacking Header", "Missing Anti-Clickjacking Header (X-Frame-Options)", "", "", "fuzzy"),
+    ("[10020] Clickjacking", "Missing Anti-clickjacking Header", "10020", "10020-1", "plugin"),
+    ("Cross Site Scripting (Reflected)", "Cross Site Scripting (Persistent)", "40014", "40014", "none"),
+    ("Cross Site Scripting (Reflected)", "Cross Site Scripting (DOM Based)", "40026", "40026", "none"),
+    ("SQL Injection - MySQL", "SQL Injection - Oracle", "40019", "40019", "none"),
+    ("Session ID in URL Rewrite (2)", "Directory Browsing", "2", "2", "none"),
+    ("(10055-4) CSP: Wildcard Directive", "CSP: Wildcard Directive", "10055", "10055-5", "none"),
+]
+
+# 報告含多個同系列弱點時，已精確對應的鍵值不會再模糊套用到其他弱點
+REPORT_CASES = [
+    (
+        {"Cross Site Scripting (Reflected)": "reflected"},
+        [("40012", "40012", "Cross Site Scripting (Reflected)"),
+         ("40014", "40014", "Cross Site Scripting (Persistent)"),
+         ("40026", "40026", "Cross Site Scripting (DOM Based)")],
+        ["exact", "none", "none"],
+    ),
+    (
+        {"SQL Injection - MySQL": "mysql", "SQL Injection - Oracle": "oracle"},
+        [("40019", "40019", "SQL Injection - MySQL"),
+         ("40021", "40021", "SQL Injection - Oracle"),
+         ("40022", "40022", "SQL Injection - PostgreSQL")],
+        ["exact", "exact", "none"],
+    ),
+]
+
+
+def main() -> int:
+    failures = 0
+    for key, name, plugin_id, alert_ref, expected in SINGLE_CASES:
+        match = AISolutionIndex({key: "advice"}).match(name, "", plugin_id, alert_ref)
+        ok = match.method == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {match.method:<6} {match.score:.3f}  {key!r} -> {name!r}")
+
+    for solutions, alerts, expected in REPORT_CASES:
+        findings = _report(alerts)
+        index = build_ai_index({"solutions": solutions}, findings=findings)
+        for alert, method in zip(findings.alerts, expected):
+            match = index.match_alert(alert)
+            ok = match.method == method
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {match.method:<6} {match.score:.3f}  {alert.name!r} (報告內)")
+
+    print(f"\n{failures} 個案例失敗" if failures else "\n全部案例通過")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
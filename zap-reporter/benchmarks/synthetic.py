@@ -0,0 +1,271 @@
+"""
+合成輸入產生器 (基準測試用)
+產生多網站、多規則、多實例的 ZAP JSON 報告，規則名稱與翻譯目錄一致，
+使分組、翻譯目錄與文件渲染的行為接近真實掃描結果；
+--custom-rules 加入翻譯目錄未涵蓋的規則 (描述與修復建議需經過翻譯)。
+另可產生對應的 Nmap XML (-sV --script=vulners 格式) 與 ai_insights.json。
+
+用法:
+    python benchmarks/synthetic.py -o /tmp/ZAP-Report.json --sites 50 --alerts 12 --instances 5
+    python benchmarks/synthetic.py -o /tmp/ZAP-Report.json --custom-rules 20 --text-length 1500 \
+        --nmap /tmp/nmap_result.xml --hosts 20 --ai /tmp/ai_insights.json
+"""
+import sys
+import json
+import random
+import argparse
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import quoteattr
+
+# (pluginid, alertRef, 名稱, 風險等級)
+RULES: List[Tuple[str, str, str, str]] = [
+    ("40012", "40012", "Cross Site Scripting (Reflected)", "High"),
+    ("40018", "40018", "SQL Injection", "High"),
+    ("6", "6", "Path Traversal", "High"),
+    ("10020", "10020-1", "Missing Anti-clickjacking Header", "Medium"),
+    ("10038", "10038-1", "Content Security Policy (CSP) Header Not Set", "Medium"),
+    ("10202", "10202", "Absence of Anti-CSRF Tokens", "Medium"),
+    ("10098", "10098", "Cross-Domain Misconfiguration", "Medium"),
+    ("10021", "10021", "X-Content-Type-Options Header Missing", "Low"),
+    ("10035", "10035-1", "Strict-Transport-Security Header Not Set", "Low"),
+    ("10036", "10036", "Server Leaks Version Information via \"Server\" HTTP Response Header Field", "Low"),
+    ("10010", "10010", "Cookie No HttpOnly Flag", "Low"),
+    ("10054", "10054-1", "Cookie without SameSite Attribute", "Low"),
+    ("10027", "10027", "Information Disclosure - Suspicious Comments", "Informational"),
+    ("10096", "10096", "Timestamp Disclosure - Unix", "Informational"),
+    ("10109", "10109", "Modern Web Application", "Informational"),
+]
+
+RISK_CODES = {"High": "3", "Medium": "2", "Low": "1", "Informational": "0"}
+CONFIDENCES = ["Low", "Medium", "High"]
+
+DESC_SENTENCES = [
+    "The response does not include the expected security header.",
+    "An attacker may be able to exploit this weakness to compromise user sessions.",
+    "This issue was detected on every page that shares the same template.",
+    "The application reflects user controlled input without sufficient encoding.",
+    "Modern browsers provide additional protection when this setting is present.",
+]
+
+
+NMAP_SERVICES = [
+    ("22", "ssh", "OpenSSH", "8.9p1 Ubuntu 3ubuntu0.6"), ("80", "http", "nginx", "1.18.0"),
+    ("443", "https", "Apache httpd", "2.4.52"), ("3306", "mysql", "MySQL", "8.0.36"),
+    ("8080", "http-proxy", "Apache Tomcat", "9.0.58"),
+]
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "".join(f"<p>{' '.join(rng.sample(DESC_SENTENCES, 2))}</p>" for _ in range(count))
+
+
+def _text(rng: random.Random, length: int) -> str:
+    """約 length 個字元的 HTML 段落 (每 3 句一段，句尾附編號使各段文字不同)"""
+    paragraphs, sentences, size = [], [], 0
+    while size < length:
+        sentence = f"{rng.choice(DESC_SENTENCES)[:-1]} (case {rng.randint(1, 99999)})."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+        if len(sentences) == 3:
+            paragraphs.append(" ".join(sentences))
+            sentences = []
+    if sentences:
+        paragraphs.append(" ".join(sentences))
+    return "".join(f"<p>{p}</p>" for p in paragraphs)
+
+
+def custom_rules(count: int) -> List[Tuple[str, str, str, str]]:
+    """翻譯目錄未涵蓋的規則 (pluginid 90000 起)"""
+    risks = ["High", "Medium", "Low", "Informational"]
+    return [
+        (str(90000 + i), str(90000 + i), f"Synthetic Custom Check {i:03d}", risks[i % len(risks)])
+        for i in range(count)
+    ]
+
+
+def make_zap_report(sites: int = 20, alerts_per_site: int = 10, instances: int = 5, seed: int = 1,
+                    text_length: Optional[int] = None, extra_rules: int = 0) -> dict:
+    """
+    產生合成 ZAP 報告
+
+    Args:
+        sites: 網站數量
+        alerts_per_site: 每個網站的弱點數量 (上限為規則數)
+        instances: 每個弱點的實例數量
+        seed: 亂數種子 (相同參數產生相同報告)
+        text_length: 描述與修復建議的約略字元數 (未指定時為固定的短段落)
+        extra_rules: 加入的自訂規則數 (見 custom_rules)
+
+    Returns:
+        dict: ZAP JSON 報告結構
+    """
+    rng = random.Random(seed)
+    rules = RULES + custom_rules(extra_rules)
+    report_sites = []
+
+    def text(count: int) -> str:
+        return _text(rng, text_length) if text_length else _paragraphs(rng, count)
+
+    for s in range(sites):
+        host = f"site{s:04d}.example.test"
+        alerts = []
+        for pluginid, alert_ref, name, risk in rng.sample(rules, min(alerts_per_site, len(rules))):
+            confidence = rng.choice(CONFIDENCES)
+            alerts.append({
+                "pluginid": pluginid,
+                "alertRef": alert_ref,
+                "alert": name,
+                "name": name,
+                "riskcode": RISK_CODES[risk],
+                "confidence": str(CONFIDENCES.index(confidence) + 1),
+                "riskdesc": f"{risk} ({confidence})",
+                "desc": text(2),
+                "instances": [
+                    {
+                        "uri": f"https://{host}/path{i}/page{rng.randint(1, 999)}",
+                        "method": rng.choice(["GET", "POST"]),
+                        "param": rng.choice(["", "q", "id", "token"]),
+                        "attack": "",
+                        "evidence": "",
+                    }
+                    for i in range(instances)
+                ],
+                "count": str(instances),
+                "solution": text(1),
+                "otherinfo": "",
+                "reference": "<p>https://owasp.org/</p>",
+                "cweid": "79",
+                "wascid": "8",
+                "sourceid": "3",
+            })
+        report_sites.append({
+            "@name": f"https://{host}",
+            "@host": host,
+            "@port": "443",
+            "@ssl": "true",
+            "alerts": alerts,
+        })
+
+    return {
+        "@programName": "ZAP",
+        "@version": "2.15.0",
+        "@generated": "Mon, 1 Jan 2024 12:00:00",
+        "site": report_sites,
+    }
+
+
+def make_nmap_xml(hosts: int = 10, seed: int = 1, max_cves: int = 6) -> str:
+    """
+    產生合成 Nmap XML (-sV -O --script=vulners 格式)
+
+    Args:
+        hosts: 主機數量
+        seed: 亂數種子
+        max_cves: 每個埠口最多的 CVE 數量
+
+    Returns:
+        str: XML 內容
+    """
+    rng = random.Random(seed)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<nmaprun scanner="nmap" args="nmap -sV -sC --script=vulners -O --open 10.0.0.0/24" version="7.94">\n',
+    ]
+    for i in range(hosts):
+        parts.append(
+            f'<host><status state="up" reason="syn-ack"/><address addr="10.0.{i >> 8}.{i & 255}" addrtype="ipv4"/>'
+            f'<hostnames><hostname name="host{i}.corp.test" type="PTR"/></hostnames><ports>'
+        )
+        for port, name, product, version in rng.sample(NMAP_SERVICES, rng.randint(1, 3)):
+            parts.append(
+                f'<port protocol="tcp" portid="{port}"><state state="open" reason="syn-ack"/>'
+                f'<service name="{name}" product={quoteattr(product)} version={quoteattr(version)} '
+                f'method="probed" conf="10"/><script id="vulners" output="..."><table key="cpe:/a:{name}:{version}">'
+            )
+            for c in range(rng.randint(0, max_cves)):
+                parts.append(
+                    f'<table><elem key="id">CVE-2023-{rng.randint(1000, 99999)}</elem>'
+                    f'<elem key="cvss">{rng.uniform(2, 10):.1f}</elem><elem key="type">cve</elem>'
+                    f'<elem key="is_exploit">{"true" if c == 0 and rng.random() < 0.2 else "false"}</elem></table>'
+                )
+            parts.append('</table></script></port>')
+        parts.append('</ports><os><osmatch name="Linux 5.0 - 5.14" accuracy="96"/></os></host>\n')
+    parts.append(f'<runstats><finished time="0" elapsed="0"/><hosts up="{hosts}" down="0" total="{hosts}"/></runstats>\n')
+    parts.append('</nmaprun>\n')
+    return "".join(parts)
+
+
+def make_ai_insights(report: dict, coverage: float = 0.5, seed: int = 1) -> dict:
+    """
+    產生對應合成報告的 ai_insights.json
+
+    部分鍵值刻意改變大小寫或附上 pluginId，使 AI 建議對應走過精確、正規化與 pluginId 等路徑。
+
+    Args:
+        report: make_zap_report 產生的報告
+        coverage: 附上 AI 建議的規則比例 (0 ~ 1)
+        seed: 亂數種子
+
+    Returns:
+        dict: {"executive_summary", "solutions"}
+    """
+    rng = random.Random(seed)
+    rules = {}
+    for site in report["site"]:
+        for alert in site["alerts"]:
+            rules.setdefault(alert["pluginid"], alert["name"])
+
+    solutions = {}
+    for plugin_id, name in sorted(rules.items()):
+        if rng.random() >= coverage:
+            continue
+        key = rng.choice([name, name.lower(), f"[{plugin_id}] {name}"])
+        solutions[key] = (
+            f"### 弱點說明\n{name} 可能讓攻擊者取得未授權的資訊或操作。\n\n"
+            f"### 修復建議\n1. 於所有回應加入必要的安全設定。\n2. 更新元件至最新版本。\n"
+            f"3. 以自動化測試確認 `{name}` 不再出現。\n\n"
+            f"### 參考資料\n- https://owasp.org/www-project-top-ten/"
+        )
+
+    return {
+        "executive_summary": (
+            f"本次掃描涵蓋 {len(report['site'])} 個網站，共 {len(rules)} 種弱點規則。"
+            "建議優先處理高風險項目，並於修復後重新掃描確認。"
+        ),
+        "solutions": solutions,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="產生合成 ZAP 報告")
+    parser.add_argument("-o", "--output", required=True, help="輸出 JSON 路徑")
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--alerts", type=int, default=10, help="每個網站的弱點數量")
+    parser.add_argument("--instances", type=int, default=5, help="每個弱點的實例數量")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--text-length", type=int, default=None, help="描述與修復建議的約略字元數")
+    parser.add_argument("--custom-rules", type=int, default=0, help="加入翻譯目錄未涵蓋的規則數")
+    parser.add_argument("--nmap", help="一併產生 Nmap XML 的輸出路徑")
+    parser.add_argument("--hosts", type=int, default=10, help="Nmap XML 的主機數量")
+    parser.add_argument("--ai", help="一併產生 ai_insights.json 的輸出路徑")
+    parser.add_argument("--ai-coverage", type=float, default=0.5, help="附上 AI 建議的規則比例")
+    args = parser.parse_args()
+
+    report = make_zap_report(args.sites, args.alerts, args.instances, args.seed, args.text_length, args.custom_rules)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    print(f"已產生 {args.output}")
+
+    if args.nmap:
+        with open(args.nmap, "w", encoding="utf-8") as f:
+            f.write(make_nmap_xml(args.hosts, args.seed))
+        print(f"已產生 {args.nmap}")
+    if args.ai:
+        with open(args.ai, "w", encoding="utf-8") as f:
+            json.dump(make_ai_insights(report, args.ai_coverage, args.seed), f, ensure_ascii=False, indent=2)
+        print(f"已產生 {args.ai}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,3 +2,4 @@
 from .settings import *
 from .fonts import setup_fonts
 from .translations import RISK_MAPPING, TERM_MAPPING
+from .alert_catalog import lookup_alert, catalog_text
@@ -0,0 +1,81 @@
+"""
+ZAP 弱點翻譯目錄
+ZAP 各掃描規則的描述與修復建議多為固定文字，預先翻譯後以 pluginId / alertRef 查找，
+僅真正動態的文字才需要即時翻譯。目錄由 services.catalog_builder 離線產生或更新。
+"""
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .settings import ALERT_CATALOG_FILE
+
+
+@lru_cache(maxsize=None)
+def load_alert_catalog(path: str = ALERT_CATALOG_FILE) -> Tuple[Dict[str, dict], Dict[str, List[dict]]]:
+    """
+    載入翻譯目錄
+
+    Args:
+        path: 目錄 JSON 路徑
+
+    Returns:
+        tuple: (alertRef/pluginId -> 項目, pluginId -> 同規則的全部變體)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('alerts', {})
+    except (OSError, ValueError) as e:
+        print(f"載入弱點翻譯目錄失敗: {e}")
+        return {}, {}
+
+    variants: Dict[str, List[dict]] = {}
+    for key, entry in entries.items():
+        variants.setdefault(key.split('-', 1)[0], []).append(entry)
+    return entries, variants
+
+
+def lookup_alert(alert: dict) -> Optional[dict]:
+    """
+    依 alertRef / pluginid 查找弱點譯文
+
+    目錄記錄了英文原名，名稱不符 (例如 ZAP 版本更名或同一規則的其他變體) 時不採用，
+    交由即時翻譯處理。
+
+    Args:
+        alert: ZAP 報告中的單一 alert
+
+    Returns:
+        dict: 目錄項目 (title / desc / solution)，找不到時回傳 None
+    """
+    entries, variants = load_alert_catalog()
+    name = alert.get('alert') or alert.get('name')
+
+    def matches(entry: Optional[dict]) -> bool:
+        return entry is not None and entry.get('name') in (None, name)
+
+    for key in (alert.get('alertRef'), alert.get('pluginid')):
+        if key and matches(entries.get(str(key))):
+            return entries[str(key)]
+
+    # 舊版 ZAP 報告沒有 alertRef，改以名稱比對同一規則的變體
+    plugin_id = str(alert.get('pluginid', ''))
+    for entry in variants.get(plugin_id, []):
+        if entry.get('name') == name:
+            return entry
+    return None
+
+
+def catalog_text(entry: Optional[dict], field: str) -> Optional[str]:
+    """
+    取得目錄中的固定譯文
+
+    Args:
+        entry: lookup_alert 的結果
+        field: title / desc / solution
+
+    Returns:
+        str: 譯文；項目不存在、無此欄位或該欄位標記為動態內容時回傳 None
+    """
+    if not entry or field in entry.get('dynamic', ()):
+        return None
+    return entry.get(field) or None
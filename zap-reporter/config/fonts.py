@@ -1,32 +1,100 @@
 """
 字型配置模組
+匯入本模組不會載入 matplotlib；CJK 字型路徑只解析一次並快取。
+Matplotlib 的字型清單快取 (MPLCONFIGDIR) 於映像建置時以 build_font_cache() 預先建立，
+執行期直接沿用，不再於每次執行時重建。
 """
 import os
-import shutil
 import logging
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from functools import lru_cache
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# CJK 字型家族優先順序 (容器內通常是 Noto Sans CJK)
+CJK_FONT_FAMILIES = ['Noto Sans CJK TC', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei', 'Microsoft JhengHei', 'SimHei']
+
+# 常見的 CJK 字型檔位置 (先以檔案路徑檢查，避免走完整的字型比對)
+CJK_FONT_PATHS = [
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+]
+
+_fonts_ready = False
+
+
+@lru_cache(maxsize=None)
+def find_cjk_font() -> Optional[str]:
+    """
+    解析 CJK 字型檔路徑 (結果快取，僅解析一次)
+
+    Returns:
+        str: 字型檔路徑，找不到時回傳 None
+    """
+    for path in CJK_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+
+    from matplotlib import font_manager
+    try:
+        return font_manager.findfont(
+            font_manager.FontProperties(family=CJK_FONT_FAMILIES),
+            fallback_to_default=False
+        )
+    except ValueError:
+        logger.warning("找不到 CJK 字型，圖表中文可能無法正常顯示")
+        return None
+
+
 def setup_fonts():
     """
-    設定 Matplotlib 全域字型設定 (簡化版)
+    設定 Matplotlib 全域字型 (重複呼叫不會重複執行)
     """
+    global _fonts_ready
+    if _fonts_ready:
+        return
+
     try:
-        # 為了避免語法錯誤，我們將設定寫得緊湊一點
-        # 設定 sans-serif 優先使用的字型列表
-        plt.rcParams['font.sans-serif'] = ['Noto Sans CJK TC', 'sans-serif']
+        import matplotlib
+        from matplotlib import font_manager
+
+        families = list(CJK_FONT_FAMILIES)
+        font_path = find_cjk_font()
+        if font_path:
+            # 確保字型已登記 (例如未列入系統字型目錄的自帶字型檔)
+            if not any(f.fname == font_path for f in font_manager.fontManager.ttflist):
+                font_manager.fontManager.addfont(font_path)
+            family = font_manager.FontProperties(fname=font_path).get_name()
+            if family not in families:
+                families.insert(0, family)
 
-        # 設定字型家族
-        plt.rcParams['font.family'] = ['sans-serif']
+        # 設定 sans-serif 優先使用的字型列表與字型家族
+        matplotlib.rcParams['font.sans-serif'] = families + ['DejaVu Sans']
+        matplotlib.rcParams['font.family'] = ['sans-serif']
 
         # 解決負號顯示問題
-        plt.rcParams['axes.unicode_minus'] = False
-        
+        matplotlib.rcParams['axes.unicode_minus'] = False
+
+        _fonts_ready = True
         logger.info("Fonts configuration loaded.")
 
     except Exception as e:
         logger.error(f"Error setting up fonts: {e}")
-# 模組載入時自動設定字型
-setup_fonts()
+
+
+def build_font_cache() -> Optional[str]:
+    """
+    建立 Matplotlib 字型清單快取並解析 CJK 字型 (映像建置時執行)
+
+    Returns:
+        str: CJK 字型檔路徑，找不到時回傳 None
+    """
+    import matplotlib
+    from matplotlib import font_manager  # noqa: F401
+
+    # 載入 font_manager 時若快取不存在會掃描系統字型並寫入 MPLCONFIGDIR
+    print(f"Matplotlib 字型快取: {matplotlib.get_cachedir()}")
+    setup_fonts()
+    font_path = find_cjk_font()
+    print(f"CJK 字型: {font_path or '未找到'}")
+    return font_path
+
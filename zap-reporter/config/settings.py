@@ -6,8 +6,24 @@ import os
 # 資料目錄
 DATA_DIR = os.getenv("ZAP_DATA_DIR", "/app/data")
 
-# 翻譯快取檔案路徑
+# 翻譯快取路徑 (SQLite)；舊版 JSON 快取會在首次執行時自動匯入
+CACHE_DB_FILE = os.path.join(DATA_DIR, "translation_cache.db")
 CACHE_FILE = os.path.join(DATA_DIR, "translation_cache.json")
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "50000"))
+
+# ZAP 弱點翻譯目錄 (以 pluginId / alertRef 為鍵的離線譯文)
+ALERT_CATALOG_FILE = os.getenv(
+    "ALERT_CATALOG_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "alert_catalog.json")
+)
+
+# 圖表快取 (以統計數據為鍵的 PNG 圖檔)
+CHART_CACHE_DIR = os.path.join(DATA_DIR, "chart_cache")
+CHART_CACHE_MAX_FILES = int(os.getenv("CHART_CACHE_MAX_FILES", "256"))
+
+# 弱點詳情區塊的 OOXML 片段快取 (以區塊輸入內容的雜湊為鍵；設為空字串停用)
+FRAGMENT_CACHE_DIR = os.getenv("FRAGMENT_CACHE_DIR", os.path.join(DATA_DIR, "fragment_cache"))
+FRAGMENT_CACHE_MAX_FILES = int(os.getenv("FRAGMENT_CACHE_MAX_FILES", "20000"))
 
 # 報告預設公司名稱
 DEFAULT_COMPANY_NAME = os.getenv("REPORT_COMPANY_NAME", "Nextlink MSP")
@@ -16,6 +32,45 @@ DEFAULT_COMPANY_NAME = os.getenv("REPORT_COMPANY_NAME", "Nextlink MSP")
 ZAP_REPORT_FILENAME = "ZAP-Report.json"
 AI_INSIGHTS_FILENAME = "ai_insights.json"
 NMAP_REPORT_FILENAME = "nmap_result.xml"
+NMAP_SIDECAR_FILENAME = "nmap_result.json"  # Nmap 正規化結果 (解析一次，各處共用)
 
 # 文字長度限制
-MAX_TEXT_LENGTH = 4500  # 翻譯 API 限制
+MAX_TEXT_LENGTH = 4500  # 翻譯 API 單次請求限制 (超過的句子會在空白處切開分段翻譯)
+
+# 報告輸出格式 (逗號分隔): docx / html / md / json / sarif
+REPORT_FORMATS = os.getenv("REPORT_FORMATS", "docx")
+
+# Word 報告寫入方式: dom (python-docx 完整建構後儲存) / stream (逐段寫入，記憶體用量固定)
+REPORT_WRITER = os.getenv("REPORT_WRITER", "dom").lower()
+
+# 弱點詳情頁: 同一規則跨網站合併為單一區塊、每個區塊列出的受影響實例上限
+DETAIL_GROUP_ALERTS = os.getenv("REPORT_GROUP_ALERTS", "true").lower() == "true"
+DETAIL_MAX_INSTANCES = int(os.getenv("REPORT_MAX_INSTANCES", "20"))
+
+# 弱點詳情頁平行渲染的工作程序數 (1 = 單一程序；0 = CPU 核心數)
+RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", "1")) or (os.cpu_count() or 1)
+
+# 多目標合併報告 (Portfolio): 同時解析掃描結果目錄的工作程序數 (0 = CPU 核心數)
+PORTFOLIO_WORKERS = int(os.getenv("PORTFOLIO_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# 批次模式: 同時生成報告的工作程序數 (0 = CPU 核心數)
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# AI 建議與弱點的模糊對應門檻 (字元三元組 Dice 相似度，0 ~ 1)
+AI_MATCH_THRESHOLD = float(os.getenv("AI_MATCH_THRESHOLD", "0.75"))
+# 模糊比對的最佳分數須領先次佳候選的差距 (兩個候選同樣相近時視為無對應)
+AI_MATCH_MARGIN = float(os.getenv("AI_MATCH_MARGIN", "0.05"))
+
+# 翻譯引擎設定
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "google")  # google / local / none
+TRANSLATION_TARGET = os.getenv("TRANSLATION_TARGET", "zh-TW")
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))  # 同時進行的請求數
+TRANSLATION_RATE = float(os.getenv("TRANSLATION_RATE", "5"))  # 每秒最多請求數
+TRANSLATION_MAX_RETRIES = int(os.getenv("TRANSLATION_MAX_RETRIES", "3"))
+TRANSLATION_LOCAL_FILE = os.getenv("TRANSLATION_LOCAL_FILE", "")  # local 後端的對照表 (JSON)
+
+# 常駐模式 (Daemon) 任務佇列
+QUEUE_DIR = os.path.join(DATA_DIR, "queue")
+DAEMON_POLL_INTERVAL = float(os.getenv("REPORTER_POLL_INTERVAL", "1.0"))  # 秒
+DAEMON_SETTLE_SECONDS = float(os.getenv("REPORTER_SETTLE_SECONDS", "2.0"))  # ZAP 報告寫入完成的靜置時間
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORTER_JOB_TIMEOUT", "600"))  # 單一報告任務逾時秒數
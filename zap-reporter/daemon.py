@@ -0,0 +1,257 @@
+"""
+ZAP Reporter - 常駐模式 (Daemon)
+
+啟動時預先載入 python-docx、matplotlib、deep_translator 與翻譯快取，
+之後從共用 Volume 的佇列目錄接收報告任務，並由已暖機的父程序 fork 子程序執行。
+偵測到掃描完成的 ZAP-Report.json 時也會自動排入任務，讓報告在使用者查詢前就緒。
+
+佇列協定 (QUEUE_DIR):
+    <job_id>.job      待處理任務 (JSON)
+    <job_id>.running  執行中 (由 .job 改名而來)
+    <job_id>.done     完成結果 (JSON)
+    <job_id>.failed   失敗結果 (JSON)
+"""
+import os
+import sys
+import json
+import glob
+import time
+import uuid
+import signal
+from typing import Optional, Tuple
+
+from config.settings import (
+    DATA_DIR, QUEUE_DIR, ZAP_REPORT_FILENAME,
+    DAEMON_POLL_INTERVAL, DAEMON_SETTLE_SECONDS, REPORT_JOB_TIMEOUT
+)
+
+# 自動觸發紀錄 (避免常駐程序重啟後重複生成同一份報告)
+LAST_REPORT_MARKER = ".last_report"
+
+# 結果檔保留時間 (秒)
+RESULT_RETENTION_SECONDS = 24 * 3600
+
+_running = True
+
+
+def _preload():
+    """預先載入重量級依賴與翻譯快取 (子程序透過 fork 共享)"""
+    started = time.time()
+    import report_builder  # noqa: F401  (python-docx / 各區塊模組)
+    from document.charts import preload_chart_backend
+    from services.translator import get_translator
+
+    preload_chart_backend()
+    get_translator()
+    print(f"[daemon] 依賴預載完成 ({time.time() - started:.2f}s)")
+
+
+def _write_json(path: str, payload: dict):
+    """以暫存檔 + 改名的方式寫入 JSON，避免讀取端看到半成品"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def enqueue_job(reason: str) -> str:
+    """
+    於佇列目錄建立報告任務
+
+    Args:
+        reason: 任務來源 (如 auto / mcp)
+
+    Returns:
+        str: 任務 ID
+    """
+    os.makedirs(QUEUE_DIR, exist_ok=True)
+    job_id = f"{time.strftime('%y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    _write_json(
+        os.path.join(QUEUE_DIR, f"{job_id}.job"),
+        {"job_id": job_id, "reason": reason, "created_at": time.time()}
+    )
+    return job_id
+
+
+def _claim_next_job() -> Optional[Tuple[str, str]]:
+    """取得最早的待處理任務並改名為 .running，回傳 (job_id, running_path)"""
+    for job_path in sorted(glob.glob(os.path.join(QUEUE_DIR, "*.job"))):
+        job_id = os.path.basename(job_path)[:-len(".job")]
+        running_path = os.path.join(QUEUE_DIR, f"{job_id}.running")
+        try:
+            os.rename(job_path, running_path)
+        except OSError:
+            continue  # 已被其他程序取走
+        return job_id, running_path
+    return None
+
+
+def _report_signature(report_path: str) -> Optional[str]:
+    """以 mtime 與大小識別 ZAP 報告版本"""
+    try:
+        st = os.stat(report_path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _is_report_finished(report_path: str) -> bool:
+    """判斷 ZAP 報告是否已寫入完成 (靜置足夠時間且為完整 JSON)"""
+    try:
+        if time.time() - os.path.getmtime(report_path) < DAEMON_SETTLE_SECONDS:
+            return False
+        with open(report_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def _has_newer_docx(report_path: str) -> bool:
+    """資料目錄中是否已有比 ZAP 報告更新的 Word 報告"""
+    report_mtime = os.path.getmtime(report_path)
+    return any(
+        os.path.getmtime(p) >= report_mtime
+        for p in glob.glob(os.path.join(DATA_DIR, "Scan_Report_*.docx"))
+    )
+
+
+def _has_queued_jobs() -> bool:
+    """佇列中是否有待處理或執行中的任務"""
+    return any(name.endswith((".job", ".running")) for name in os.listdir(QUEUE_DIR))
+
+
+def _check_auto_trigger():
+    """偵測新完成的 ZAP 報告並自動排入任務"""
+    report_path = os.path.join(DATA_DIR, ZAP_REPORT_FILENAME)
+    marker_path = os.path.join(QUEUE_DIR, LAST_REPORT_MARKER)
+
+    signature = _report_signature(report_path)
+    if signature is None:
+        return
+
+    last_signature = None
+    if os.path.exists(marker_path):
+        with open(marker_path, "r", encoding="utf-8") as f:
+            last_signature = f.read().strip()
+    if signature == last_signature:
+        return
+
+    if not _is_report_finished(report_path):
+        return
+
+    with open(marker_path, "w", encoding="utf-8") as f:
+        f.write(signature)
+
+    # 已有較新的報告或佇列中已有任務 (如 MCP 已排入) 時不重複生成
+    if _has_newer_docx(report_path) or _has_queued_jobs():
+        return
+
+    job_id = enqueue_job("auto")
+    print(f"[daemon] 偵測到新的 ZAP 報告，自動排入任務 {job_id}")
+
+
+def _run_job(job_id: str, running_path: str):
+    """fork 子程序執行報告任務，父程序等待結果並處理逾時"""
+    started = time.time()
+    pid = os.fork()
+
+    if pid == 0:
+        # 子程序：直接使用父程序已載入的模組
+        exit_code = 1
+        try:
+            from main import run_report
+            exit_code = 0 if run_report() else 1
+        except Exception as e:
+            print(f"[daemon] 任務 {job_id} 發生錯誤: {e}")
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+    status = None
+    while True:
+        waited_pid, status = os.waitpid(pid, os.WNOHANG)
+        if waited_pid != 0:
+            break
+        if time.time() - started > REPORT_JOB_TIMEOUT:
+            print(f"[daemon] 任務 {job_id} 逾時，終止子程序 {pid}")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            status = None
+            break
+        time.sleep(0.2)
+
+    ok = status is not None and os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    reports = sorted(glob.glob(os.path.join(DATA_DIR, "Scan_Report_*.docx")), key=os.path.getmtime)
+    result = {
+        "job_id": job_id,
+        "status": "done" if ok else "failed",
+        "output": os.path.basename(reports[-1]) if ok and reports else None,
+        "elapsed": round(time.time() - started, 2),
+        "finished_at": time.time(),
+    }
+    _write_json(os.path.join(QUEUE_DIR, f"{job_id}.{result['status']}"), result)
+    os.remove(running_path)
+    print(f"[daemon] 任務 {job_id} {result['status']} ({result['elapsed']}s)")
+
+    # 子程序可能寫入了新翻譯，重新載入讓下一個任務共用
+    from services.translator import get_translator
+    get_translator().reload_cache()
+
+
+def _cleanup_results():
+    """清除過期的結果檔"""
+    now = time.time()
+    for pattern in ("*.done", "*.failed"):
+        for path in glob.glob(os.path.join(QUEUE_DIR, pattern)):
+            try:
+                if now - os.path.getmtime(path) > RESULT_RETENTION_SECONDS:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def _recover_stale_jobs():
+    """常駐程序重啟時，將上次中斷的 .running 任務放回佇列"""
+    for running_path in glob.glob(os.path.join(QUEUE_DIR, "*.running")):
+        os.replace(running_path, running_path[:-len(".running")] + ".job")
+
+
+def _handle_stop(signum, frame):
+    """收到停止信號時於目前任務結束後退出"""
+    global _running
+    _running = False
+
+
+def serve() -> int:
+    """
+    常駐模式主迴圈
+
+    Returns:
+        int: 結束代碼
+    """
+    signal.signal(signal.SIGTERM, _handle_stop)
+    signal.signal(signal.SIGINT, _handle_stop)
+
+    os.makedirs(QUEUE_DIR, exist_ok=True)
+    _preload()
+    _recover_stale_jobs()
+    print(f"[daemon] 開始監聽任務佇列: {QUEUE_DIR}")
+
+    last_cleanup = 0.0
+    while _running:
+        _check_auto_trigger()
+
+        job = _claim_next_job()
+        if job:
+            _run_job(*job)
+            continue
+
+        if time.time() - last_cleanup > 3600:
+            _cleanup_results()
+            last_cleanup = time.time()
+
+        time.sleep(DAEMON_POLL_INTERVAL)
+
+    print("[daemon] 已停止")
+    return 0
@@ -1,65 +1,288 @@
 """
 圖表生成模組
+直接使用 Agg 畫布 (不經 pyplot 全域狀態)，圖表繪製於記憶體並以統計數據為鍵快取，
+同一份報告需要的多張圖表可一次批次產生。matplotlib 於第一次繪圖時才載入。
 """
 import os
-from typing import Dict
+import io
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
-import matplotlib.pyplot as plt
+from config.settings import CHART_CACHE_DIR, CHART_CACHE_MAX_FILES
 
-# 確保字型已設定
-from config.fonts import setup_fonts
-setup_fonts()
+# 圖表樣式變更時遞增，使舊的快取失效
+CHART_VERSION = 1
 
+CHART_DPI = 150
 
-def generate_risk_chart(stats: Dict[str, int], output_path: str) -> bool:
+# 風險等級對照 (標籤, 顏色)
+RISK_STYLES = OrderedDict([
+    ("High", ("高風險", "#ff0000")),
+    ("Medium", ("中風險", "#ffa500")),
+    ("Low", ("低風險", "#ffff00")),
+    ("Informational", ("資訊", "#0000ff")),
+])
+
+CONFIDENCE_LEVELS = ["Confirmed", "High", "Medium", "Low", "False Positive"]
+
+# 記憶體快取上限 (張)
+_MEMORY_CACHE_SIZE = 32
+
+_memory_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_figure_class = None
+_canvas_class = None
+
+# 效能統計: 匯入 / 繪製耗時與快取命中次數
+_metrics = {"import_seconds": 0.0, "render_seconds": 0.0, "rendered": 0, "cache_hits": 0}
+
+
+def _load_backend():
+    """載入 Figure 與 Agg 畫布 (僅第一次呼叫時匯入 matplotlib)"""
+    global _figure_class, _canvas_class
+    if _figure_class is None:
+        started = time.perf_counter()
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from config.fonts import setup_fonts
+
+        setup_fonts()
+        _figure_class, _canvas_class = Figure, FigureCanvasAgg
+        _metrics["import_seconds"] += time.perf_counter() - started
+    return _figure_class, _canvas_class
+
+
+def preload_chart_backend():
+    """預先載入繪圖後端 (常駐程序啟動時呼叫)"""
+    _load_backend()
+
+
+def get_chart_metrics() -> Dict[str, float]:
+    """取得圖表匯入 / 繪製耗時與快取命中次數"""
+    return dict(_metrics)
+
+
+def _cache_key(kind: str, payload: tuple) -> str:
+    raw = repr((CHART_VERSION, kind, payload)).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[bytes]:
+    """依序查詢記憶體與磁碟快取"""
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    if CHART_CACHE_DIR:
+        path = os.path.join(CHART_CACHE_DIR, f"{key}.png")
+        try:
+            with open(path, "rb") as f:
+                image = f.read()
+            os.utime(path, None)
+            _cache_remember(key, image)
+            return image
+        except OSError:
+            pass
+    return None
+
+
+def _cache_remember(key: str, image: bytes):
+    _memory_cache[key] = image
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+def _cache_put(key: str, image: bytes):
+    """寫入記憶體與磁碟快取 (磁碟快取超過上限時刪除最久未使用的圖檔)"""
+    _cache_remember(key, image)
+    if not CHART_CACHE_DIR:
+        return
+
+    try:
+        os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+        tmp_path = os.path.join(CHART_CACHE_DIR, f"{key}.png.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(image)
+        os.replace(tmp_path, os.path.join(CHART_CACHE_DIR, f"{key}.png"))
+
+        files = [os.path.join(CHART_CACHE_DIR, n) for n in os.listdir(CHART_CACHE_DIR) if n.endswith(".png")]
+        if len(files) > CHART_CACHE_MAX_FILES:
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - CHART_CACHE_MAX_FILES]:
+                os.remove(path)
+    except OSError as e:
+        print(f"寫入圖表快取失敗: {e}")
+
+
+def _render(figsize: Tuple[float, float], draw) -> bytes:
+    """建立獨立的 Figure 繪圖並輸出 PNG 位元組"""
+    figure_class, canvas_class = _load_backend()
+    fig = figure_class(figsize=figsize)
+    canvas_class(fig)
+    draw(fig)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=CHART_DPI)
+    return buffer.getvalue()
+
+
+def _draw_risk_pie(fig, stats: tuple):
+    labels, sizes, colors = [], [], []
+    for key, count in stats:
+        label, color = RISK_STYLES[key]
+        labels.append(f"{label} ({count})")
+        sizes.append(count)
+        colors.append(color)
+
+    ax = fig.add_subplot(111)
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=140)
+    ax.axis('equal')
+    ax.set_title("弱點風險分佈")
+
+
+def _draw_site_bars(fig, rows: tuple):
+    ax = fig.add_subplot(111)
+    sites = [name for name, _ in rows]
+    positions = list(range(len(sites)))
+    left = [0] * len(sites)
+
+    for index, (label, color) in enumerate(RISK_STYLES.values()):
+        values = [counts[index] for _, counts in rows]
+        ax.barh(positions, values, left=left, color=color, label=label)
+        left = [a + b for a, b in zip(left, values)]
+
+    ax.set_yticks(positions)
+    ax.set_yticklabels(sites, fontsize=7)
+    ax.invert_yaxis()
+    ax.set_xlabel("弱點數量")
+    ax.set_title("各網站弱點分佈")
+    ax.legend(fontsize=7, loc="lower right")
+
+
+def _draw_confidence_heatmap(fig, matrix: tuple):
+    ax = fig.add_subplot(111)
+    image = ax.imshow(matrix, cmap="Reds", aspect="auto")
+
+    ax.set_xticks(range(len(CONFIDENCE_LEVELS)))
+    ax.set_xticklabels(CONFIDENCE_LEVELS, fontsize=7)
+    ax.set_yticks(range(len(RISK_STYLES)))
+    ax.set_yticklabels([label for label, _ in RISK_STYLES.values()], fontsize=8)
+    for y, row in enumerate(matrix):
+        for x, count in enumerate(row):
+            if count:
+                ax.text(x, y, str(count), ha="center", va="center", fontsize=8)
+
+    ax.set_xlabel("可信度 (Confidence)")
+    ax.set_title("風險等級 × 可信度")
+    fig.colorbar(image, ax=ax)
+
+
+# 圖表種類 -> (尺寸, 繪圖函式)
+_CHARTS = {
+    "risk_pie": ((4, 3), _draw_risk_pie),
+    "site_bars": ((6, 4), _draw_site_bars),
+    "confidence_heatmap": ((5, 3), _draw_confidence_heatmap),
+}
+
+
+def render_chart(kind: str, payload: tuple) -> Optional[bytes]:
     """
-    生成風險分佈圓餅圖
+    繪製單張圖表 (快取命中時直接回傳)
 
     Args:
-        stats: 風險統計字典 {"High": n, "Medium": n, ...}
-        output_path: 輸出圖片路徑
+        kind: 圖表種類 (risk_pie / site_bars / confidence_heatmap)
+        payload: 圖表數據 (需為可雜湊的 tuple，同時作為快取鍵)
 
     Returns:
-        bool: 是否成功生成
+        bytes: PNG 圖片內容，無數據或繪圖失敗時回傳 None
     """
-    labels = []
-    sizes = []
-    colors = []
-
-    # 風險等級對照
-    mapping = {
-        "High": ("高風險", "#ff0000"),
-        "Medium": ("中風險", "#ffa500"),
-        "Low": ("低風險", "#ffff00"),
-        "Informational": ("資訊", "#0000ff")
-    }
-
-    for key, (label, color) in mapping.items():
-        count = stats.get(key, 0)
-        if count > 0:
-            labels.append(f"{label} ({count})")
-            sizes.append(count)
-            colors.append(color)
-
-    if not sizes:
-        return False
+    if not payload:
+        return None
+
+    key = _cache_key(kind, payload)
+    image = _cache_get(key)
+    if image is not None:
+        _metrics["cache_hits"] += 1
+        return image
 
+    figsize, draw = _CHARTS[kind]
+    started = time.perf_counter()
     try:
-        plt.figure(figsize=(4, 3))
-        plt.pie(
-            sizes,
-            labels=labels,
-            colors=colors,
-            autopct='%1.1f%%',
-            startangle=140
-        )
-        plt.axis('equal')
-        plt.title("弱點風險分佈")
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150)
-        plt.close()
-        return True
+        image = _render(figsize, lambda fig: draw(fig, payload))
     except Exception as e:
         print(f"繪圖失敗: {e}")
-        plt.close()
+        return None
+    _metrics["render_seconds"] += time.perf_counter() - started
+    _metrics["rendered"] += 1
+
+    _cache_put(key, image)
+    return image
+
+
+def render_charts(specs: Dict[str, tuple]) -> Dict[str, bytes]:
+    """
+    批次繪製多張圖表 (共用一次後端載入與字型設定)
+
+    Args:
+        specs: 圖表種類 -> 圖表數據
+
+    Returns:
+        dict: 圖表種類 -> PNG 圖片內容 (無數據或失敗的圖表不會出現)
+    """
+    images = {}
+    for kind, payload in specs.items():
+        image = render_chart(kind, payload)
+        if image is not None:
+            images[kind] = image
+    return images
+
+
+def risk_pie_payload(stats: Dict[str, int]) -> tuple:
+    """風險分佈圓餅圖數據: ((風險等級, 數量), ...)，僅包含數量大於 0 的等級"""
+    return tuple((key, stats.get(key, 0)) for key in RISK_STYLES if stats.get(key, 0) > 0)
+
+
+def site_bars_payload(site_stats: Dict[str, Dict[str, int]], limit: int = 20) -> tuple:
+    """
+    各網站弱點長條圖數據: ((網站, (高, 中, 低, 資訊)), ...)
+    依弱點總數排序，僅保留前 limit 個網站；單一網站時不需此圖
+    """
+    if len(site_stats) < 2:
+        return ()
+    rows = [
+        (name, tuple(counts.get(key, 0) for key in RISK_STYLES))
+        for name, counts in site_stats.items()
+    ]
+    rows.sort(key=lambda row: -sum(row[1]))
+    return tuple(rows[:limit])
+
+
+def confidence_heatmap_payload(matrix: Dict[Tuple[str, str], int]) -> tuple:
+    """風險等級 × 可信度熱度圖數據: 依 RISK_STYLES 與 CONFIDENCE_LEVELS 排列的二維 tuple"""
+    if not any(matrix.values()):
+        return ()
+    return tuple(
+        tuple(matrix.get((risk, confidence), 0) for confidence in CONFIDENCE_LEVELS)
+        for risk in RISK_STYLES
+    )
+
+
+def generate_risk_chart(stats: Dict[str, int], output_path: str) -> bool:
+    """
+    生成風險分佈圓餅圖並寫入檔案
+
+    Args:
+        stats: 風險統計字典 {"High": n, "Medium": n, ...}
+        output_path: 輸出圖片路徑
+
+    Returns:
+        bool: 是否成功生成
+    """
+    image = render_chart("risk_pie", risk_pie_payload(stats))
+    if image is None:
         return False
+    with open(output_path, "wb") as f:
+        f.write(image)
+    return True
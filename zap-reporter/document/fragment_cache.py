@@ -0,0 +1,106 @@
+"""
+OOXML 片段快取
+將渲染完成的內容區塊 (如單一弱點詳情) 以 body 元素 XML 的形式存放於磁碟，
+鍵值為區塊全部輸入 (弱點內容、AI 建議、譯文、範本版本) 的雜湊。
+重新產生報告時，輸入未變更的區塊直接合併快取的片段，只有受影響的區塊需要重新渲染。
+
+片段只能包含不需要關聯部件的內容 (文字、表格)；含圖片等關聯的區塊 (封面、圖表) 不適用。
+"""
+import os
+import hashlib
+from typing import List, Optional
+
+from config.settings import FRAGMENT_CACHE_DIR, FRAGMENT_CACHE_MAX_FILES
+from document.template import TEMPLATE_VERSION
+
+# 片段以 NUL 分隔存放 (XML 內容不會出現 NUL 字元)
+_SEPARATOR = b"\0"
+
+
+def fragment_key(kind: str, payload: tuple) -> str:
+    """
+    計算區塊的快取鍵值
+
+    Args:
+        kind: 區塊類型 (如 finding)
+        payload: 影響渲染結果的全部輸入
+
+    Returns:
+        str: SHA-256 雜湊
+    """
+    raw = repr((TEMPLATE_VERSION, kind, payload)).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class FragmentCache:
+    """以檔案存放的片段快取 (每個區塊一個檔案)"""
+
+    def __init__(self, cache_dir: str = FRAGMENT_CACHE_DIR, max_files: int = FRAGMENT_CACHE_MAX_FILES):
+        """
+        Args:
+            cache_dir: 快取目錄 (空字串表示停用)
+            max_files: 保留的區塊數量上限 (超過時刪除最久未使用者)
+        """
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.xml")
+
+    def get(self, key: str) -> Optional[List[bytes]]:
+        """
+        讀取區塊片段
+
+        Args:
+            key: fragment_key 計算的鍵值
+
+        Returns:
+            list: 依序排列的元素 XML，未命中時回傳 None
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path, None)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data.split(_SEPARATOR) if data else []
+
+    def put(self, key: str, fragments: List[bytes]):
+        """寫入區塊片段 (先寫入暫存檔再置換，並行產生報告時不會讀到不完整的內容)"""
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_SEPARATOR.join(fragments))
+            os.replace(tmp_path, self._path(key))
+            self._written += 1
+        except OSError as e:
+            print(f"寫入片段快取失敗: {e}")
+
+    def prune(self):
+        """快取超過上限時刪除最久未使用的區塊 (於本次寫入後呼叫一次)"""
+        if not self.enabled or not self._written:
+            return
+        try:
+            files = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir) if n.endswith(".xml")]
+            if len(files) > self.max_files:
+                files.sort(key=os.path.getmtime)
+                for path in files[:len(files) - self.max_files]:
+                    os.remove(path)
+        except OSError as e:
+            print(f"清理片段快取失敗: {e}")
+        self._written = 0
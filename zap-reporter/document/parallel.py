@@ -0,0 +1,205 @@
+"""
+區塊平行渲染模組
+將依序排列的內容區塊 (如弱點詳情) 切分為連續的區段，由程序池中的工作程序各自以
+同一範本建立暫存文件並產生 OOXML 片段，主程序再依原順序合併，輸出與單一程序渲染相同。
+
+工作程序優先以 fork 建立，沿用父程序已預先翻譯的快取、翻譯目錄與範本套件；
+無法建立子程序 (如本身即為 daemonic 工作程序) 或程序池失敗時，改為單一程序渲染。
+"""
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from lxml import etree
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+
+from document.template import document_from_template
+
+# 每個工作程序平均分配的區段數 (區段越多負載越平均，但序列化與合併的次數也越多)
+CHUNKS_PER_WORKER = 4
+
+RenderBlock = Callable[[object, object], None]
+
+# 工作程序內的渲染函式 (由 initializer 設定)
+_render_block: Optional[RenderBlock] = None
+
+
+def split_chunks(items: Sequence, workers: int) -> List[list]:
+    """
+    將區塊依序切分為連續的區段
+
+    Args:
+        items: 內容區塊
+        workers: 工作程序數
+
+    Returns:
+        list: 區段列表 (串接後即為原順序)
+    """
+    if not items:
+        return []
+    size = max(1, math.ceil(len(items) / (max(workers, 1) * CHUNKS_PER_WORKER)))
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def _init_worker(render_block: RenderBlock):
+    global _render_block
+    _render_block = render_block
+
+
+def _render_chunk(chunk: list) -> List[bytes]:
+    """於工作程序中渲染單一區段，回傳 body 內各元素的 XML"""
+    doc = document_from_template()
+    for item in chunk:
+        _render_block(doc, item)
+
+    sect_pr = qn('w:sectPr')
+    return [
+        etree.tostring(element, encoding='UTF-8')
+        for element in doc.element.body
+        if element.tag != sect_pr
+    ]
+
+
+def _take_fragments(doc) -> List[bytes]:
+    """取出暫存文件 body 內已渲染的元素 XML 並自文件移除 (保留 sectPr)"""
+    body = doc.element.body
+    sect_pr = qn('w:sectPr')
+    fragments = []
+    for element in list(body):
+        if element.tag != sect_pr:
+            fragments.append(etree.tostring(element, encoding='UTF-8'))
+            body.remove(element)
+    return fragments
+
+
+def _render_items(render_block: RenderBlock, chunk: list) -> List[List[bytes]]:
+    """以同一份暫存文件逐一渲染區塊，回傳各區塊各自的元素 XML"""
+    doc = document_from_template()
+    results = []
+    for item in chunk:
+        render_block(doc, item)
+        results.append(_take_fragments(doc))
+    return results
+
+
+def _render_chunk_items(chunk: list) -> List[List[bytes]]:
+    """於工作程序中渲染單一區段，回傳各區塊各自的元素 XML"""
+    return _render_items(_render_block, chunk)
+
+
+def merge_fragments(doc, fragments: List[bytes]):
+    """
+    將 OOXML 片段依序附加到文件 body (sectPr 之前)
+
+    Args:
+        doc: python-docx Document
+        fragments: _render_chunk 產生的元素 XML
+    """
+    body = doc.element.body
+    sect_pr = body.find(qn('w:sectPr'))
+    for fragment in fragments:
+        element = parse_xml(fragment)
+        if sect_pr is not None:
+            sect_pr.addprevious(element)
+        else:
+            body.append(element)
+
+
+def _pool_context():
+    """工作程序建立方式 (可用時使用 fork)"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def render_blocks(
+    doc,
+    items: Sequence,
+    render_block: RenderBlock,
+    workers: int = 1,
+    on_chunk: Optional[Callable[[], None]] = None
+) -> int:
+    """
+    渲染內容區塊 (workers > 1 時以程序池平行產生各區段再依序合併)
+
+    Args:
+        doc: python-docx Document (需由 document.template 的範本建立，樣式才會一致)
+        items: 內容區塊 (需可 pickle)
+        render_block: 渲染單一區塊的函式 render_block(doc, item)，需為模組層級函式或其 partial
+        workers: 工作程序數
+        on_chunk: 每合併完一個區段 (單一程序渲染時為每個區塊) 後呼叫，串流寫入器藉此寫出已完成的內容
+
+    Returns:
+        int: 實際使用的工作程序數 (1 表示單一程序渲染)
+    """
+    chunks = split_chunks(items, workers)
+    merged = 0
+    used = 1
+
+    if workers > 1 and len(chunks) > 1 and not multiprocessing.current_process().daemon:
+        used = min(workers, len(chunks))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=used,
+                mp_context=_pool_context(),
+                initializer=_init_worker,
+                initargs=(render_block,)
+            ) as pool:
+                # map 依提交順序回傳結果，合併順序固定
+                for fragments in pool.map(_render_chunk, chunks):
+                    merge_fragments(doc, fragments)
+                    merged += 1
+                    if on_chunk:
+                        on_chunk()
+        except (OSError, BrokenProcessPool) as e:
+            print(f"平行渲染失敗，剩餘 {len(chunks) - merged} 個區段改為單一程序渲染: {e}")
+            used = 1
+
+    # 單一程序渲染時每個區塊各自視為一個區段
+    for chunk in chunks[merged:]:
+        for item in chunk:
+            render_block(doc, item)
+            if on_chunk:
+                on_chunk()
+
+    return used
+
+
+def render_fragments(items: Sequence, render_block: RenderBlock, workers: int = 1) -> Iterator[List[bytes]]:
+    """
+    渲染內容區塊並依原順序逐一產出各區塊的 OOXML 片段 (供片段快取儲存後再合併)
+
+    Args:
+        items: 內容區塊 (需可 pickle)
+        render_block: 渲染單一區塊的函式 render_block(doc, item)，需為模組層級函式或其 partial
+        workers: 工作程序數
+
+    Yields:
+        list: 單一區塊的元素 XML (可直接傳入 merge_fragments)
+    """
+    chunks = split_chunks(items, workers)
+    done = 0
+
+    if workers > 1 and len(chunks) > 1 and not multiprocessing.current_process().daemon:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                mp_context=_pool_context(),
+                initializer=_init_worker,
+                initargs=(render_block,)
+            ) as pool:
+                for results in pool.map(_render_chunk_items, chunks):
+                    done += 1
+                    yield from results
+        except (OSError, BrokenProcessPool) as e:
+            print(f"平行渲染失敗，剩餘 {len(chunks) - done} 個區段改為單一程序渲染: {e}")
+
+    # 單一程序渲染時每完成一個區塊即產出
+    doc = document_from_template()
+    for chunk in chunks[done:]:
+        for item in chunk:
+            render_block(doc, item)
+            yield _take_fragments(doc)
@@ -1,8 +1,248 @@
 """
 Markdown 渲染模組
+Markdown 以預先編譯的正規表達式切分為區塊與行內片段 (結果快取)，
+再一次產生整批 OOXML 段落 / 表格元素插入文件，不經 python-docx 逐 run 建立物件。
 """
 import re
-from docx.shared import Inches, Pt, RGBColor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Inches, Length, Pt, RGBColor
+
+# 行內格式: **粗體**、`代碼`
+_INLINE_PATTERN = re.compile(r'(\*\*.*?\*\*)|(`.*?`)')
+# 有序列表
+_NUMBERED_PATTERN = re.compile(r'^\d+\.\s')
+# XML 不允許的控制字元
+_INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\r]')
+
+# 區塊種類
+CODE, HEADING, BULLET, NUMBER, PARAGRAPH, TABLE = range(6)
+
+# 各元素的格式 (與舊版物件層實作的輸出一致)
+_INLINE_CODE_RPR = '<w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New"/><w:color w:val="B40000"/></w:rPr>'
+_BOLD_RPR = '<w:rPr><w:b/></w:rPr>'
+_CODE_BLOCK_PPR = '<w:pPr><w:ind w:left="288"/></w:pPr>'
+_CODE_BLOCK_RPR = (
+    '<w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New"/>'
+    '<w:color w:val="505050"/><w:sz w:val="19"/></w:rPr>'
+)
+_HEADING_PPR = '<w:pPr><w:spacing w:before="120"/></w:pPr>'
+_HEADING_RPR = '<w:rPr><w:b/><w:color w:val="2E74B5"/><w:sz w:val="26"/></w:rPr>'
+_TABLE_LOOK = (
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+    'w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+)
+
+Block = Tuple
+
+
+def _parse_table(buffer: List[str]) -> Optional[Block]:
+    """將 Markdown 表格列轉為 (TABLE, 標頭, 內容列, 欄數)"""
+    rows_data = [[c.strip() for c in line.strip().strip('|').split('|')] for line in buffer]
+    if not rows_data:
+        return None
+
+    headers = None
+    body_start = 0
+    if len(rows_data) > 1 and all(set(c) <= set('-: ') for c in rows_data[1]):
+        headers = tuple(rows_data[0])
+        body_start = 2
+
+    body_rows = tuple(tuple(r) for r in rows_data[body_start:])
+    all_rows = ([headers] if headers else []) + list(body_rows)
+    if not all_rows:
+        return None
+    return (TABLE, headers, body_rows, max(len(r) for r in all_rows))
+
+
+@lru_cache(maxsize=512)
+def tokenize_markdown(text: str) -> Tuple[Block, ...]:
+    """
+    將 Markdown 切分為區塊 (規則與舊版逐行渲染相同)
+
+    Args:
+        text: Markdown 格式的文字
+
+    Returns:
+        tuple: (區塊種類, 內容...) 的序列
+    """
+    blocks: List[Block] = []
+    in_code_block = False
+    table_buffer: List[str] = []
+
+    for line in str(text).split('\n'):
+        stripped = line.strip()
+
+        # 表格列先累積，遇到非表格列時整批轉換
+        if not in_code_block and stripped.startswith('|') and stripped.endswith('|'):
+            table_buffer.append(stripped)
+            continue
+        if table_buffer:
+            table = _parse_table(table_buffer)
+            if table:
+                blocks.append(table)
+            table_buffer = []
+
+        if not stripped:
+            continue
+
+        if stripped.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+
+        if in_code_block:
+            blocks.append((CODE, line))
+        elif stripped.startswith("### ") or stripped.startswith("## "):
+            blocks.append((HEADING, stripped.lstrip("#").strip()))
+        elif stripped.startswith("- ") or stripped.startswith("* "):
+            blocks.append((BULLET, stripped[2:]))
+        elif _NUMBERED_PATTERN.match(stripped):
+            blocks.append((NUMBER, _NUMBERED_PATTERN.sub('', stripped)))
+        else:
+            blocks.append((PARAGRAPH, stripped))
+
+    if table_buffer:
+        table = _parse_table(table_buffer)
+        if table:
+            blocks.append(table)
+
+    return tuple(blocks)
+
+
+def _text_xml(text: str) -> str:
+    """文字轉為 w:t (跳脫特殊字元，Tab 轉為 w:tab)"""
+    text = _INVALID_XML_CHARS.sub('', text)
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return '<w:tab/>'.join(
+        f'<w:t xml:space="preserve">{part}</w:t>' if part else ''
+        for part in text.split('\t')
+    )
+
+
+def _run_xml(text: str, rpr: str = '') -> str:
+    return f'<w:r>{rpr}{_text_xml(text)}</w:r>'
+
+
+def _inline_xml(text: str) -> str:
+    """行內格式轉為一串 w:r"""
+    runs = []
+    for part in _INLINE_PATTERN.split(text):
+        if not part:
+            continue
+        if part.startswith("`") and part.endswith("`"):
+            runs.append(_run_xml(part[1:-1], _INLINE_CODE_RPR))
+        elif part.startswith("**") and part.endswith("**"):
+            runs.append(_run_xml(part[2:-2], _BOLD_RPR))
+        else:
+            runs.append(_run_xml(part))
+    return ''.join(runs)
+
+
+def _paragraph_xml(runs: str, ppr: str = '') -> str:
+    return f'<w:p>{ppr}{runs}</w:p>'
+
+
+def _style_ppr(style_id: Optional[str]) -> str:
+    return f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ''
+
+
+def _table_xml(block: Block, table_style: Optional[str], block_width: int) -> str:
+    """Markdown 表格轉為 w:tbl (標頭列粗體，內容列套用行內格式)"""
+    _, headers, body_rows, cols = block
+    col_width = int(Length(block_width // cols).twips)
+    tc_pr = f'<w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr>'
+
+    style = f'<w:tblStyle w:val="{table_style}"/>' if table_style else ''
+    parts = [
+        f'<w:tbl><w:tblPr>{style}<w:tblW w:type="auto" w:w="0"/>{_TABLE_LOOK}</w:tblPr><w:tblGrid>',
+        f'<w:gridCol w:w="{col_width}"/>' * cols,
+        '</w:tblGrid>',
+    ]
+
+    def add_row(cells, render):
+        parts.append('<w:tr>')
+        for j in range(cols):
+            content = render(cells[j]) if j < len(cells) and cells[j] else ''
+            parts.append(f'<w:tc>{tc_pr}<w:p>{content}</w:p></w:tc>')
+        parts.append('</w:tr>')
+
+    if headers:
+        add_row(headers, lambda txt: _run_xml(txt, _BOLD_RPR))
+    for row in body_rows:
+        add_row(row, _inline_xml)
+
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_markdown(
+    text: str,
+    style_ids: Tuple[Optional[str], Optional[str], Optional[str]],
+    block_width: int,
+    in_cell: bool = False
+) -> str:
+    """
+    將 Markdown 編譯為 OOXML 片段 (結果快取)
+
+    Args:
+        text: Markdown 格式的文字
+        style_ids: (項目符號列表, 編號列表, 表格) 的樣式 ID
+        block_width: 可用寬度 (EMU)，用於表格欄寬
+        in_cell: 是否渲染於表格儲存格內
+
+    Returns:
+        str: 多個 w:p / w:tbl 元素串接的 XML
+    """
+    bullet_style, number_style, table_style = style_ids
+    parts = []
+
+    for block in tokenize_markdown(text):
+        kind = block[0]
+        if kind == CODE:
+            parts.append(_paragraph_xml(_run_xml(block[1], _CODE_BLOCK_RPR), _CODE_BLOCK_PPR))
+        elif kind == HEADING:
+            parts.append(_paragraph_xml(_run_xml(block[1], _HEADING_RPR), _HEADING_PPR))
+        elif kind == BULLET:
+            parts.append(_paragraph_xml(_inline_xml(block[1]), _style_ppr(bullet_style)))
+        elif kind == NUMBER:
+            parts.append(_paragraph_xml(_inline_xml(block[1]), _style_ppr(number_style)))
+        elif kind == PARAGRAPH:
+            parts.append(_paragraph_xml(_inline_xml(block[1])))
+        elif kind == TABLE:
+            parts.append(_table_xml(block, table_style, block_width))
+            # 儲存格內的表格後必須接段落 (同 python-docx 的 _Cell.add_table)，之後再保留一個空白段落
+            parts.append('<w:p/><w:p/>' if in_cell else '<w:p/>')
+
+    return ''.join(parts)
+
+
+def _resolve_style_id(styles, name: str, fallback: Optional[str] = None) -> Optional[str]:
+    try:
+        return styles[name].style_id
+    except KeyError:
+        if fallback:
+            return _resolve_style_id(styles, fallback)
+        return None
+
+
+def _container_target(container):
+    """
+    取得插入位置
+
+    Returns:
+        tuple: (父元素, 插入於其前的元素或 None, 可用寬度)；不支援的容器回傳 None
+    """
+    if hasattr(container, '_tc'):
+        return container._tc, None, container.width or Inches(6)
+    body = getattr(container, '_body', None)
+    if body is not None:
+        element = body._element
+        return element, element.sectPr, container._block_width
+    return None
 
 
 def render_markdown(container, text: str):
@@ -16,6 +256,51 @@ def render_markdown(container, text: str):
     - 表格 (Markdown 格式)
     - 內聯格式 (**粗體**, `代碼`)
 
+    Args:
+        container: Word 文檔容器 (Document 或 Cell)
+        text: Markdown 格式的文字
+    """
+    if not text:
+        return
+
+    target = _container_target(container)
+    if target is None:
+        _render_markdown_runs(container, text)
+        return
+    parent, anchor, block_width = target
+
+    try:
+        styles = container.part.styles
+        style_ids = (
+            _resolve_style_id(styles, 'List Bullet', 'List Paragraph'),
+            _resolve_style_id(styles, 'List Number', 'List Paragraph'),
+            _resolve_style_id(styles, 'Table Grid'),
+        )
+        body_xml = compile_markdown(str(text), style_ids, int(block_width), hasattr(container, '_tc'))
+        elements = list(parse_xml(f'<w:body {nsdecls("w")}>{body_xml}</w:body>')) if body_xml else []
+    except Exception as e:
+        print(f"Markdown 編譯失敗，改用逐段落渲染: {e}")
+        _render_markdown_runs(container, text)
+        return
+
+    for element in elements:
+        if anchor is not None:
+            anchor.addprevious(element)
+        else:
+            parent.append(element)
+
+
+def _render_markdown_runs(container, text: str):
+    """
+    將 Markdown 內容逐段落、逐 run 透過 python-docx 物件層渲染 (舊版實作，作為備援)
+
+    支援:
+    - 代碼塊 (```)
+    - 標題 (##, ###)
+    - 列表 (-, *, 1.)
+    - 表格 (Markdown 格式)
+    - 內聯格式 (**粗體**, `代碼`)
+
     Args:
         container: Word 文檔容器 (Document 或 Cell)
         text: Markdown 格式的文字
@@ -29,8 +314,7 @@ def render_markdown(container, text: str):
 
     def _render_inline(paragraph, text_content):
         """渲染內聯格式"""
-        token_pattern = re.compile(r'(\*\*.*?\*\*)|(`.*?`)')
-        parts = token_pattern.split(text_content)
+        parts = _INLINE_PATTERN.split(text_content)
 
         for part in parts:
             if not part:
@@ -140,12 +424,12 @@ def render_markdown(container, text: str):
             except Exception:
                 p = container.add_paragraph(style='List Paragraph')
             content = stripped[2:]
-        elif re.match(r'^\d+\.\s', stripped):
+        elif _NUMBERED_PATTERN.match(stripped):
             try:
                 p = container.add_paragraph(style='List Number')
             except Exception:
                 p = container.add_paragraph(style='List Paragraph')
-            content = re.sub(r'^\d+\.\s', '', stripped)
+            content = _NUMBERED_PATTERN.sub('', stripped)
 
         if p is None:
             p = container.add_paragraph()
@@ -1,4 +1,5 @@
 # Document Sections
 from .cover import add_cover_page
 from .summary import add_summary_section
-from .details import add_details_section
+from .portfolio import add_portfolio_section
+from .details import add_details_section, collect_detail_texts, match_ai_solutions
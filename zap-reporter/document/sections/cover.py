@@ -3,19 +3,24 @@
 """
 import os
 from datetime import datetime
+from typing import List, Optional
 from docx import Document
 from docx.shared import Inches
 
+from services.findings import ScanFindings
 
-def add_cover_page(doc: Document, data: dict, base_dir: str, company_name: str):
+
+def add_cover_page(doc: Document, findings: ScanFindings, base_dir: str, company_name: str,
+                   targets: Optional[List[dict]] = None):
     """
     生成報告封面頁
 
     Args:
         doc: Word 文檔物件
-        data: ZAP 報告數據
+        findings: 弱點模型
         base_dir: 基礎目錄 (用於尋找 logo)
         company_name: 公司名稱
+        targets: 多目標合併報告的各目標摘要 (可選)
     """
     # 標題
     doc.add_heading(f'{company_name} - 弱點掃描報告', 0)
@@ -33,7 +38,10 @@ def add_cover_page(doc: Document, data: dict, base_dir: str, company_name: str):
     doc.add_paragraph(f"產生日期: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # 掃描目標
-    scan_target = data.get('site', [{}])[0].get('@name', 'Unknown Target')
-    doc.add_paragraph(f"掃描目標: {scan_target}")
+    if targets:
+        doc.add_paragraph(f"掃描目標: {len(targets)} 個 ({', '.join(t['target'] for t in targets[:5])}"
+                          f"{' 等' if len(targets) > 5 else ''})")
+    else:
+        doc.add_paragraph(f"掃描目標: {findings.target}")
 
     doc.add_page_break()
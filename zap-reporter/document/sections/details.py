@@ -1,59 +1,22 @@
 """
 弱點詳情頁生成模組
 """
-from typing import Dict, Optional
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
 from docx import Document
 from docx.shared import Inches, RGBColor
 
-from config.translations import RISK_MAPPING, translate_title
+from config.translations import RISK_MAPPING
+from config.alert_catalog import catalog_text
+from config.settings import DETAIL_GROUP_ALERTS, DETAIL_MAX_INSTANCES, RENDER_WORKERS, FRAGMENT_CACHE_DIR
 from services.translator import auto_translate
-from services.formatter import clean_html, parse_ai_response
+from services.formatter import parse_ai_response
+from services.ai_matching import AIMatch, AISolutionIndex, alert_title, build_ai_index
+from services.findings import FindingGroup, Instance, ScanFindings
 from document.renderer import render_markdown
-from document.styles import get_risk_color
-
-
-def _build_ai_solutions_map(ai_data: Optional[dict]) -> Dict[str, str]:
-    """建立 AI 解決方案查找表"""
-    ai_solutions_map = {}
-
-    if not ai_data or 'solutions' not in ai_data:
-        return ai_solutions_map
-
-    raw_solutions = ai_data['solutions']
-
-    # 處理列表格式
-    if isinstance(raw_solutions, list):
-        new_solutions = {}
-        for item in raw_solutions:
-            if isinstance(item, dict):
-                for k, v in item.items():
-                    new_solutions[k] = v
-        raw_solutions = new_solutions
-
-    # 建立查找表 (含正規化版本)
-    if isinstance(raw_solutions, dict):
-        for k, v in raw_solutions.items():
-            ai_solutions_map[k] = v
-            norm_k = k.lower().strip()
-            if norm_k not in ai_solutions_map:
-                ai_solutions_map[norm_k] = v
-
-    return ai_solutions_map
-
-
-def _find_ai_content(
-    eng_name: str,
-    tw_name: str,
-    ai_solutions_map: Dict[str, str]
-) -> Optional[str]:
-    """查找對應的 AI 建議內容"""
-    if eng_name in ai_solutions_map:
-        return ai_solutions_map[eng_name]
-    elif tw_name and tw_name in ai_solutions_map:
-        return ai_solutions_map[tw_name]
-    elif eng_name.lower().strip() in ai_solutions_map:
-        return ai_solutions_map[eng_name.lower().strip()]
-    return None
+from document.parallel import render_blocks, render_fragments, merge_fragments
+from document.fragment_cache import FragmentCache, fragment_key
+from document.styles import get_risk_color, set_table_header_style
 
 
 def _add_detail_row(table, label: str, content: str, is_md: bool = False, color: RGBColor = None):
@@ -72,95 +35,254 @@ def _add_detail_row(table, label: str, content: str, is_md: bool = False, color:
             run.font.color.rgb = color
 
 
+def _add_affected_table(doc: Document, sites: Dict[str, List[Instance]], max_rows: int = DETAIL_MAX_INSTANCES):
+    """添加受影響網站與實例表格 (超過上限的實例僅列出數量)"""
+    table = doc.add_table(rows=1, cols=4)
+    table.style = 'Table Grid'
+    hdr = table.rows[0].cells
+    hdr[0].text, hdr[1].text, hdr[2].text, hdr[3].text = '網站', 'URI', '方法', '參數'
+    for cell in hdr:
+        set_table_header_style(cell)
+
+    shown = total = 0
+    for site_name, instances in sites.items():
+        total += max(len(instances), 1)
+        for instance in instances or [Instance()]:
+            if shown >= max_rows:
+                break
+            row = table.add_row().cells
+            row[0].text = site_name
+            row[1].text = instance.uri
+            row[2].text = instance.method
+            row[3].text = instance.param
+            shown += 1
+
+    if total > shown:
+        doc.add_paragraph(f"(另有 {total - shown} 筆受影響實例未列出)")
+
+
+def match_ai_solutions(findings: ScanFindings, ai_index: AISolutionIndex) -> List[Tuple[str, AIMatch]]:
+    """
+    詳情頁各弱點區塊對應到的 AI 建議 (供報告中繼資料記錄對應品質)
+
+    Args:
+        findings: 弱點模型
+        ai_index: AI 建議查找索引
+
+    Returns:
+        list: [(弱點名稱, 對應結果)]，依詳情頁順序
+    """
+    return [
+        (group.alert.name, ai_index.match_alert(group.alert, alert_title(group.alert)))
+        for group in findings.groups(DETAIL_GROUP_ALERTS)
+    ]
+
+
+def collect_detail_texts(findings: ScanFindings, ai_data: Optional[dict] = None,
+                         ai_index: Optional[AISolutionIndex] = None) -> List[str]:
+    """
+    預先收集弱點詳情頁需要翻譯的全部文字 (供批次翻譯)
+    翻譯目錄已涵蓋的固定文字不需要即時翻譯，不會列入
+
+    Args:
+        findings: 弱點模型
+        ai_data: AI 分析數據 (可選)
+        ai_index: 已建立的 AI 建議查找索引 (可選，未提供時由 ai_data 建立)
+
+    Returns:
+        list: 待翻譯文字 (已去重，保持出現順序)
+    """
+    if ai_index is None:
+        ai_index = build_ai_index(ai_data, findings=findings)
+    texts = []
+
+    for group in findings.groups(DETAIL_GROUP_ALERTS):
+        alert = group.alert
+        if not catalog_text(alert.catalog, 'desc'):
+            texts.append(alert.desc)
+
+        # 有 AI 建議時不會使用 ZAP 的修復建議
+        if ai_index.match_alert(alert, alert_title(alert)).content:
+            continue
+        if not catalog_text(alert.catalog, 'solution'):
+            texts.append(alert.solution)
+
+    return list(dict.fromkeys(t for t in texts if t))
+
+
+def _block_key(group: FindingGroup, ai_index: AISolutionIndex) -> str:
+    """
+    弱點區塊的片段快取鍵值: 涵蓋 _add_finding_block 使用的全部輸入
+    (名稱、風險等級、譯文、AI 建議、參考資料與受影響實例)；譯文已於渲染前預先翻譯，此處直接命中翻譯快取
+
+    Args:
+        group: 弱點模型的分組
+        ai_index: AI 建議查找索引
+
+    Returns:
+        str: 快取鍵值
+    """
+    alert = group.alert
+    entry = alert.catalog
+    tw_name = alert_title(alert)
+    ai_content = ai_index.match_alert(alert, tw_name).content
+    zh_desc = catalog_text(entry, 'desc') or auto_translate(alert.desc)
+    zh_solution = None if ai_content else catalog_text(entry, 'solution') or auto_translate(alert.solution)
+    instances = tuple(
+        (site_name, tuple((i.uri, i.method, i.param) for i in site_instances))
+        for site_name, site_instances in group.sites.items()
+    )
+    return fragment_key("finding", (
+        tw_name, alert.name, group.risk, group.instance_count, zh_desc, ai_content, zh_solution,
+        alert.reference, instances, DETAIL_MAX_INSTANCES
+    ))
+
+
+def _render_cached(doc: Document, groups: List[FindingGroup], render_block, cache: FragmentCache,
+                   ai_index: AISolutionIndex, workers: int, on_block: Optional[Callable[[], None]]):
+    """依序合併弱點區塊: 快取命中者直接合併片段，其餘重新渲染 (可平行) 後寫入快取"""
+    keys = [_block_key(group, ai_index) for group in groups]
+    cached = [cache.get(key) for key in keys]
+    fresh = render_fragments(
+        [group for group, fragments in zip(groups, cached) if fragments is None], render_block, workers
+    )
+
+    for key, fragments in zip(keys, cached):
+        if fragments is None:
+            fragments = next(fresh)
+            cache.put(key, fragments)
+        merge_fragments(doc, fragments)
+        if on_block:
+            on_block()
+
+    cache.prune()
+    print(f"片段快取: 重用 {cache.hits} 個弱點區塊，重新渲染 {cache.misses} 個")
+
+
+def _add_finding_block(doc: Document, group: FindingGroup, ai_index: AISolutionIndex):
+    """
+    添加單一弱點區塊 (標題、詳情表格與受影響實例)
+
+    Args:
+        doc: Word 文檔物件
+        group: 弱點模型的分組
+        ai_index: AI 建議查找索引
+    """
+    alert = group.alert
+    eng_name = alert.name
+    risk_eng = group.risk
+    entry = alert.catalog
+
+    # 翻譯 (優先使用翻譯目錄)
+    tw_name = alert_title(alert)
+    tw_risk = RISK_MAPPING.get(risk_eng, risk_eng)
+
+    # 查找 AI 建議
+    ai_content = ai_index.match_alert(alert, tw_name).content
+    parsed_ai = parse_ai_response(ai_content) if ai_content else None
+
+    # 弱點標題
+    doc.add_heading(tw_name, level=2)
+
+    # 詳情表格
+    det_table = doc.add_table(rows=0, cols=2)
+    det_table.style = 'Table Grid'
+    det_table.columns[0].width = Inches(1.5)
+    det_table.columns[1].width = Inches(5.0)
+
+    # 弱點原名
+    _add_detail_row(det_table, "弱點原名", eng_name)
+
+    # 風險等級
+    risk_color = get_risk_color(risk_eng)
+    _add_detail_row(det_table, "風險等級", tw_risk, color=risk_color)
+
+    # 影響範圍
+    _add_detail_row(
+        det_table, "影響範圍",
+        f"{len(group.sites)} 個網站，共 {group.instance_count} 個實例"
+    )
+
+    # 弱點描述
+    zh_desc = catalog_text(entry, 'desc') or auto_translate(alert.desc)
+    _add_detail_row(det_table, "弱點描述", zh_desc)
+
+    # AI 分析或 ZAP 標準建議
+    if parsed_ai:
+        if parsed_ai.get('explanation'):
+            _add_detail_row(det_table, "弱點分析 (AI)", parsed_ai['explanation'], is_md=True)
+
+        sol_content = parsed_ai.get('solution') or ai_content
+        _add_detail_row(det_table, "修復建議 (AI)", sol_content, is_md=True)
+
+        ref_content = parsed_ai.get('reference')
+        source_label = "生成式 AI 建議"
+    else:
+        zh_solution = catalog_text(entry, 'solution') or auto_translate(alert.solution)
+        _add_detail_row(det_table, "修復建議", zh_solution)
+
+        ref_content = alert.reference
+        source_label = "ZAP 標準建議"
+
+    # 建議來源
+    row = det_table.add_row()
+    row.cells[0].text = "建議來源"
+    cell = row.cells[1]
+    p = cell.paragraphs[0]
+    run = p.add_run(source_label)
+    if parsed_ai:
+        run.bold = True
+        run.font.color.rgb = RGBColor(0, 112, 192)
+
+    # 參考資料
+    if ref_content:
+        cell.add_paragraph("")
+        p_ref = cell.add_paragraph()
+        p_ref.add_run("參考資料:").bold = True
+        render_markdown(cell, ref_content)
+
+    # 受影響網站與實例
+    doc.add_paragraph("受影響網站與實例：")
+    _add_affected_table(doc, group.sites)
+
+    doc.add_paragraph("")
+
+
 def add_details_section(
     doc: Document,
-    data: dict,
-    ai_data: Optional[dict] = None
+    findings: ScanFindings,
+    ai_data: Optional[dict] = None,
+    on_block: Optional[Callable[[], None]] = None,
+    workers: int = RENDER_WORKERS,
+    ai_index: Optional[AISolutionIndex] = None,
+    cache_dir: Optional[str] = None
 ):
     """
-    生成弱點詳情頁
+    生成弱點詳情頁 (同一規則跨網站重複觸發時合併為單一區塊)
+    workers > 1 時各弱點區塊依序切分為區段，由程序池平行渲染後依原順序合併；
+    啟用片段快取時，輸入未變更的區塊直接沿用上次渲染的 OOXML 片段
 
     Args:
-        doc: Word 文檔物件
-        data: ZAP 報告數據
+        doc: Word 文檔物件 (平行渲染時需由 document.template 的範本建立)
+        findings: 弱點模型
         ai_data: AI 分析數據 (可選)
+        on_block: 每完成一個弱點區塊 (平行渲染時為一個區段) 後呼叫，串流寫入器藉此寫出並釋放已完成的內容
+        workers: 渲染用的工作程序數
+        ai_index: 已建立的 AI 建議查找索引 (可選，未提供時由 ai_data 建立)
+        cache_dir: 片段快取目錄 (未提供時使用 FRAGMENT_CACHE_DIR，空字串表示停用)
     """
     doc.add_heading('2. 弱點詳情分析', level=1)
 
-    # 建立 AI 解決方案查找表
-    ai_solutions_map = _build_ai_solutions_map(ai_data)
-
-    sites = data.get('site', [])
-
-    for site in sites:
-        alerts = site.get('alerts', [])
-
-        for alert in alerts:
-            eng_name = alert.get('alert', 'Unknown Alert')
-            risk_eng = alert.get('riskdesc', 'Info').split(' ')[0]
-            desc = clean_html(alert.get('desc', ''))
-
-            # 翻譯
-            tw_name = translate_title(eng_name)
-            tw_risk = RISK_MAPPING.get(risk_eng, risk_eng)
-
-            # 查找 AI 建議
-            ai_content = _find_ai_content(eng_name, tw_name, ai_solutions_map)
-            parsed_ai = parse_ai_response(ai_content) if ai_content else None
-
-            # 弱點標題
-            doc.add_heading(tw_name, level=2)
-
-            # 詳情表格
-            det_table = doc.add_table(rows=0, cols=2)
-            det_table.style = 'Table Grid'
-            det_table.columns[0].width = Inches(1.5)
-            det_table.columns[1].width = Inches(5.0)
-
-            # 弱點原名
-            _add_detail_row(det_table, "弱點原名", eng_name)
-
-            # 風險等級
-            risk_color = get_risk_color(risk_eng)
-            _add_detail_row(det_table, "風險等級", tw_risk, color=risk_color)
-
-            # 弱點描述
-            zh_desc = auto_translate(desc)
-            _add_detail_row(det_table, "弱點描述", zh_desc)
-
-            # AI 分析或 ZAP 標準建議
-            if parsed_ai:
-                if parsed_ai.get('explanation'):
-                    _add_detail_row(det_table, "弱點分析 (AI)", parsed_ai['explanation'], is_md=True)
-
-                sol_content = parsed_ai.get('solution') or ai_content
-                _add_detail_row(det_table, "修復建議 (AI)", sol_content, is_md=True)
-
-                ref_content = parsed_ai.get('reference')
-                source_label = "生成式 AI 建議"
-            else:
-                solution_text = clean_html(alert.get('solution', ''))
-                zh_solution = auto_translate(solution_text)
-                _add_detail_row(det_table, "修復建議", zh_solution)
-
-                ref_content = clean_html(alert.get('reference', ''))
-                source_label = "ZAP 標準建議"
-
-            # 建議來源
-            row = det_table.add_row()
-            row.cells[0].text = "建議來源"
-            cell = row.cells[1]
-            p = cell.paragraphs[0]
-            run = p.add_run(source_label)
-            if parsed_ai:
-                run.bold = True
-                run.font.color.rgb = RGBColor(0, 112, 192)
-
-            # 參考資料
-            if ref_content:
-                cell.add_paragraph("")
-                p_ref = cell.add_paragraph()
-                p_ref.add_run("參考資料:").bold = True
-                render_markdown(cell, ref_content)
-
-            doc.add_paragraph("")
+    # 建立 AI 建議查找索引
+    if ai_index is None:
+        ai_index = build_ai_index(ai_data, findings=findings)
+
+    groups = findings.groups(DETAIL_GROUP_ALERTS)
+    render_block = partial(_add_finding_block, ai_index=ai_index)
+    if cache_dir is None:
+        cache_dir = FRAGMENT_CACHE_DIR
+    if cache_dir:
+        _render_cached(doc, groups, render_block, FragmentCache(cache_dir), ai_index, workers, on_block)
+        return
+
+    render_blocks(doc, groups, render_block, workers=workers, on_chunk=on_block)
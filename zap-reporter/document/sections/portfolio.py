@@ -0,0 +1,39 @@
+"""
+目標總覽生成模組 (多目標合併報告)
+"""
+from typing import List
+from docx import Document
+
+from document.styles import set_table_header_style
+from services.findings import RISK_LEVELS
+
+
+def add_portfolio_section(doc: Document, targets: List[dict]):
+    """
+    生成各目標的摘要表 (合併去重前的原始統計)
+
+    Args:
+        doc: Word 文檔物件
+        targets: 各目標摘要 (見 services.portfolio.merge_scans)
+    """
+    doc.add_heading('目標總覽', level=1)
+    doc.add_paragraph(
+        f"本報告合併 {len(targets)} 個掃描目標的結果；"
+        f"重疊目標中相同規則、URI 與參數的實例只列出一次。"
+    )
+
+    headers = ['來源', '掃描目標', '網站', '弱點', '高', '中', '低', '資訊', '重複實例']
+    table = doc.add_table(rows=1, cols=len(headers))
+    table.style = 'Table Grid'
+    for cell, header in zip(table.rows[0].cells, headers):
+        cell.text = header
+        set_table_header_style(cell)
+
+    for target in targets:
+        values = [target['name'], target['target'], target['sites'], target['alerts']]
+        values += [target['risk_counts'][risk] for risk in RISK_LEVELS]
+        values.append(target['duplicates'])
+        for cell, value in zip(table.add_row().cells, values):
+            cell.text = str(value)
+
+    doc.add_page_break()
@@ -1,29 +1,20 @@
 """
 摘要頁生成模組
 """
-import os
+import io
 from typing import Dict, Optional
 from docx import Document
 from docx.shared import Inches, RGBColor
 
 from document.styles import set_table_header_style
-from document.charts import generate_risk_chart
+from document.charts import (
+    render_charts, risk_pie_payload, site_bars_payload, confidence_heatmap_payload
+)
 from document.renderer import render_markdown
+from services.findings import ScanFindings
 
-
-def _count_risks(data: dict) -> Dict[str, int]:
-    """統計各風險等級數量"""
-    stats = {"High": 0, "Medium": 0, "Low": 0, "Informational": 0}
-
-    for site in data.get('site', []):
-        for alert in site.get('alerts', []):
-            risk_desc = alert.get('riskdesc', 'Info').split(' ')[0]
-            if risk_desc in stats:
-                stats[risk_desc] += 1
-            else:
-                stats["Informational"] += 1
-
-    return stats
+# Nmap 摘要每個端口最多列出的 CVE 數量
+NMAP_MAX_CVES_PER_PORT = 10
 
 
 def _add_stats_table(doc: Document, stats: Dict[str, int]):
@@ -50,14 +41,22 @@ def _add_stats_table(doc: Document, stats: Dict[str, int]):
     fill_row(3, "低風險 (Low)", stats['Low'], RGBColor(200, 200, 0))
     fill_row(4, "資訊 (Info)", stats['Informational'], RGBColor(0, 0, 255))
 
+def _service_label(port: dict) -> str:
+    """服務名稱與版本 (如 "http nginx 1.18.0")"""
+    return " ".join(p for p in (port['service'], port.get('product', ''), port.get('version', '')) if p)
+
+
 def _add_nmap_summary(doc: Document, nmap_data: dict):
-    """[New] 添加基礎設施偵察摘要 (Nmap)"""
+    """添加基礎設施偵察摘要 (Nmap 正規化結果)"""
     doc.add_heading('1.1 基礎設施偵察摘要 (Nmap)', level=2)
     
     if not nmap_data or not nmap_data.get("hosts"):
         doc.add_paragraph("未發現 Nmap 掃描數據。")
         return
 
+    if not nmap_data.get("complete", True):
+        doc.add_paragraph("注意：Nmap 掃描結果不完整 (掃描可能中斷)，以下僅列出已完成的主機。")
+
     # 1. 主機資訊表
     doc.add_paragraph("主機與作業系統資訊：")
     table = doc.add_table(rows=1, cols=3)
@@ -70,7 +69,8 @@ def _add_nmap_summary(doc: Document, nmap_data: dict):
         row = table.add_row().cells
         row[0].text = host["ip"]
         row[1].text = host["hostname"] or "N/A"
-        row[2].text = host["os"]
+        # 只列出最可能的 OS 推測
+        row[2].text = host["os"][0] if host["os"] else "N/A"
 
     doc.add_paragraph("")
 
@@ -81,34 +81,32 @@ def _add_nmap_summary(doc: Document, nmap_data: dict):
     port_table = doc.add_table(rows=1, cols=3)
     port_table.style = 'Table Grid'
     phdr = port_table.rows[0].cells
-    phdr[0].text, phdr[1].text, phdr[2].text = '端口/協定', '服務版本', '潛在漏洞 / 腳本輸出'
+    phdr[0].text, phdr[1].text, phdr[2].text = '主機 端口/協定', '服務版本', '潛在漏洞 (CVE)'
     for cell in phdr: set_table_header_style(cell)
 
     has_vulns = False
     for host in nmap_data["hosts"]:
         for port in host["ports"]:
             row = port_table.add_row().cells
-            row[0].text = f"{port['id']}/{port['protocol']}"
-            row[1].text = port['service']
-            
-            # 處理腳本輸出 (CVE)
-            script_text = ""
-            for script in port['scripts']:
-                # 簡單清理輸出，避免太長
-                output = script['output'].strip()
-                if len(output) > 500: output = output[:500] + "..."
-                script_text += f"[{script['id']}]\n{output}\n"
+            row[0].text = f"{host['ip']} {port['port']}/{port['protocol']}"
+            row[1].text = _service_label(port)
+
+            # CVE 已依 CVSS 由高至低排序，避免表格過長只列出前幾筆
+            cves = port['cves']
+            lines = [
+                f"{cve['id']} (CVSS {cve['cvss']:.1f}){' [EXPLOIT]' if cve['is_exploit'] else ''}"
+                for cve in cves[:NMAP_MAX_CVES_PER_PORT]
+            ]
+            if len(cves) > NMAP_MAX_CVES_PER_PORT:
+                lines.append(f"... 另有 {len(cves) - NMAP_MAX_CVES_PER_PORT} 筆")
+            if cves:
                 has_vulns = True
-            
-            if not script_text:
-                script_text = "無檢測到明顯漏洞"
-            
-            # 這裡可以使用 render_markdown 稍微美化輸出
-            row[2].text = script_text
+
+            row[2].text = "\n".join(lines) if lines else "無檢測到明顯漏洞"
 
     if has_vulns:
         p = doc.add_paragraph()
-        run = p.add_run("警告：偵測到潛在的 CVE 漏洞，請參閱上表腳本輸出。")
+        run = p.add_run("警告：偵測到潛在的 CVE 漏洞，請參閱上表。")
         run.font.color.rgb = RGBColor(255, 0, 0)
         run.bold = True
 
@@ -116,7 +114,7 @@ def _add_nmap_summary(doc: Document, nmap_data: dict):
 
 def add_summary_section(
     doc: Document,
-    data: dict,
+    findings: ScanFindings,
     base_dir: str,
     ai_data: Optional[dict] = None,
     nmap_data: Optional[dict] = None
@@ -126,9 +124,10 @@ def add_summary_section(
 
     Args:
         doc: Word 文檔物件
-        data: ZAP 報告數據
+        findings: 弱點模型
         base_dir: 基礎目錄
         ai_data: AI 分析數據 (可選)
+        nmap_data: Nmap 正規化結果 (可選)
     """
     doc.add_heading('1. 掃描結果摘要', level=1)
 
@@ -138,27 +137,37 @@ def add_summary_section(
         
     doc.add_heading('1.2 應用程式弱點摘要 (ZAP)', level=2)
     # 統計風險
-    stats = _count_risks(data)
-    total_vulns = sum(stats.values())
+    stats = findings.risk_counts
+    total_vulns = findings.total
 
     doc.add_paragraph(f"本次掃描共發現 {total_vulns} 個潛在弱點。風險分佈如下：")
 
-    # 圓餅圖
-    chart_path = os.path.join(base_dir, "risk_chart.png")
-    if generate_risk_chart(stats, chart_path):
+    # 圖表 (於記憶體中批次繪製，不寫入共用 Volume)
+    charts = render_charts({
+        "risk_pie": risk_pie_payload(stats),
+        "site_bars": site_bars_payload(findings.site_risk_counts),
+        "confidence_heatmap": confidence_heatmap_payload(findings.confidence_matrix),
+    })
+
+    def add_chart(kind: str, width: float):
+        if kind not in charts:
+            return
         try:
-            doc.add_picture(chart_path, width=Inches(4.0))
+            doc.add_picture(io.BytesIO(charts[kind]), width=Inches(width))
         except Exception:
             doc.add_paragraph("(圖表載入失敗)")
 
-        # 清理暫存圖片
-        if os.path.exists(chart_path):
-            os.remove(chart_path)
+    # 圓餅圖
+    add_chart("risk_pie", 4.0)
 
     # 統計表格
     _add_stats_table(doc, stats)
     doc.add_paragraph("")
 
+    # 各網站分佈與可信度熱度圖
+    add_chart("site_bars", 6.0)
+    add_chart("confidence_heatmap", 5.0)
+
     # 高風險警告
     if stats['High'] > 0:
         p = doc.add_paragraph()
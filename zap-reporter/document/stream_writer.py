@@ -0,0 +1,186 @@
+"""
+串流 DOCX 寫入器
+以預先建立的範本套件 (樣式、編號、主題等) 為基礎，將各區塊產生的內容逐段序列化並
+直接寫入 zip 中的 word/document.xml，已寫出的元素立即自暫存文件移除，
+使記憶體用量不隨弱點數量成長。
+
+用法:
+    scratch = Document(io.BytesIO(template))
+    with StreamingDocxWriter(output_path, template) as writer:
+        add_cover_page(scratch, ...)
+        writer.flush(scratch)
+"""
+import os
+import io
+import re
+import zipfile
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+from docx.oxml.ns import qn
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+CONTENT_TYPES = '[Content_Types].xml'
+
+# 需改寫的關聯屬性 (圖片、超連結等)
+_REL_ATTRIBUTES = (qn('r:embed'), qn('r:id'), qn('r:link'))
+
+_NS_DECLARATION = re.compile(rb' xmlns:\w+="[^"]*"')
+
+# 圖片預設的 Content Type (範本未宣告時補上，讓 [Content_Types].xml 可最先寫入)
+_IMAGE_CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp',
+    'tiff': 'image/tiff',
+}
+
+
+class StreamingDocxWriter:
+    """逐段寫入 word/document.xml 的 DOCX 寫入器"""
+
+    def __init__(self, output_path: str, template: bytes):
+        """
+        Args:
+            output_path: 輸出 DOCX 路徑 (寫入完成後才以改名方式產生)
+            template: 範本 DOCX 的內容 (body 只含 sectPr)
+        """
+        self.output_path = output_path
+        self._tmp_path = f"{output_path}.tmp"
+        self._media: List[Tuple[str, bytes]] = []
+        self._rels: List[Tuple[str, str, str, bool]] = []
+        self._relocated: Dict[str, str] = {}
+        self._next_rel = 1
+        self._next_docpr = 1
+        self.flushed_blocks = 0
+
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        try:
+            with zipfile.ZipFile(io.BytesIO(template)) as src:
+                document_xml = src.read(DOCUMENT_PART)
+                self._rels_xml = src.read(DOCUMENT_RELS)
+                self._zip.writestr(CONTENT_TYPES, self._content_types(src.read(CONTENT_TYPES)))
+                for item in src.infolist():
+                    if item.filename not in (DOCUMENT_PART, DOCUMENT_RELS, CONTENT_TYPES):
+                        self._zip.writestr(item, src.read(item.filename))
+
+            body_start = document_xml.index(b'<w:body>') + len(b'<w:body>')
+            self._suffix = document_xml[document_xml.rindex(b'<w:sectPr'):]
+            self._stream = self._zip.open(DOCUMENT_PART, 'w', force_zip64=True)
+            self._stream.write(document_xml[:body_start])
+            # 根元素已宣告的命名空間，寫出片段時不需重複宣告
+            self._root_ns = set(_NS_DECLARATION.findall(document_xml[:body_start]))
+        except Exception:
+            self._zip.close()
+            os.remove(self._tmp_path)
+            raise
+
+    @staticmethod
+    def _content_types(xml: bytes) -> bytes:
+        """補上範本未宣告的圖片 Content Type"""
+        defaults = ''.join(
+            f'<Default Extension="{ext}" ContentType="{ctype}"/>'
+            for ext, ctype in _IMAGE_CONTENT_TYPES.items()
+            if f'Extension="{ext}"'.encode() not in xml
+        )
+        head_end = xml.index(b'>', xml.index(b'<Types')) + 1
+        return xml[:head_end] + defaults.encode() + xml[head_end:]
+
+    def _relocate_rel(self, part, r_id: str) -> str:
+        """將暫存文件中的關聯 (圖片 / 外部連結) 搬到輸出套件，回傳新的關聯 ID"""
+        rel = part.rels[r_id]
+        key = rel.target_ref if rel.is_external else str(rel.target_part.partname)
+        if key in self._relocated:
+            return self._relocated[key]
+
+        new_id = f"rIdS{self._next_rel}"
+        self._next_rel += 1
+        if rel.is_external:
+            self._rels.append((new_id, rel.reltype, rel.target_ref, True))
+        else:
+            target = rel.target_part
+            name = f"media/{new_id}.{target.partname.ext}"
+            self._media.append((f"word/{name}", target.blob))
+            self._rels.append((new_id, rel.reltype, name, False))
+        self._relocated[key] = new_id
+        return new_id
+
+    def _prepare(self, element, part):
+        """改寫關聯 ID 與圖片 docPr ID (避免與先前寫出的內容重複)"""
+        for node in element.iter():
+            for attr in _REL_ATTRIBUTES:
+                r_id = node.get(attr)
+                if r_id:
+                    node.set(attr, self._relocate_rel(part, r_id))
+            if node.tag == qn('wp:docPr'):
+                node.set('id', str(self._next_docpr))
+                self._next_docpr += 1
+
+    def _serialize(self, element) -> bytes:
+        """序列化元素，並移除開頭標籤中與根元素重複的命名空間宣告"""
+        xml = etree.tostring(element, encoding='UTF-8')
+        tag_end = xml.index(b'>')
+        head = _NS_DECLARATION.sub(
+            lambda m: b'' if m.group() in self._root_ns else m.group(), xml[:tag_end]
+        )
+        return head + xml[tag_end:]
+
+    def flush(self, scratch):
+        """
+        將暫存文件 body 中目前的內容寫出並移除
+
+        Args:
+            scratch: 由同一範本建立的 python-docx Document
+        """
+        body = scratch.element.body
+        sect_pr = qn('w:sectPr')
+        for element in list(body):
+            if element.tag == sect_pr:
+                continue
+            self._prepare(element, scratch.part)
+            self._stream.write(self._serialize(element))
+            body.remove(element)
+        self.flushed_blocks += 1
+
+    def close(self):
+        """寫入文件結尾、圖片與關聯檔，完成後改名為輸出路徑"""
+        self._stream.write(self._suffix)
+        self._stream.close()
+
+        for name, blob in self._media:
+            self._zip.writestr(name, blob)
+
+        rels = []
+        for r_id, reltype, target, external in self._rels:
+            mode = ' TargetMode="External"' if external else ''
+            rels.append(f'<Relationship Id="{r_id}" Type="{reltype}" Target={quoteattr(target)}{mode}/>')
+        rels = ''.join(rels).encode()
+        end = self._rels_xml.rindex(b'</Relationships>')
+        self._zip.writestr(DOCUMENT_RELS, self._rels_xml[:end] + rels + self._rels_xml[end:])
+
+        self._zip.close()
+        os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        """放棄寫入並刪除暫存檔"""
+        try:
+            self._stream.close()
+        except Exception:
+            pass
+        self._zip.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,76 @@
+"""
+報告範本模組
+建立套用預設樣式的空白文件；範本套件 (DOCX 位元組) 只建立一次，
+供串流寫入器與平行渲染的工作程序重複使用，確保各處的樣式定義一致。
+"""
+import io
+from functools import lru_cache
+from typing import Callable
+
+from docx import Document
+from docx.shared import Pt
+from docx.oxml.ns import qn
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+
+# 範本樣式或區塊版面變更時遞增，使已快取的 OOXML 片段失效
+TEMPLATE_VERSION = 1
+
+
+def new_document() -> Document:
+    """初始化 Word 文檔並設定預設樣式"""
+    doc = Document()
+
+    # 設定預設字型
+    style = doc.styles['Normal']
+    style.font.name = 'Microsoft JhengHei'
+    style.font.size = Pt(11)
+    style.element.rPr.rFonts.set(qn('w:eastAsia'), 'Microsoft JhengHei')
+
+    return doc
+
+
+@lru_cache(maxsize=1)
+def template_package() -> bytes:
+    """預先建立的範本套件 (已套用預設樣式的空白文件)"""
+    buffer = io.BytesIO()
+    new_document().save(buffer)
+    return buffer.getvalue()
+
+
+def document_from_template() -> Document:
+    """由範本套件建立新的空白文件"""
+    return Document(io.BytesIO(template_package()))
+
+
+
+def customized_template(customize: Callable[[Document], None]) -> bytes:
+    """
+    以範本建立文件並套用自訂內容 (如文件摘要資訊、附加的 XML 部件) 後的範本套件
+    (供串流寫入器使用：套件中 document.xml 以外的部件於開頭即寫入)
+
+    Args:
+        customize: 接收新文件並加以修改的函式
+
+    Returns:
+        bytes: 範本 DOCX 內容
+    """
+    doc = document_from_template()
+    customize(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def attach_xml_part(doc: Document, name: str, xml: bytes):
+    """
+    於文件套件附加自訂 XML 部件 (/customXml/<name>，Word 開啟並另存時會保留)
+
+    Args:
+        doc: Word 文檔物件
+        name: 部件檔名 (如 ai_match.xml)
+        xml: XML 內容
+    """
+    part = Part(PackURI(f"/customXml/{name}"), 'application/xml', xml, doc.part.package)
+    doc.part.package.relate_to(part, RT.CUSTOM_XML)
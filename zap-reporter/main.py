@@ -2,43 +2,239 @@
 ZAP Reporter - 模組化主程式
 """
 import os
+import time
+import argparse
 from datetime import datetime
+from typing import List, Optional, Sequence
 
-# [New] 引入 NMAP_REPORT_FILENAME
-from config.settings import DATA_DIR, ZAP_REPORT_FILENAME, AI_INSIGHTS_FILENAME, NMAP_REPORT_FILENAME
-from report_builder import generate_word_report
-# [New] 引入 Nmap 解析器
-from services.nmap_parser import NmapParser
+from config.settings import DATA_DIR, ZAP_REPORT_FILENAME, AI_INSIGHTS_FILENAME, REPORT_FORMATS, BATCH_WORKERS
+# Nmap 正規化結果 (Sidecar)
+from services.nmap_sidecar import load_nmap_sidecar
+from services.findings import ScanFindings, build_findings
+from services.json_loader import load_json
+
+# Word 報告以外的輸出格式由輕量寫入器產生 (不載入 python-docx / matplotlib)
+SUPPORTED_FORMATS = ("docx", "html", "md", "json", "sarif")
+
+
+def parse_formats(value: str) -> List[str]:
+    """
+    解析輸出格式列表
+
+    Args:
+        value: 逗號分隔的格式 (如 "docx,sarif")
+
+    Returns:
+        list: 去重後的格式 (保持順序)
+
+    Raises:
+        ValueError: 含不支援的格式
+    """
+    formats = list(dict.fromkeys(f.strip().lower() for f in value.split(",") if f.strip()))
+    unknown = [f for f in formats if f not in SUPPORTED_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"不支援的輸出格式: {', '.join(unknown) or value}，可用: {', '.join(SUPPORTED_FORMATS)}")
+    return formats
+
+
+def output_base_path(directory: str, prefix: str) -> str:
+    """
+    報告輸出路徑 (不含副檔名)：時間戳記精確到秒，同一秒已有同名報告時加上序號
+
+    Args:
+        directory: 輸出目錄
+        prefix: 檔名前綴 (如 Scan_Report)
+
+    Returns:
+        str: 如 <directory>/Scan_Report_240101120000 或 ..._240101120000_2
+    """
+    name = f'{prefix}_{datetime.now().strftime("%y%m%d%H%M%S")}'
+    try:
+        existing = {entry.split('.', 1)[0] for entry in os.listdir(directory)}
+    except OSError:
+        existing = set()
+
+    candidate, index = name, 1
+    while candidate in existing:
+        index += 1
+        candidate = f"{name}_{index}"
+    return os.path.join(directory, candidate)
+
+
+def _write_light_formats(formats: Sequence[str], findings: ScanFindings, ai_data: Optional[dict],
+                         nmap_data, output_base: str, targets: Optional[List[dict]] = None) -> List[str]:
+    """以輕量寫入器產生 HTML / Markdown / JSON / SARIF 報告"""
+    from writers import WRITERS, build_report_model, write_report
+
+    started = time.perf_counter()
+    model = build_report_model(findings, nmap_data, ai_data, targets=targets)
+    outputs = []
+    for fmt in formats:
+        path = output_base + WRITERS[fmt][0]
+        try:
+            write_report(fmt, model, path)
+        except OSError as e:
+            print(f"寫入 {fmt} 報告失敗: {path} - {e}")
+            continue
+        outputs.append(path)
+        print(f"{fmt} 報告已儲存至: {path}")
+    print(f"輕量格式輸出耗時 {time.perf_counter() - started:.3f}s")
+    return outputs
+
+
+def _write_outputs(formats: Sequence[str], findings: ScanFindings, base_dir: str, output_base: str,
+                   ai_data: Optional[dict], nmap_data, targets: Optional[List[dict]] = None) -> Optional[str]:
+    """
+    依輸出格式寫出報告 (所有格式共用同一個弱點模型)
+
+    Returns:
+        str: 第一個輸出格式的報告路徑，任一格式失敗時回傳 None
+    """
+    outputs = {}
+    light_formats = [f for f in formats if f != "docx"]
+    if light_formats:
+        for path in _write_light_formats(light_formats, findings, ai_data, nmap_data, output_base, targets):
+            outputs[os.path.splitext(path)[1].lstrip('.')] = path
+
+    if "docx" in formats:
+        from report_builder import generate_word_report
+
+        word_file = output_base + ".docx"
+        # 生成報告 (傳入 nmap_data)
+        if generate_word_report(
+            json_path=os.path.join(base_dir, ZAP_REPORT_FILENAME),
+            output_path=word_file,
+            nmap_data=nmap_data,
+            findings=findings,
+            ai_data=ai_data,
+            targets=targets
+        ):
+            outputs["docx"] = word_file
+
+    if len(outputs) < len(formats):
+        return None
+    return outputs[formats[0]]
+
+
+def run_report(data_dir: str = DATA_DIR, formats: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    依資料目錄中的輸入檔案生成報告
+
+    Args:
+        data_dir: 資料目錄 (含 ZAP-Report.json 等輸入檔案)
+        formats: 輸出格式 (預設依 REPORT_FORMATS 設定)
+
+    Returns:
+        str: 第一個輸出格式的報告路徑，失敗時回傳 None
+    """
+    formats = list(formats) if formats else parse_formats(REPORT_FORMATS)
 
-def main():
-    """主程式入口"""
     # 檔案路徑
-    json_file = os.path.join(DATA_DIR, ZAP_REPORT_FILENAME)
-    ai_file = os.path.join(DATA_DIR, AI_INSIGHTS_FILENAME)
-    nmap_file = os.path.join(DATA_DIR, NMAP_REPORT_FILENAME) # [New]
-    
-    word_file = os.path.join(DATA_DIR, f'Scan_Report_{datetime.now().strftime("%y%m%d%H%M")}.docx')
+    json_file = os.path.join(data_dir, ZAP_REPORT_FILENAME)
+    ai_file = os.path.join(data_dir, AI_INSIGHTS_FILENAME)
+
+    output_base = output_base_path(data_dir, "Scan_Report")
 
     # 檢查 ZAP 報告 (這是必要的)
     if not os.path.exists(json_file):
         print(f"找不到 ZAP 報告檔案: {json_file}")
-        return 1
-
-    # [New] 解析 Nmap 報告 (如果是存在的)
-    nmap_data = None
-    if os.path.exists(nmap_file):
-        print(f"發現 Nmap 報告，正在解析...")
-        nmap_data = NmapParser().parse(nmap_file)
-
-    # 生成報告 (傳入 nmap_data)
-    success = generate_word_report(
-        json_path=json_file,
-        output_path=word_file,
-        ai_insights_path=ai_file,
-        nmap_data=nmap_data # [New]
+        return None
+
+    # 讀取 Nmap 正規化結果 (如果是存在的；Sidecar 缺少或過期時才解析 XML)
+    nmap_data = load_nmap_sidecar(data_dir)
+    if nmap_data:
+        print(f"已載入 Nmap 結果: {len(nmap_data['hosts'])} 台主機")
+
+    # 載入 ZAP 報告並正規化 (各輸出格式共用同一個弱點模型)
+    data = load_json(json_file)
+    if data is None:
+        return None
+    findings = build_findings(data)
+    del data
+
+    # 載入 AI 分析 (可選)
+    ai_data = load_json(ai_file) if os.path.exists(ai_file) else None
+    if ai_data:
+        print("成功載入 AI 分析數據！")
+
+    return _write_outputs(formats, findings, data_dir, output_base, ai_data, nmap_data)
+
+
+def run_portfolio(directories: Sequence[str], output_dir: str = DATA_DIR,
+                  formats: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    合併多個掃描結果目錄生成單一報告 (Portfolio)
+
+    各目錄的 ZAP 報告同時解析後合併去重，翻譯與圖表只針對合併結果進行一次，
+    報告附上各目標的摘要表。
+
+    Args:
+        directories: 掃描結果目錄 (各含 ZAP-Report.json，可選 ai_insights.json / Nmap 結果)
+        output_dir: 報告輸出目錄
+        formats: 輸出格式 (預設依 REPORT_FORMATS 設定)
+
+    Returns:
+        str: 第一個輸出格式的報告路徑，失敗時回傳 None
+    """
+    from services.portfolio import load_scans, merge_scans, merge_ai_insights, merge_nmap
+
+    formats = list(formats) if formats else parse_formats(REPORT_FORMATS)
+
+    started = time.perf_counter()
+    scans = load_scans(directories)
+    if not scans:
+        print("沒有可用的掃描結果目錄")
+        return None
+    findings, targets = merge_scans(scans)
+    print(
+        f"已合併 {len(scans)} 個目標: {findings.total} 個弱點，"
+        f"去除 {sum(t['duplicates'] for t in targets)} 筆重複實例 ({time.perf_counter() - started:.2f}s)"
+    )
+
+    scanned = [directory for directory, _ in scans]
+    ai_data = merge_ai_insights(scanned)
+    nmap_data = merge_nmap(scanned)
+
+    output_base = output_base_path(output_dir, "Portfolio_Report")
+    return _write_outputs(formats, findings, output_dir, output_base, ai_data, nmap_data, targets)
+
+
+def main():
+    """主程式入口"""
+    parser = argparse.ArgumentParser(description="ZAP Reporter")
+    parser.add_argument("--daemon", action="store_true", help="常駐模式：預載依賴並從佇列目錄接收報告任務")
+    parser.add_argument(
+        "--portfolio", nargs="+", metavar="DIR",
+        help="多目標合併報告：合併多個掃描結果目錄 (各含 ZAP-Report.json) 為單一報告"
+    )
+    parser.add_argument(
+        "--batch", nargs="+", metavar="ROOT",
+        help="批次模式：於根目錄下尋找含 ZAP-Report.json 的任務目錄，以程序池分別生成報告"
     )
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help=f"批次模式的工作程序數 (預設 {BATCH_WORKERS})")
+    parser.add_argument("--output-dir", default=DATA_DIR, help=f"合併報告 / 批次摘要輸出目錄 (預設 {DATA_DIR})")
+    parser.add_argument(
+        "--format", default=REPORT_FORMATS,
+        help=f"輸出格式，可用逗號分隔多個 ({', '.join(SUPPORTED_FORMATS)})；預設 {REPORT_FORMATS}"
+    )
+    args = parser.parse_args()
+
+    if args.daemon:
+        from daemon import serve
+        return serve()
+
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
 
-    return 0 if success else 1
+    if args.batch:
+        from batch import run_batch
+        summary = run_batch(args.batch, formats, args.output_dir, args.workers)
+        return 0 if summary["jobs"] and not summary["failed"] else 1
+    if args.portfolio:
+        return 0 if run_portfolio(args.portfolio, args.output_dir, formats) else 1
+    return 0 if run_report(formats=formats) else 1
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
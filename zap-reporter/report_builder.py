@@ -4,38 +4,83 @@ ZAP 報告建構器
 """
 import os
 import json
-from typing import Optional
+from typing import List, Optional
+from xml.sax.saxutils import quoteattr
 
 from docx import Document
-from docx.shared import Pt
-from docx.oxml.ns import qn
 
-from config.settings import DATA_DIR, DEFAULT_COMPANY_NAME
-from services.translator import save_translation_cache
-from document.sections import add_cover_page, add_summary_section, add_details_section
-
-
-def _load_json(file_path: str) -> Optional[dict]:
-    """載入 JSON 檔案"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"讀取 JSON 失敗: {file_path} - {e}")
+from config.settings import DATA_DIR, DEFAULT_COMPANY_NAME, REPORT_WRITER
+from services.translator import save_translation_cache, prefetch_translations
+from services.findings import ScanFindings, build_findings
+from services.json_loader import load_json
+from services.ai_matching import AISolutionIndex, build_ai_index, summarize_matches
+from document.charts import get_chart_metrics
+from document.stream_writer import StreamingDocxWriter
+from document.template import new_document, customized_template, document_from_template, attach_xml_part
+from document.sections import (
+    add_cover_page, add_portfolio_section, add_summary_section, add_details_section, collect_detail_texts,
+    match_ai_solutions
+)
+
+
+def _build_document(doc: Document, findings: ScanFindings, base_dir: str, company_name: str,
+                    ai_data: Optional[dict], nmap_data: Optional[dict], on_block=None,
+                    targets: Optional[List[dict]] = None, ai_index: Optional[AISolutionIndex] = None):
+    """依序產生各區塊 (on_block 於每個區塊完成後呼叫)"""
+    add_cover_page(doc, findings, base_dir, company_name, targets)
+    if on_block:
+        on_block()
+    if targets:
+        add_portfolio_section(doc, targets)
+        if on_block:
+            on_block()
+    add_summary_section(doc, findings, base_dir, ai_data, nmap_data)
+    if on_block:
+        on_block()
+    add_details_section(doc, findings, ai_data, on_block=on_block, ai_index=ai_index)
+
+
+def _write_streaming(output_path: str, findings: ScanFindings, base_dir: str, company_name: str,
+                     ai_data: Optional[dict], nmap_data: Optional[dict], targets: Optional[List[dict]] = None,
+                     ai_index: Optional[AISolutionIndex] = None, metadata: Optional[dict] = None):
+    """以串流寫入器產生報告 (每個區塊完成後立即寫出並自暫存文件移除)"""
+    scratch = document_from_template()
+    # 中繼資料 (文件摘要資訊與自訂 XML 部件) 隨範本套件於開頭寫入
+    template = customized_template(lambda doc: _apply_metadata(doc, metadata))
+    with StreamingDocxWriter(output_path, template) as writer:
+        _build_document(scratch, findings, base_dir, company_name, ai_data, nmap_data,
+                        on_block=lambda: writer.flush(scratch), targets=targets, ai_index=ai_index)
+        writer.flush(scratch)
+
+
+def _ai_match_metadata(findings: ScanFindings, ai_index: AISolutionIndex) -> Optional[dict]:
+    """各弱點的 AI 建議對應方式與分數 (無 AI 建議時回傳 None)"""
+    if not len(ai_index):
         return None
+    summary = summarize_matches(match_ai_solutions(findings, ai_index), ai_index.threshold)
+    print("AI 建議對應: " + "，".join(f"{method} {count}" for method, count in summary['methods'].items()))
+    return summary
 
 
-def _init_document() -> Document:
-    """初始化 Word 文檔並設定預設樣式"""
-    doc = Document()
-
-    # 設定預設字型
-    style = doc.styles['Normal']
-    style.font.name = 'Microsoft JhengHei'
-    style.font.size = Pt(11)
-    style.element.rPr.rFonts.set(qn('w:eastAsia'), 'Microsoft JhengHei')
-
-    return doc
+def _apply_metadata(doc: Document, metadata: Optional[dict]):
+    """
+    寫入報告中繼資料:
+    文件摘要資訊的備註欄位記錄對應方式統計 (core properties 上限 255 字元)，
+    各弱點的明細寫入 /customXml/ai_match.xml
+    """
+    if not metadata:
+        return
+    doc.core_properties.comments = "ai_match=" + json.dumps(
+        {"threshold": metadata['threshold'], "methods": metadata['methods']}, separators=(',', ':')
+    )[:246]
+    rows = "".join(
+        f"<alert name={quoteattr(name)} method={quoteattr(method)} score=\"{score}\" key={quoteattr(key)}/>"
+        for name, method, score, key in metadata['alerts']
+    )
+    attach_xml_part(doc, "ai_match.xml", (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<aiMatch xmlns="urn:zap-reporter:ai-match" threshold="{metadata["threshold"]}">{rows}</aiMatch>'
+    ).encode('utf-8'))
 
 
 def generate_word_report(
@@ -43,7 +88,10 @@ def generate_word_report(
     output_path: str,
     ai_insights_path: Optional[str] = None,
     company_name: str = DEFAULT_COMPANY_NAME,
-    nmap_data: Optional[dict] = None
+    nmap_data: Optional[dict] = None,
+    findings: Optional[ScanFindings] = None,
+    ai_data: Optional[dict] = None,
+    targets: Optional[List[dict]] = None
 ) -> bool:
     """
     生成 Word 格式的弱點掃描報告
@@ -53,40 +101,62 @@ def generate_word_report(
         output_path: Word 輸出路徑
         ai_insights_path: AI 分析 JSON 路徑 (可選)
         company_name: 公司名稱
+        nmap_data: Nmap 正規化結果 (可選)
+        findings: 已建立的弱點模型 (可選，與其他輸出格式共用時傳入，省去重新載入)
+        ai_data: 已載入的 AI 分析數據 (可選，提供時不讀取 ai_insights_path)
+        targets: 多目標合併報告的各目標摘要 (可選)
 
     Returns:
         bool: 是否成功生成
     """
-    # 載入 ZAP 報告
-    data = _load_json(json_path)
-    if data is None:
-        return False
+    # 載入 ZAP 報告並正規化 (各區塊共用同一個弱點模型)
+    if findings is None:
+        data = load_json(json_path)
+        if data is None:
+            return False
+        findings = build_findings(data)
 
     # 載入 AI 分析 (可選)
-    ai_data = None
-    if ai_insights_path and os.path.exists(ai_insights_path):
-        ai_data = _load_json(ai_insights_path)
+    if ai_data is None and ai_insights_path and os.path.exists(ai_insights_path):
+        ai_data = load_json(ai_insights_path)
         if ai_data:
             print("成功載入 AI 分析數據！")
 
-    # 初始化文檔
-    doc = _init_document()
-    base_dir = os.path.dirname(json_path)
-
-    # 生成各區塊
-    add_cover_page(doc, data, base_dir, company_name)
-    add_summary_section(doc, data, base_dir, ai_data, nmap_data)
-    add_details_section(doc, data, ai_data)
+    # AI 建議查找索引只建立一次；各弱點的對應方式與分數記錄於文件摘要資訊
+    ai_index = build_ai_index(ai_data, findings=findings)
+    metadata = _ai_match_metadata(findings, ai_index)
 
-    # 儲存文檔
-    try:
-        doc.save(output_path)
-        print(f"報告生成完畢！已儲存至: {output_path}")
+    # 預先批次翻譯詳情頁所需的全部文字，渲染時直接讀取快取
+    translated = prefetch_translations(collect_detail_texts(findings, ai_data, ai_index))
+    if translated:
+        print(f"已批次翻譯 {translated} 段文字")
 
-        # 儲存翻譯快取
-        save_translation_cache()
+    base_dir = os.path.dirname(json_path)
 
-        return True
+    try:
+        if REPORT_WRITER == "stream":
+            # 串流寫入: 各區塊邊產生邊寫出，生成與儲存交錯進行
+            _write_streaming(output_path, findings, base_dir, company_name, ai_data, nmap_data, targets,
+                             ai_index, metadata)
+        else:
+            # 初始化文檔並生成各區塊
+            doc = new_document()
+            _apply_metadata(doc, metadata)
+            _build_document(doc, findings, base_dir, company_name, ai_data, nmap_data,
+                            targets=targets, ai_index=ai_index)
+            doc.save(output_path)
     except Exception as e:
         print(f"儲存失敗: {e}")
         return False
+
+    metrics = get_chart_metrics()
+    print(
+        f"圖表: 載入 {metrics['import_seconds']:.2f}s，繪製 {metrics['render_seconds']:.2f}s "
+        f"({metrics['rendered']} 張，快取命中 {metrics['cache_hits']} 張)"
+    )
+    print(f"報告生成完畢！已儲存至: {output_path}")
+
+    # 儲存翻譯快取
+    save_translation_cache()
+
+    return True
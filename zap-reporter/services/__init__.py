@@ -1,3 +1,10 @@
 # ZAP Reporter Services
-from .translator import TranslationService
 from .formatter import clean_html, parse_ai_response
+
+
+def __getattr__(name):
+    # 延遲載入翻譯服務 (避免執行 python -m services.translation_cache 時重複載入模組)
+    if name == "TranslationService":
+        from .translator import TranslationService
+        return TranslationService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
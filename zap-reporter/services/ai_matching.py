@@ -0,0 +1,281 @@
+"""
+AI 建議對應服務
+AI 回傳的 solutions 鍵值常與 ZAP 弱點名稱略有出入 (大小寫、標點、補充說明、中英混用、附上 pluginId)，
+逐字比對會讓許多弱點退回 ZAP 原文。此模組預先建立查找索引，依序嘗試:
+
+    exact    原始鍵值 (英文名稱或中文名稱)
+    name     正規化名稱 (小寫、去除標點與多餘空白)
+    plugin   鍵值中標示的 pluginId / alertRef (如 "[10020] ...", "pluginId 10038")
+    fuzzy    字元三元組 (trigram) 的 Dice 相似度，只計算與查詢共用三元組的候選 (倒排索引)，
+             分數低於門檻 (AI_MATCH_THRESHOLD) 或未領先次佳候選 AI_MATCH_MARGIN 視為無對應
+
+同系列的不同弱點名稱相近 (如 Cross Site Scripting (Reflected) / (Persistent)、SQL Injection - MySQL / Oracle)，
+模糊比對因此排除: 已被報告中其他弱點以前三種方式對應的鍵值 (建立索引時傳入 findings)，
+以及鍵值標示的 pluginId / alertRef 與弱點不符的候選。
+
+每筆弱點的對應方式與分數記錄於報告 (JSON 的 ai_match、Word 的文件摘要資訊)。
+"""
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from config.settings import AI_MATCH_THRESHOLD, AI_MATCH_MARGIN
+from config.alert_catalog import catalog_text
+from config.translations import translate_title
+
+# 鍵值中標示 pluginId / alertRef 的格式: 純數字、[10020]、(10020-1)、pluginId: 10020
+# 括號內只接受像 ZAP 編號的數字 (四位數以上或含變體編號)，避免 "(2)" 之類的序號被當成 pluginId
+_PLUGIN_PATTERN = re.compile(
+    r'^\s*(\d+(?:-\d+)?)\s*$|[\[(]\s*(\d{4,}(?:-\d+)?|\d+-\d+)\s*[\])]'
+    r'|plugin\s*(?:id)?\s*[:#=]?\s*(\d+(?:-\d+)?)',
+    re.IGNORECASE
+)
+# 保留英數字與 CJK 文字，其餘視為分隔
+_SEPARATOR = re.compile(r'[^0-9a-z\u3400-\u9fff]+')
+
+
+def normalize_name(text: str) -> str:
+    """
+    正規化弱點名稱 (全半形統一、小寫、移除 pluginId 標記與標點)
+
+    Args:
+        text: 原始名稱
+
+    Returns:
+        str: 以單一空白分隔的正規化名稱
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = _PLUGIN_PATTERN.sub(' ', text)
+    return _SEPARATOR.sub(' ', text).strip()
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def alert_title(alert) -> str:
+    """弱點中文名稱 (優先使用翻譯目錄，其次為名稱對照表)"""
+    return catalog_text(alert.catalog, 'title') or translate_title(alert.name)
+
+
+def _plugin_keys(key: str) -> List[str]:
+    keys = []
+    for match in _PLUGIN_PATTERN.finditer(unicodedata.normalize('NFKC', key)):
+        keys.append(next(g for g in match.groups() if g))
+    return keys
+
+
+class AIMatch:
+    """單一弱點對應到的 AI 建議"""
+    __slots__ = ('content', 'key', 'method', 'score')
+
+    def __init__(self, content: Optional[str], key: str, method: str, score: float):
+        self.content = content
+        self.key = key
+        self.method = method
+        self.score = score
+
+    def as_dict(self) -> dict:
+        return {"key": self.key, "method": self.method, "score": round(self.score, 3)}
+
+
+class AISolutionIndex:
+    """AI 建議的查找索引 (建立一次，所有弱點共用)"""
+
+    def __init__(self, solutions: Dict[str, str], threshold: float = AI_MATCH_THRESHOLD,
+                 margin: float = AI_MATCH_MARGIN):
+        """
+        Args:
+            solutions: AI 鍵值 -> 建議內容
+            threshold: 模糊比對的最低分數 (0 ~ 1)
+            margin: 模糊比對的最佳分數須領先次佳候選的差距
+        """
+        self.threshold = threshold
+        self.margin = margin
+        self._keys: List[str] = []
+        self._contents: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._names: Dict[str, int] = {}
+        self._plugins: Dict[str, int] = {}
+        self._key_plugins: List[FrozenSet[str]] = []
+        # 已被報告中某個弱點精確對應的鍵值 (不再作為其他弱點的模糊比對候選)
+        self._claimed: Set[int] = set()
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._cache: Dict[tuple, AIMatch] = {}
+
+        for key, content in solutions.items():
+            if not isinstance(key, str) or not content:
+                continue
+            idx = len(self._keys)
+            self._keys.append(key)
+            self._contents.append(content)
+            # 同一鍵值重複出現時以先出現者為準
+            self._exact.setdefault(key.strip(), idx)
+            plugins = _plugin_keys(key)
+            for plugin in plugins:
+                self._plugins.setdefault(plugin, idx)
+            self._key_plugins.append(frozenset(plugins))
+
+            name = normalize_name(key)
+            grams = _trigrams(name) if name else []
+            if name:
+                self._names.setdefault(name, idx)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _result(self, idx: int, method: str, score: float) -> AIMatch:
+        return AIMatch(self._contents[idx], self._keys[idx], method, score)
+
+    def _plugins_agree(self, idx: int, alert_plugins: FrozenSet[str]) -> bool:
+        """鍵值標示的 pluginId / alertRef 與弱點相符 (任一方未標示時視為相符)"""
+        key_plugins = self._key_plugins[idx]
+        return not (key_plugins and alert_plugins) or bool(key_plugins & alert_plugins)
+
+    def _eligible(self, idx: int, alert_plugins: FrozenSet[str]) -> bool:
+        """模糊比對候選: 未被其他弱點精確對應，且鍵值標示的 pluginId / alertRef 與弱點相符"""
+        return idx not in self._claimed and self._plugins_agree(idx, alert_plugins)
+
+    def _fuzzy(self, name: str, alert_plugins: FrozenSet[str]) -> Dict[int, float]:
+        """以倒排索引累計共用三元組數，回傳各候選的 Dice 分數"""
+        grams = _trigrams(name)
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for idx in self._postings.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+        return {
+            idx: 2.0 * shared / (len(grams) + self._gram_counts[idx])
+            for idx, shared in overlap.items()
+            if self._eligible(idx, alert_plugins)
+        }
+
+    def _strict(self, name: str, title: str, plugin_id: str, alert_ref: str) -> Optional[Tuple[int, str]]:
+        """精確、正規化名稱與 pluginId 對應，回傳 (索引, 方式)"""
+        candidates = [text for text in (name, title) if text]
+        for text in candidates:
+            idx = self._exact.get(text.strip())
+            if idx is not None:
+                return idx, "exact"
+        # 正規化名稱會去除 pluginId 標記，標記與弱點不符時 (同名的其他變體) 不採用
+        alert_plugins = frozenset(p for p in (plugin_id, alert_ref) if p)
+        for text in candidates:
+            idx = self._names.get(normalize_name(text))
+            if idx is not None and self._plugins_agree(idx, alert_plugins):
+                return idx, "name"
+        for plugin in (alert_ref, plugin_id):
+            idx = self._plugins.get(plugin) if plugin else None
+            if idx is not None:
+                return idx, "plugin"
+        return None
+
+    def claim_alerts(self, alerts: Iterable):
+        """
+        記錄報告中各弱點精確對應的鍵值，這些鍵值不再作為其他弱點的模糊比對候選
+
+        Args:
+            alerts: 弱點模型 (services.findings.Alert)
+        """
+        for alert in alerts:
+            strict = self._strict(alert.name, alert_title(alert), alert.plugin_id, alert.alert_ref)
+            if strict is not None:
+                self._claimed.add(strict[0])
+        self._cache.clear()
+
+    def match(self, name: str, title: str = '', plugin_id: str = '', alert_ref: str = '') -> AIMatch:
+        """
+        查找弱點對應的 AI 建議
+
+        Args:
+            name: 弱點英文名稱
+            title: 弱點中文名稱
+            plugin_id: ZAP pluginId
+            alert_ref: ZAP alertRef (含變體編號，如 10020-1)
+
+        Returns:
+            AIMatch: 對應結果 (無對應時 content 為 None、method 為 "none"，score 為最接近項目的分數)
+        """
+        cache_key = (name, title, plugin_id, alert_ref)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        strict = self._strict(name, title, plugin_id, alert_ref)
+        if strict is not None:
+            result = self._result(strict[0], strict[1], 1.0)
+        else:
+            alert_plugins = frozenset(p for p in (plugin_id, alert_ref) if p)
+            scores: Dict[int, float] = {}
+            for text in (name, title):
+                normalized = normalize_name(text) if text else ''
+                if normalized:
+                    for idx, score in self._fuzzy(normalized, alert_plugins).items():
+                        scores[idx] = max(score, scores.get(idx, 0.0))
+
+            ranked = sorted(scores.items(), key=lambda item: -item[1])[:2]
+            best, best_score = ranked[0] if ranked else (-1, 0.0)
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if best >= 0 and best_score >= self.threshold and best_score - runner_up >= self.margin:
+                result = self._result(best, "fuzzy", best_score)
+            else:
+                result = AIMatch(None, self._keys[best] if best >= 0 else '', "none", best_score)
+
+        self._cache[cache_key] = result
+        return result
+
+    def match_alert(self, alert, title: Optional[str] = None) -> AIMatch:
+        """查找弱點模型 (services.findings.Alert) 對應的 AI 建議"""
+        if title is None:
+            title = alert_title(alert)
+        return self.match(alert.name, title, alert.plugin_id, alert.alert_ref)
+
+
+def build_ai_index(ai_data: Optional[dict], threshold: float = AI_MATCH_THRESHOLD, findings=None) -> AISolutionIndex:
+    """
+    由 AI 分析數據建立查找索引
+
+    Args:
+        ai_data: AI 分析數據 (solutions 可為 dict 或 dict 列表)
+        threshold: 模糊比對的最低分數
+        findings: 報告的弱點模型 (services.findings.ScanFindings，可選)；
+                  提供時先記錄各弱點精確對應的鍵值，避免模糊比對把建議套用到同系列的其他弱點
+
+    Returns:
+        AISolutionIndex: 查找索引 (無 AI 數據時為空索引)
+    """
+    solutions: Dict[str, str] = {}
+    raw_solutions = (ai_data or {}).get('solutions') or {}
+
+    # 處理列表格式
+    for item in (raw_solutions if isinstance(raw_solutions, list) else [raw_solutions]):
+        if isinstance(item, dict):
+            for key, content in item.items():
+                solutions[key] = content
+
+    index = AISolutionIndex(solutions, threshold)
+    if findings is not None and len(index):
+        index.claim_alerts(findings.alerts)
+    return index
+
+
+def summarize_matches(matches: List[Tuple[str, AIMatch]], threshold: float = AI_MATCH_THRESHOLD) -> dict:
+    """
+    彙整各弱點的對應結果 (寫入報告中繼資料)
+
+    Args:
+        matches: [(弱點名稱, 對應結果)]
+        threshold: 使用的模糊比對門檻
+
+    Returns:
+        dict: {"threshold", "methods": {方式: 數量}, "alerts": [[名稱, 方式, 分數, AI 鍵值]]}
+    """
+    methods: Dict[str, int] = {}
+    alerts = []
+    for name, match in matches:
+        methods[match.method] = methods.get(match.method, 0) + 1
+        alerts.append([name, match.method, round(match.score, 3), match.key])
+    return {"threshold": threshold, "methods": methods, "alerts": alerts}
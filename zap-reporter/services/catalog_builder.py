@@ -0,0 +1,147 @@
+"""
+弱點翻譯目錄建置工具 (離線執行)
+從既有的 ZAP JSON 報告收集各掃描規則的名稱、描述與修復建議，
+翻譯目錄尚未收錄的規則後合併寫回 config/alert_catalog.json。
+
+用法:
+    python -m services.catalog_builder ZAP-Report.json [...] [-o 目錄路徑] [--backend google]
+"""
+import sys
+import json
+import argparse
+from typing import Dict, Iterable, List
+
+from config.settings import ALERT_CATALOG_FILE, TRANSLATION_TARGET
+from config.translations import TERM_MAPPING
+from services.formatter import clean_html
+from services.translation_engine import TranslationEngine, create_backend
+
+
+def _alert_key(alert: dict) -> str:
+    """目錄鍵值 (優先使用 alertRef，區分同一規則的不同變體)"""
+    return str(alert.get('alertRef') or alert.get('pluginid') or '')
+
+
+def collect_rules(report_paths: Iterable[str]) -> Dict[str, dict]:
+    """
+    從 ZAP 報告收集掃描規則的英文原文
+
+    Args:
+        report_paths: ZAP JSON 報告路徑
+
+    Returns:
+        dict: 目錄鍵值 -> {name, desc, solution}
+    """
+    rules: Dict[str, dict] = {}
+    for path in report_paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"略過無法讀取的報告: {path} - {e}")
+            continue
+
+        for site in data.get('site', []):
+            for alert in site.get('alerts', []):
+                key = _alert_key(alert)
+                if not key or key in rules:
+                    continue
+                rules[key] = {
+                    'name': alert.get('alert') or alert.get('name', ''),
+                    'desc': clean_html(alert.get('desc', '')),
+                    'solution': clean_html(alert.get('solution', '')),
+                }
+    return rules
+
+
+def build_entries(rules: Dict[str, dict], engine: TranslationEngine) -> Dict[str, dict]:
+    """
+    批次翻譯規則原文並產生目錄項目
+
+    Args:
+        rules: collect_rules 的結果
+        engine: 翻譯引擎
+
+    Returns:
+        dict: 目錄鍵值 -> 目錄項目 (翻譯失敗的欄位不會寫入)
+    """
+    texts: List[str] = []
+    for rule in rules.values():
+        if rule['name'] not in TERM_MAPPING:
+            texts.append(rule['name'])
+        texts.extend([rule['desc'], rule['solution']])
+
+    translated = engine.translate_all(texts)
+
+    entries = {}
+    for key, rule in rules.items():
+        title = TERM_MAPPING.get(rule['name']) or translated.get(rule['name'])
+        desc = translated.get(rule['desc'])
+        solution = translated.get(rule['solution'])
+        if not (title and desc):
+            print(f"略過翻譯不完整的規則: {key} {rule['name']}")
+            continue
+        entry = {'name': rule['name'], 'title': title, 'desc': desc}
+        if solution:
+            entry['solution'] = solution
+        entries[key] = entry
+    return entries
+
+
+def _is_covered(alerts: Dict[str, dict], key: str, name: str) -> bool:
+    """目錄是否已收錄此規則 (舊版報告的 pluginid 需以名稱比對 alertRef 變體)"""
+    if key in alerts:
+        return True
+    plugin_id = key.split('-', 1)[0]
+    return any(
+        k.split('-', 1)[0] == plugin_id and entry.get('name') == name
+        for k, entry in alerts.items()
+    )
+
+
+def _sort_key(key: str):
+    plugin_id, _, variant = key.partition('-')
+    return (int(plugin_id) if plugin_id.isdigit() else sys.maxsize, plugin_id, variant)
+
+
+def main() -> int:
+    """目錄建置工具"""
+    parser = argparse.ArgumentParser(description="建置 ZAP 弱點翻譯目錄")
+    parser.add_argument("reports", nargs="+", help="ZAP JSON 報告路徑")
+    parser.add_argument("-o", "--output", default=ALERT_CATALOG_FILE, help="目錄 JSON 路徑")
+    parser.add_argument("--backend", default="google", help="翻譯後端 (google / local)")
+    parser.add_argument("--refresh", action="store_true", help="重新翻譯已收錄的規則 (人工校訂的譯文會被覆寫)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.output, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        catalog = {"version": 1, "lang": TRANSLATION_TARGET, "alerts": {}}
+    alerts = catalog.setdefault('alerts', {})
+
+    rules = collect_rules(args.reports)
+    if not args.refresh:
+        rules = {k: v for k, v in rules.items() if not _is_covered(alerts, k, v['name'])}
+    if not rules:
+        print("目錄已涵蓋報告中的全部規則")
+        return 0
+
+    backend = create_backend(args.backend)
+    if backend is None:
+        print(f"無法使用翻譯後端: {args.backend}")
+        return 1
+
+    entries = build_entries(rules, TranslationEngine(backend))
+    alerts.update(entries)
+    catalog['alerts'] = {k: alerts[k] for k in sorted(alerts, key=_sort_key)}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"已新增 / 更新 {len(entries)} 筆規則，目錄共 {len(catalog['alerts'])} 筆")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+弱點模型服務
+將 ZAP JSON 報告正規化為精簡的記憶體模型: riskdesc 只拆解一次、HTML 只清除一次
+(相同原文共用同一個字串物件)、翻譯目錄只查找一次，並預先計算各區塊需要的統計。
+封面、摘要、詳情與輕量寫入器都使用同一個模型，不再各自走訪原始字典。
+"""
+from typing import Dict, List, Optional, Tuple
+
+from config.alert_catalog import catalog_text, lookup_alert
+from services.formatter import clean_html
+
+RISK_LEVELS = ("High", "Medium", "Low", "Informational")
+
+
+class Instance:
+    """弱點實例 (單一 URI)"""
+    __slots__ = ('uri', 'method', 'param', 'evidence')
+
+    def __init__(self, uri: str = '', method: str = '', param: str = '', evidence: str = ''):
+        self.uri = uri
+        self.method = method
+        self.param = param
+        self.evidence = evidence
+
+
+class Alert:
+    """單一網站上觸發的一筆弱點"""
+    __slots__ = (
+        'site', 'plugin_id', 'alert_ref', 'name', 'risk', 'confidence', 'cwe', 'wasc',
+        'desc', 'solution', 'reference', 'instances', 'count', 'catalog'
+    )
+
+    def __init__(self, site: str, plugin_id: str, alert_ref: str, name: str, risk: str, confidence: str,
+                 cwe: str, wasc: str, desc: str, solution: str, reference: str,
+                 instances: Tuple[Instance, ...], count: int, catalog: Optional[dict]):
+        self.site = site
+        self.plugin_id = plugin_id
+        self.alert_ref = alert_ref
+        self.name = name
+        self.risk = risk
+        self.confidence = confidence
+        self.cwe = cwe
+        self.wasc = wasc
+        self.desc = desc
+        self.solution = solution
+        self.reference = reference
+        self.instances = instances
+        self.count = count
+        self.catalog = catalog
+
+    @property
+    def rule(self) -> str:
+        """規則鍵值 (alertRef 含 pluginId 與變體編號，舊版報告退回 pluginid / 名稱)"""
+        return self.alert_ref or self.plugin_id or self.name
+
+
+class FindingGroup:
+    """依 (規則, 風險等級) 合併的發現 (描述、修復建議隨網站而異時分開，見 ScanFindings.groups)"""
+    __slots__ = ('alert', 'risk', 'sites', 'instance_count')
+
+    def __init__(self, alert: Alert):
+        self.alert = alert
+        self.risk = alert.risk
+        self.sites: Dict[str, List[Instance]] = {}
+        self.instance_count = 0
+
+    def add(self, alert: Alert):
+        self.sites.setdefault(alert.site, []).extend(alert.instances)
+        self.instance_count += len(alert.instances) or alert.count
+
+
+class Site:
+    """掃描網站"""
+    __slots__ = ('name', 'host', 'port', 'alerts')
+
+    def __init__(self, name: str, host: str, port: str):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.alerts: List[Alert] = []
+
+    @property
+    def label(self) -> str:
+        return self.host or self.name
+
+
+class ScanFindings:
+    """正規化後的 ZAP 掃描結果與預先計算的統計"""
+    __slots__ = (
+        'scanner', 'version', 'generated', 'sites', 'risk_counts', 'site_risk_counts',
+        'confidence_matrix', '_groups'
+    )
+
+    def __init__(self, scanner: str, version: str, generated: str):
+        self.scanner = scanner
+        self.version = version
+        self.generated = generated
+        self.sites: List[Site] = []
+        # 風險等級 -> 數量
+        self.risk_counts: Dict[str, int] = dict.fromkeys(RISK_LEVELS, 0)
+        # 網站 (host) -> 風險等級 -> 數量
+        self.site_risk_counts: Dict[str, Dict[str, int]] = {}
+        # (風險等級, 可信度) -> 數量
+        self.confidence_matrix: Dict[Tuple[str, str], int] = {}
+        self._groups: Dict[bool, List[FindingGroup]] = {}
+
+    @property
+    def alerts(self) -> List[Alert]:
+        return [alert for site in self.sites for alert in site.alerts]
+
+    @property
+    def total(self) -> int:
+        return sum(self.risk_counts.values())
+
+    @property
+    def target(self) -> str:
+        """掃描目標 (第一個網站)"""
+        return self.sites[0].name if self.sites and self.sites[0].name else 'Unknown Target'
+
+    def add_alert(self, site: Site, alert: Alert):
+        """
+        加入弱點並更新統計
+
+        Args:
+            site: 所屬網站 (需已加入 sites)
+            alert: 弱點
+        """
+        site.alerts.append(alert)
+        site_counts = self.site_risk_counts.setdefault(site.label, {})
+        self.risk_counts[alert.risk] += 1
+        site_counts[alert.risk] = site_counts.get(alert.risk, 0) + 1
+        key = (alert.risk, alert.confidence)
+        self.confidence_matrix[key] = self.confidence_matrix.get(key, 0) + 1
+        self._groups.clear()
+
+    def groups(self, by_finding: bool = True) -> List[FindingGroup]:
+        """
+        依規則與風險等級分組 (結果快取)
+
+        分組只呈現第一筆弱點的描述與修復建議: 翻譯目錄沒有固定譯文 (未收錄或標記為動態內容，
+        如 Vulnerable JS Library 的描述含程式庫名稱與版本) 時，原文也列入分組鍵值，內容不同的弱點各自成組。
+
+        Args:
+            by_finding: 是否跨網站合併；False 時每個網站的每個弱點各自成組 (舊版行為)
+
+        Returns:
+            list: 依首次出現順序排列的分組
+        """
+        if by_finding not in self._groups:
+            groups: Dict[tuple, FindingGroup] = {}
+            for site_index, site in enumerate(self.sites):
+                for alert_index, alert in enumerate(site.alerts):
+                    key = (alert.rule, alert.risk, _rendered_text(alert, 'desc'), _rendered_text(alert, 'solution')) \
+                        if by_finding else (site_index, alert_index)
+                    group = groups.get(key)
+                    if group is None:
+                        group = groups[key] = FindingGroup(alert)
+                    group.add(alert)
+            self._groups[by_finding] = list(groups.values())
+        return self._groups[by_finding]
+
+
+def _rendered_text(alert: Alert, field: str) -> Optional[str]:
+    """分組鍵值的文字欄位: 翻譯目錄有固定譯文時各網站相同 (None)，否則為清除後的原文"""
+    return None if catalog_text(alert.catalog, field) else getattr(alert, field)
+
+
+def _split_riskdesc(risk_desc: str) -> Tuple[str, str]:
+    """拆解 riskdesc (如 "High (Medium)") 為風險等級與可信度"""
+    risk = risk_desc.split(' ')[0]
+    if risk not in RISK_LEVELS:
+        risk = "Informational"
+    confidence = risk_desc[risk_desc.find('(') + 1:risk_desc.rfind(')')] if '(' in risk_desc else ''
+    return risk, confidence
+
+
+def build_findings(data: dict) -> ScanFindings:
+    """
+    將 ZAP 報告正規化為弱點模型
+
+    Args:
+        data: ZAP 報告數據
+
+    Returns:
+        ScanFindings: 弱點模型
+    """
+    findings = ScanFindings(
+        data.get('@programName') or 'ZAP', data.get('@version', ''), data.get('@generated', '')
+    )
+
+    # 同一規則在各網站的描述、建議多半相同: 清除結果與目錄查找結果共用
+    cleaned: Dict[str, str] = {}
+    catalog: Dict[tuple, Optional[dict]] = {}
+
+    def clean(raw) -> str:
+        raw = raw or ''
+        text = cleaned.get(raw)
+        if text is None:
+            text = cleaned[raw] = clean_html(raw)
+        return text
+
+    for raw_site in data.get('site', []):
+        site = Site(raw_site.get('@name', ''), raw_site.get('@host', ''), str(raw_site.get('@port', '')))
+        findings.sites.append(site)
+        findings.site_risk_counts.setdefault(site.label, {})
+
+        for raw in raw_site.get('alerts', []):
+            name = raw.get('alert') or raw.get('name') or 'Unknown Alert'
+            risk, confidence = _split_riskdesc(raw.get('riskdesc', 'Info'))
+
+            catalog_key = (raw.get('alertRef'), raw.get('pluginid'), name)
+            if catalog_key not in catalog:
+                catalog[catalog_key] = lookup_alert(raw)
+
+            instances = tuple(
+                Instance(i.get('uri', ''), i.get('method', ''), i.get('param', ''), i.get('evidence', ''))
+                for i in raw.get('instances', [])
+            )
+            findings.add_alert(site, Alert(
+                site.name, str(raw.get('pluginid', '')), str(raw.get('alertRef', '') or ''), name,
+                risk, confidence, str(raw.get('cweid', '')), str(raw.get('wascid', '')),
+                clean(raw.get('desc')), clean(raw.get('solution')), clean(raw.get('reference')),
+                instances, int(raw.get('count', 0) or 0), catalog[catalog_key]
+            ))
+
+    return findings
@@ -5,9 +5,14 @@ import re
 from typing import Dict
 
 
+# 區塊層級標籤轉為換行，保留段落邊界供分段翻譯
+_BLOCK_TAG = re.compile(r'\s*(?:<br\s*/?>|</(?:p|div|li|h[1-6]|tr|pre|blockquote)>)\s*', re.IGNORECASE)
+_TAG = re.compile('<.*?>')
+
+
 def clean_html(raw_html: str) -> str:
     """
-    清除 HTML 標籤
+    清除 HTML 標籤 (段落與換行標籤轉為換行)
 
     Args:
         raw_html: 含有 HTML 標籤的文字
@@ -17,8 +22,8 @@ def clean_html(raw_html: str) -> str:
     """
     if raw_html is None:
         return ""
-    cleanr = re.compile('<.*?>')
-    return re.sub(cleanr, '', raw_html).strip()
+    text = _BLOCK_TAG.sub('\n', raw_html)
+    return _TAG.sub('', text).strip()
 
 
 def parse_ai_response(text: str) -> Dict[str, str]:
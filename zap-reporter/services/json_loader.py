@@ -0,0 +1,25 @@
+"""
+JSON 檔案讀取
+"""
+import json
+from typing import Optional
+
+
+def load_json(file_path: str, quiet: bool = False) -> Optional[dict]:
+    """
+    載入 JSON 檔案
+
+    Args:
+        file_path: 檔案路徑
+        quiet: 讀取失敗時不輸出訊息 (可選檔案，如 ai_insights.json)
+
+    Returns:
+        dict: JSON 內容，檔案不存在或格式錯誤時回傳 None
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        if not quiet:
+            print(f"讀取 JSON 失敗: {file_path} - {e}")
+        return None
@@ -1,6 +1,7 @@
+import io
 import xml.etree.ElementTree as ET
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # 設定 Logger
 logger = logging.getLogger(__name__)
@@ -8,88 +9,121 @@ logger = logging.getLogger(__name__)
 class NmapParser:
     """
     負責解析 Nmap 輸出的 XML 檔案
-    具備容錯機制，並支援解析 vulners script 產生的 CVE 資訊
+    以 iterparse 逐一處理 <host> 並於處理後清除元素，大型網段的掃描結果也不會載入整份文件；
+    具備容錯機制 (檔案截斷時保留已完整解析的主機)，並支援解析 vulners script 產生的 CVE 資訊
     """
 
     @staticmethod
     def parse(xml_content: str) -> List[Dict[str, Any]]:
         """
         解析 Nmap XML 字串並返回結構化的主機列表
-        如果 XML 破損或不完整，將返回空列表並記錄警告，不會導致程式崩潰。
+        如果 XML 破損或不完整，將返回已完整解析的主機並記錄警告，不會導致程式崩潰。
         """
         if not xml_content:
             logger.warning("Nmap XML content is empty.")
             return []
 
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        return NmapParser._collect(io.BytesIO(xml_content))
+
+    @staticmethod
+    def parse_file(path: str) -> List[Dict[str, Any]]:
+        """
+        串流解析 Nmap XML 檔案並返回結構化的主機列表 (記憶體用量與檔案大小無關)
+        """
         try:
-            # 嘗試解析 XML
-            root = ET.fromstring(xml_content)
-            
-            hosts_data = []
-            for host in root.findall('host'):
-                status = host.find('status')
-                # 確保主機是 UP 的狀態
-                if status is not None and status.get('state') == 'up':
-                    host_info = NmapParser._extract_host_info(host)
-                    hosts_data.append(host_info)
-            
-            if not hosts_data:
-                logger.info("Nmap scan completed but no 'up' hosts found.")
-                
-            return hosts_data
+            with open(path, 'rb') as f:
+                return NmapParser._collect(f)
+        except OSError as e:
+            logger.error(f"Unable to read Nmap XML {path}: {e}")
+            return []
+
+    @staticmethod
+    def _collect(source) -> List[Dict[str, Any]]:
+        hosts_data = list(NmapParser.iter_hosts(source))
+        if not hosts_data:
+            logger.info("Nmap scan completed but no 'up' hosts found.")
+        return hosts_data
+
+    @staticmethod
+    def iter_hosts(source, status: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐一產生狀態為 up 的主機資訊
+
+        Args:
+            source: XML 檔案路徑或已開啟的二進位檔案
+            status: 若提供，解析結束後寫入 complete (XML 是否完整)
+        """
+        if status is None:
+            status = {}
+        status['complete'] = False
+
+        try:
+            context = ET.iterparse(source, events=('start', 'end'))
+            _, root = next(context)
+            for event, elem in context:
+                if event != 'end' or elem.tag not in ('host', 'runstats'):
+                    continue
+                host_info = None
+                if elem.tag == 'host':
+                    state = elem.find('status')
+                    # 確保主機是 UP 的狀態
+                    if state is not None and state.get('state') == 'up':
+                        host_info = NmapParser._extract_host_info(elem)
+                # 已處理的元素自根節點移除，樹狀結構不會累積
+                root.clear()
+                if host_info is not None:
+                    yield host_info
+            status['complete'] = True
 
         except ET.ParseError as e:
             logger.warning(f"Nmap XML is incomplete or malformed (Scan might have been interrupted). Error: {e}")
-            logger.warning("Returning empty host list to ensure report generation continues.")
-            return [] 
+            logger.warning("Returning the hosts parsed so far to ensure report generation continues.")
+        except StopIteration:
+            logger.warning("Nmap XML content is empty.")
         except Exception as e:
             logger.error(f"Unexpected error during Nmap parsing: {e}")
-            return []
 
     @staticmethod
     def _extract_host_info(host: ET.Element) -> Dict[str, Any]:
         """
-        從單一 host 節點提取 IP, Hostname, Port 以及 CVE 資訊
+        從單一 host 節點提取 IP, Hostname, OS, Port 以及 CVE 資訊
         """
         try:
             # 1. 取得 IP 地址
             address = host.find("address[@addrtype='ipv4']")
+            if address is None:
+                address = host.find("address[@addrtype='ipv6']")
             ip = address.get('addr') if address is not None else "Unknown"
 
             # 2. 取得 Hostname
-            hostnames = host.find('hostnames')
-            hostname = "Unknown"
-            if hostnames is not None:
-                hn = hostnames.find('hostname')
-                if hn is not None:
-                    hostname = hn.get('name')
+            hn = host.find('hostnames/hostname')
+            hostname = hn.get('name', '') if hn is not None else ""
 
             # 3. 取得 Port 與 CVE 資訊
             ports_data = []
-            ports = host.find('ports')
-            if ports is not None:
-                for port in ports.findall('port'):
-                    state = port.find('state')
-                    if state is not None and state.get('state') == 'open':
-                        service = port.find('service')
-                        service_name = service.get('name') if service is not None else "unknown"
-                        product = service.get('product') if service is not None else ""
-                        version = service.get('version') if service is not None else ""
-                        
-                        # --- 新增：提取 CVE 資訊 ---
-                        cves = NmapParser._extract_cves(port)
-                        
-                        ports_data.append({
-                            "port": port.get('portid'),
-                            "protocol": port.get('protocol'),
-                            "service": service_name,
-                            "product": f"{product} {version}".strip(),
-                            "cves": cves  # 將 CVE 列表加入結果
-                        })
+            for port in host.findall('ports/port'):
+                state = port.find('state')
+                if state is not None and state.get('state') == 'open':
+                    service = port.find('service')
+                    svc = service.attrib if service is not None else {}
+
+                    ports_data.append({
+                        "port": port.get('portid', ''),
+                        "protocol": port.get('protocol', ''),
+                        "service": svc.get('name', 'unknown'),
+                        "product": svc.get('product', ''),
+                        "version": svc.get('version', ''),
+                        "extrainfo": svc.get('extrainfo', ''),
+                        "tunnel": svc.get('tunnel', ''),
+                        "cves": NmapParser._extract_cves(port)
+                    })
 
             return {
                 "ip": ip,
                 "hostname": hostname,
+                "os": [m.get('name', '') for m in host.findall('os/osmatch')],
                 "ports": ports_data
             }
         except Exception as e:
@@ -97,6 +131,7 @@ class NmapParser:
             return {
                 "ip": "Error",
                 "hostname": "Error",
+                "os": [],
                 "ports": []
             }
 
@@ -108,37 +143,27 @@ class NmapParser:
         """
         cves = []
         try:
-            # 尋找所有的 script 標籤
             for script in port.findall('script'):
-                # 鎖定 id="vulners" 的 script
-                if script.get('id') == 'vulners':
-                    # vulners 的輸出通常包含在 table 中
-                    for table in script.findall('table'):
-                        # 內層 table 通常代表單一漏洞條目
-                        for row in table.findall('table'):
-                            cve_id = ""
-                            cvss = "0.0"
-                            is_exploit = "false"
-
-                            # 解析 elem 元素 (key-value 結構)
-                            for elem in row.findall('elem'):
-                                key = elem.get('key')
-                                if key == 'id':
-                                    cve_id = elem.text
-                                elif key == 'cvss':
-                                    cvss = elem.text
-                                elif key == 'is_exploit':
-                                    is_exploit = elem.text
-                            
-                            # 只有拿到 CVE ID 才算有效資料
-                            if cve_id:
-                                cves.append({
-                                    "id": cve_id,
-                                    "cvss": float(cvss) if cvss else 0.0,
-                                    "is_exploit": is_exploit == "true"
-                                })
+                # 鎖定 id="vulners" 的 script；第一層 table 對應 CPE，內層 table 代表單一漏洞條目
+                if script.get('id') != 'vulners':
+                    continue
+                for table in script.findall('table'):
+                    for row in table.findall('table'):
+                        fields = {elem.get('key'): elem.text for elem in row.findall('elem')}
+
+                        # 只有拿到 CVE ID 才算有效資料
+                        if fields.get('id'):
+                            try:
+                                cvss = float(fields.get('cvss') or 0.0)
+                            except ValueError:
+                                cvss = 0.0
+                            cves.append({
+                                "id": fields['id'],
+                                "cvss": cvss,
+                                "is_exploit": fields.get('is_exploit') == "true"
+                            })
         except Exception as e:
             # 不讓 CVE 解析失敗影響主要 Port 資訊的讀取
             logger.warning(f"Failed to parse CVEs for port {port.get('portid')}: {e}")
-        
-        return cves
\ No newline at end of file
+
+        return cves
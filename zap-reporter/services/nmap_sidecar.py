@@ -0,0 +1,127 @@
+"""
+Nmap 正規化結果 (Sidecar) 讀取服務
+MCP 端在 Nmap 結束後將 nmap_result.xml 解析為 nmap_result.json (主機、OS 推測、服務、
+Web URL 與依 CVSS 排序的 CVE)，報告直接讀取此檔。
+Sidecar 不存在、版本不符或來源 XML 已變更時，以 NmapParser 串流解析 XML 重建並寫回。
+格式需與 zap-mcp/tools/nmap_sidecar.py 一致 (SIDECAR_VERSION)。
+"""
+import os
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+from config.settings import NMAP_REPORT_FILENAME, NMAP_SIDECAR_FILENAME
+from services.nmap_parser import NmapParser
+
+# 格式變更時遞增 (需與 MCP 端一致)
+SIDECAR_VERSION = 1
+
+# 視為 Web 服務的服務名稱
+WEB_SERVICES = ("http", "http-alt", "http-proxy", "soap", "glrpc", "unknown")
+
+
+def _web_url(hostname: str, port: dict) -> Optional[str]:
+    """依服務判斷 Web URL (非 Web 服務回傳 None)"""
+    port_id = port['port']
+    service_name = port['service']
+
+    protocol = "http"
+    if "https" in service_name or "ssl" in service_name or port.get('tunnel') == "ssl":
+        protocol = "https"
+    elif service_name not in WEB_SERVICES:
+        return None
+
+    if port_id == "443":
+        protocol = "https"
+    elif port_id == "80":
+        protocol = "http"
+
+    if (protocol, port_id) in (("http", "80"), ("https", "443")):
+        return f"{protocol}://{hostname}"
+    return f"{protocol}://{hostname}:{port_id}"
+
+
+def _source_info(xml_path: str) -> dict:
+    stat = os.stat(xml_path)
+    return {"file": os.path.basename(xml_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def build_nmap_sidecar(xml_path: str) -> dict:
+    """
+    串流解析 Nmap XML 並產生正規化結果
+
+    Args:
+        xml_path: Nmap XML 路徑
+
+    Returns:
+        dict: {version, generated_at, source, complete, hosts, web_urls}
+    """
+    source = _source_info(xml_path)
+    status = {}
+    hosts = []
+    web_urls = []
+
+    with open(xml_path, 'rb') as f:
+        for host in NmapParser.iter_hosts(f, status):
+            name = host['hostname'] or host['ip']
+            for port in host['ports']:
+                port['cves'].sort(key=lambda c: (-c['cvss'], c['id']))
+                url = _web_url(name, port) if name else None
+                if url:
+                    web_urls.append(url)
+            hosts.append(host)
+
+    return {
+        "version": SIDECAR_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "source": source,
+        "complete": status.get('complete', False),
+        "hosts": hosts,
+        "web_urls": list(dict.fromkeys(web_urls)),
+    }
+
+
+def _is_current(sidecar: dict, xml_path: str) -> bool:
+    if sidecar.get('version') != SIDECAR_VERSION:
+        return False
+    if not os.path.exists(xml_path):
+        return True
+    source = _source_info(xml_path)
+    recorded = sidecar.get('source', {})
+    return recorded.get('size') == source['size'] and recorded.get('mtime') == source['mtime']
+
+
+def load_nmap_sidecar(data_dir: str) -> Optional[dict]:
+    """
+    讀取 Nmap 正規化結果
+
+    Args:
+        data_dir: 資料目錄
+
+    Returns:
+        dict: 正規化結果 (含 hosts)，沒有 Nmap 結果時回傳 None
+    """
+    xml_path = os.path.join(data_dir, NMAP_REPORT_FILENAME)
+    sidecar_path = os.path.join(data_dir, NMAP_SIDECAR_FILENAME)
+
+    try:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        if _is_current(sidecar, xml_path):
+            return sidecar
+        print("Nmap Sidecar 已過期，重新解析 XML...")
+    except (OSError, ValueError):
+        pass
+
+    if not os.path.exists(xml_path):
+        return None
+
+    sidecar = build_nmap_sidecar(xml_path)
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, sidecar_path)
+    except OSError as e:
+        print(f"寫入 Nmap Sidecar 失敗: {e}")
+    return sidecar
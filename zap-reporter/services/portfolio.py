@@ -0,0 +1,204 @@
+"""
+多目標合併報告 (Portfolio) 服務
+同時解析多個掃描結果目錄 (各含 ZAP-Report.json)，合併為單一弱點模型:
+同一網站的同一規則合併為一筆弱點，跨目標重疊的實例依 alertRef + 風險等級 + URI + 參數去除重複。
+合併後的模型只需翻譯一次、繪製一次圖表，並附上各目標的摘要列。
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.settings import ZAP_REPORT_FILENAME, AI_INSIGHTS_FILENAME, PORTFOLIO_WORKERS
+from services.findings import RISK_LEVELS, Alert, Instance, ScanFindings, Site, build_findings
+from services.nmap_sidecar import load_nmap_sidecar
+from services.json_loader import load_json
+
+
+def _load_scan(directory: str) -> Optional[ScanFindings]:
+    """讀取單一掃描結果目錄的 ZAP 報告並正規化 (於工作程序執行)"""
+    data = load_json(os.path.join(directory, ZAP_REPORT_FILENAME))
+    return build_findings(data) if data is not None else None
+
+
+def load_scans(directories: Sequence[str], workers: int = PORTFOLIO_WORKERS) -> List[Tuple[str, ScanFindings]]:
+    """
+    同時解析多個掃描結果目錄
+
+    Args:
+        directories: 掃描結果目錄
+        workers: 工作程序數 (1 = 單一程序)
+
+    Returns:
+        list: [(目錄, 弱點模型)]，依輸入順序排列，無法讀取的目錄略過
+    """
+    results: List[Optional[ScanFindings]] = []
+    workers = min(workers, len(directories))
+
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_load_scan, directories))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"平行解析失敗，改為單一程序: {e}")
+            results = []
+
+    # 單一程序 (或程序池失敗時) 依序解析尚未完成的目錄
+    results += [_load_scan(d) for d in directories[len(results):]]
+    return [(d, f) for d, f in zip(directories, results) if f is not None]
+
+
+def _instance_key(alert: Alert, instance: Instance) -> tuple:
+    # alertRef 區分同一 pluginId 的不同變體 (如 CSP 10055-4 / 10055-5 皆回報於同一標頭)
+    return alert.rule, alert.risk, instance.uri, instance.param
+
+
+def merge_scans(scans: Sequence[Tuple[str, ScanFindings]]) -> Tuple[ScanFindings, List[dict]]:
+    """
+    合併多個掃描結果並去除重複的實例
+
+    同一網站 (依網址) 的同一規則與風險等級合併為一筆弱點；
+    實例以 (alertRef, 風險等級, URI, 參數) 去重: 只有先前的其他目標已回報時才視為重複 (先出現的目標保留)，
+    同一目標內的實例一律保留，全部重複的弱點不列入。
+
+    Args:
+        scans: [(目錄, 弱點模型)]
+
+    Returns:
+        tuple: (合併後的弱點模型, 各目標摘要列)
+    """
+    first = scans[0][1] if scans else None
+    merged = ScanFindings(
+        first.scanner if first else 'ZAP', first.version if first else '', first.generated if first else ''
+    )
+
+    sites: Dict[str, Site] = {}
+    # (網站, 規則, 風險等級) -> [首次出現的弱點, 實例列表, count 合計, 合併後網站]
+    pending: Dict[tuple, list] = {}
+    # 實例鍵值 -> 首次回報的目標索引
+    seen: Dict[tuple, int] = {}
+    targets: List[dict] = []
+
+    for target_index, (directory, findings) in enumerate(scans):
+        risk_counts = dict.fromkeys(RISK_LEVELS, 0)
+        instances = duplicates = 0
+
+        for scan_site in findings.sites:
+            site = sites.get(scan_site.name)
+            if site is None:
+                site = sites[scan_site.name] = Site(scan_site.name, scan_site.host, scan_site.port)
+
+            for alert in scan_site.alerts:
+                risk_counts[alert.risk] += 1
+                if alert.instances:
+                    fresh = []
+                    for instance in alert.instances:
+                        if seen.setdefault(_instance_key(alert, instance), target_index) != target_index:
+                            duplicates += 1
+                        else:
+                            fresh.append(instance)
+                    instances += len(alert.instances)
+                    if not fresh:
+                        continue
+                else:
+                    # 沒有實例明細的弱點以 (alertRef, 風險等級, 網站) 去重
+                    key = (alert.rule, alert.risk, site.name, None)
+                    instances += alert.count
+                    if seen.setdefault(key, target_index) != target_index:
+                        duplicates += alert.count
+                        continue
+                    fresh = []
+
+                entry = pending.get((site.name, alert.rule, alert.risk))
+                if entry is None:
+                    pending[(site.name, alert.rule, alert.risk)] = [alert, fresh, alert.count, site]
+                else:
+                    entry[1].extend(fresh)
+                    entry[2] += alert.count
+
+        targets.append({
+            "target": findings.target,
+            "directory": directory,
+            "name": os.path.basename(os.path.normpath(directory)),
+            "generated": findings.generated,
+            "sites": len(findings.sites),
+            "alerts": findings.total,
+            "instances": instances,
+            "duplicates": duplicates,
+            "risk_counts": risk_counts,
+        })
+
+    merged.sites.extend(sites.values())
+    for site in merged.sites:
+        merged.site_risk_counts.setdefault(site.label, {})
+    # pending 為插入順序: 合併後各網站的弱點依首次出現順序排列
+    for alert, fresh, count, site in pending.values():
+        merged.add_alert(site, Alert(
+            site.name, alert.plugin_id, alert.alert_ref, alert.name, alert.risk, alert.confidence,
+            alert.cwe, alert.wasc, alert.desc, alert.solution, alert.reference,
+            tuple(fresh), len(fresh) or count, alert.catalog
+        ))
+
+    return merged, targets
+
+
+def merge_ai_insights(directories: Sequence[str]) -> Optional[dict]:
+    """
+    合併各目錄的 AI 分析 (同名弱點的建議以先出現者為準，總結依目標分段)
+
+    Args:
+        directories: 掃描結果目錄
+
+    Returns:
+        dict: {"solutions": {...}, "executive_summary": str}，皆無 AI 分析時回傳 None
+    """
+    solutions: Dict[str, str] = {}
+    summaries = []
+    for directory in directories:
+        ai_data = load_json(os.path.join(directory, AI_INSIGHTS_FILENAME), quiet=True)
+        if not ai_data:
+            continue
+        raw = ai_data.get('solutions') or {}
+        for item in (raw if isinstance(raw, list) else [raw]):
+            if isinstance(item, dict):
+                for name, content in item.items():
+                    solutions.setdefault(name, content)
+        if ai_data.get('executive_summary'):
+            summaries.append(f"**{os.path.basename(os.path.normpath(directory))}**\n\n{ai_data['executive_summary']}")
+
+    if not solutions and not summaries:
+        return None
+    return {"solutions": solutions, "executive_summary": "\n\n".join(summaries)}
+
+
+def merge_nmap(directories: Sequence[str]) -> Optional[dict]:
+    """
+    合併各目錄的 Nmap 正規化結果 (同一 IP 只保留先出現者)
+
+    Args:
+        directories: 掃描結果目錄
+
+    Returns:
+        dict: {"hosts", "complete", "web_urls"}，皆無 Nmap 結果時回傳 None
+    """
+    hosts = []
+    seen_ips = set()
+    complete = True
+    web_urls: List[str] = []
+    found = False
+    for directory in directories:
+        sidecar = load_nmap_sidecar(directory)
+        if not sidecar:
+            continue
+        found = True
+        complete = complete and sidecar.get('complete', True)
+        web_urls.extend(sidecar.get('web_urls', []))
+        for host in sidecar['hosts']:
+            if host['ip'] not in seen_ips:
+                seen_ips.add(host['ip'])
+                hosts.append(host)
+
+    if not found:
+        return None
+    return {"hosts": hosts, "complete": complete, "web_urls": list(dict.fromkeys(web_urls))}
@@ -0,0 +1,144 @@
+"""
+文字分段服務
+將長文字依段落 (HTML 區塊標籤 / 換行) 與句子切分為可獨立翻譯的片段，
+片段之間的空白與標籤原樣保留，翻譯後依序組回。
+不同弱點的描述常共用相同句子，以片段為快取單位可大幅提高快取命中率，
+也不再受單次翻譯長度上限限制。
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from config.settings import MAX_TEXT_LENGTH
+
+# 段落邊界: 區塊層級 HTML 標籤、<br> 與換行 (連同前後空白一併視為分隔)
+_PARAGRAPH_BOUNDARY = re.compile(
+    r'\s*(?:<br\s*/?>|</?(?:p|div|li|ul|ol|h[1-6]|tr|td|th|table|pre|blockquote)\b[^>]*>|\n)\s*',
+    re.IGNORECASE
+)
+
+# 句子邊界: 句末標點後接空白，且下一句以大寫字母、數字、引號或括號開頭
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(\[<])|(?<=[。！？])\s*')
+
+# 句點結尾但不代表句子結束的縮寫
+_ABBREVIATIONS = frozenset({
+    'e.g.', 'i.e.', 'etc.', 'vs.', 'cf.', 'approx.', 'no.', 'mr.', 'mrs.', 'dr.', 'fig.', 'inc.', 'ltd.'
+})
+
+# 不含任何文字的片段 (純數字、標點、符號) 不需翻譯
+_HAS_WORD = re.compile(r'[^\W\d_]', re.UNICODE)
+
+Segment = Tuple[str, bool]
+
+
+def _split_sentences(paragraph: str) -> List[str]:
+    """將單一段落切分為句子 (保留句間空白於前一句之後)"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BOUNDARY.finditer(paragraph):
+        end = match.start()
+        if end <= start:
+            continue
+        last_word = paragraph[start:end].rsplit(None, 1)[-1].lower()
+        if last_word in _ABBREVIATIONS:
+            continue
+        sentences.append(paragraph[start:end])
+        sentences.append(match.group())
+        start = match.end()
+    sentences.append(paragraph[start:])
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """超過長度上限的句子於最後一個空白處切開 (無空白時直接依上限切開)"""
+    parts = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 1, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut])
+        sentence = sentence[cut:]
+    parts.append(sentence)
+    return parts
+
+
+def split_segments(text: str, max_chars: int = MAX_TEXT_LENGTH) -> List[Segment]:
+    """
+    將文字切分為片段
+
+    Args:
+        text: 原文 (可含 HTML 區塊標籤)
+        max_chars: 單一片段的長度上限
+
+    Returns:
+        list: (片段文字, 是否需翻譯)；依序串接所有片段即為原文
+    """
+    segments: List[Segment] = []
+    if not text:
+        return segments
+
+    pieces = []
+    start = 0
+    for match in _PARAGRAPH_BOUNDARY.finditer(text):
+        if match.start() > start:
+            pieces.extend(_split_sentences(text[start:match.start()]))
+        pieces.append(match.group())
+        start = match.end()
+    if start < len(text):
+        pieces.extend(_split_sentences(text[start:]))
+
+    for piece in pieces:
+        if not piece:
+            continue
+        if not piece.strip() or _PARAGRAPH_BOUNDARY.fullmatch(piece):
+            segments.append((piece, False))
+            continue
+        for part in _split_long(piece, max_chars):
+            # 片段前後的空白作為分隔保留，片段本身不含首尾空白以利快取共用
+            core = part.strip()
+            if not core:
+                segments.append((part, False))
+                continue
+            lead = part[:len(part) - len(part.lstrip())]
+            trail = part[len(part.rstrip()):]
+            if lead:
+                segments.append((lead, False))
+            segments.append((core, len(core) >= 2 and bool(_HAS_WORD.search(core))))
+            if trail:
+                segments.append((trail, False))
+    return segments
+
+
+def translatable_segments(texts: Iterable[str], max_chars: int = MAX_TEXT_LENGTH) -> List[str]:
+    """
+    收集多段文字中需要翻譯的片段
+
+    Args:
+        texts: 原文
+        max_chars: 單一片段的長度上限
+
+    Returns:
+        list: 需翻譯的片段 (已去重，保持出現順序)
+    """
+    unique = {}
+    for text in texts:
+        for segment, translatable in split_segments(text, max_chars):
+            if translatable:
+                unique[segment] = None
+    return list(unique)
+
+
+def join_segments(segments: List[Segment], translations: Dict[str, str]) -> str:
+    """
+    依序組回譯文 (查無譯文的片段保留原文)
+
+    Args:
+        segments: split_segments 的結果
+        translations: 片段原文 -> 譯文
+
+    Returns:
+        str: 組合後的文字
+    """
+    return ''.join(
+        translations.get(segment, segment) if translatable else segment
+        for segment, translatable in segments
+    )
@@ -0,0 +1,233 @@
+"""
+翻譯快取儲存 (SQLite)
+以「正規化文字雜湊 + 目標語言」為鍵，支援多個 Reporter 同時寫入 (WAL)、
+依最近使用時間 (LRU) 淘汰超過上限的項目，並可匯入 / 匯出 JSON 以在部署間搬移快取。
+
+用法:
+    python -m services.translation_cache export cache.json
+    python -m services.translation_cache import cache.json
+    python -m services.translation_cache stats
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, Iterable, Optional
+
+from config.settings import CACHE_DB_FILE, TRANSLATION_TARGET, TRANSLATION_CACHE_MAX_ENTRIES
+
+_WHITESPACE = re.compile(r'\s+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (key, lang)
+);
+CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """正規化文字 (合併連續空白並去除頭尾空白)"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def text_key(text: str) -> str:
+    """計算正規化文字的雜湊鍵"""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class TranslationCacheStore:
+    """SQLite 翻譯快取"""
+
+    def __init__(
+        self,
+        db_path: str = CACHE_DB_FILE,
+        lang: str = TRANSLATION_TARGET,
+        max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES
+    ):
+        self.db_path = db_path
+        self.lang = lang
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        # 本次執行中讀取過的鍵，儲存時一併更新最近使用時間
+        self._touched = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """取得連線 (fork 後的子程序會重新連線)"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        批次查詢譯文
+
+        Args:
+            texts: 原文
+
+        Returns:
+            dict: 原文 -> 譯文 (僅包含命中的項目)
+        """
+        by_key: Dict[str, list] = {}
+        for text in texts:
+            by_key.setdefault(text_key(text), []).append(text)
+        if not by_key:
+            return {}
+
+        conn = self._connect()
+        found: Dict[str, str] = {}
+        keys = list(by_key)
+        # SQLite 單一查詢的參數數量有限，分段查詢
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, translation FROM translations WHERE lang = ? AND key IN ({placeholders})",
+                [self.lang] + chunk
+            ).fetchall()
+            for key, translation in rows:
+                self._touched.add(key)
+                for text in by_key[key]:
+                    found[text] = translation
+        return found
+
+    def get(self, text: str) -> Optional[str]:
+        """查詢單一譯文"""
+        return self.get_many([text]).get(text)
+
+    def put_many(self, mapping: Dict[str, str]) -> int:
+        """
+        批次寫入譯文 (單一交易)
+
+        Args:
+            mapping: 原文 -> 譯文
+
+        Returns:
+            int: 寫入筆數
+        """
+        if not mapping:
+            return 0
+        now = time.time()
+        rows = [(text_key(src), self.lang, src, dst, now) for src, dst in mapping.items() if dst]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO translations (key, lang, source, translation, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key, lang) DO UPDATE SET translation = excluded.translation, last_used = excluded.last_used",
+                rows
+            )
+        return len(rows)
+
+    def flush_usage(self):
+        """更新本次讀取項目的最近使用時間"""
+        if not self._touched:
+            return
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE key = ? AND lang = ?",
+                [(now, key, self.lang) for key in self._touched]
+            )
+        self._touched.clear()
+
+    def evict(self) -> int:
+        """
+        淘汰最久未使用的項目，使總數不超過上限
+
+        Returns:
+            int: 刪除筆數
+        """
+        if self.max_entries <= 0:
+            return 0
+        conn = self._connect()
+        count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        with conn:
+            conn.execute(
+                "DELETE FROM translations WHERE rowid IN "
+                "(SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            )
+        return excess
+
+    def count(self) -> int:
+        """快取項目總數"""
+        return self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def import_json(self, json_path: str) -> int:
+        """
+        匯入 JSON 快取 ({原文: 譯文}，與舊版 translation_cache.json 相容)
+
+        Returns:
+            int: 匯入筆數
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return self.put_many({k: v for k, v in data.items() if isinstance(v, str)})
+
+    def export_json(self, json_path: str) -> int:
+        """
+        匯出目標語言的快取為 JSON ({原文: 譯文})
+
+        Returns:
+            int: 匯出筆數
+        """
+        rows = self._connect().execute(
+            "SELECT source, translation FROM translations WHERE lang = ? ORDER BY source",
+            (self.lang,)
+        ).fetchall()
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(rows), f, ensure_ascii=False, indent=2)
+        return len(rows)
+
+    def close(self):
+        """關閉連線"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+def main() -> int:
+    """快取匯入 / 匯出工具"""
+    parser = argparse.ArgumentParser(description="翻譯快取匯入 / 匯出")
+    parser.add_argument("action", choices=["import", "export", "stats"])
+    parser.add_argument("path", nargs="?", help="JSON 檔案路徑")
+    parser.add_argument("--db", default=CACHE_DB_FILE, help="SQLite 快取路徑")
+    parser.add_argument("--lang", default=TRANSLATION_TARGET, help="目標語言")
+    args = parser.parse_args()
+
+    store = TranslationCacheStore(args.db, args.lang)
+    if args.action == "stats":
+        print(f"{args.db}: {store.count()} 筆")
+        return 0
+
+    if not args.path:
+        parser.error("import / export 需要指定 JSON 檔案路徑")
+
+    if args.action == "import":
+        print(f"已匯入 {store.import_json(args.path)} 筆")
+    else:
+        print(f"已匯出 {store.export_json(args.path)} 筆")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+批次翻譯引擎
+將報告所需的文字去重後分批送出，以有限的工作執行緒並行處理，
+並透過 Token Bucket 限制請求速率、失敗時以指數退避重試。
+翻譯後端可替換 (google / local)，local 後端不需網路，便於離線測試。
+"""
+import re
+import json
+import time
+import random
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import (
+    MAX_TEXT_LENGTH, TRANSLATION_TARGET, TRANSLATION_WORKERS, TRANSLATION_RATE,
+    TRANSLATION_MAX_RETRIES, TRANSLATION_LOCAL_FILE
+)
+
+# 批次合併時使用的分隔標記 (翻譯後需原樣保留才能拆回各段)
+BATCH_SEPARATOR = "\n\n[[[#]]]\n\n"
+_SEPARATOR_PATTERN = re.compile(r'\s*\[\[\[#\]\]\]\s*')
+
+
+class TokenBucket:
+    """Token Bucket 速率限制器 (執行緒安全)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取得一個 Token，不足時等待"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationBackend(ABC):
+    """翻譯後端介面"""
+
+    name = "base"
+
+    # 單次請求可容納的最大字元數
+    max_chars = MAX_TEXT_LENGTH
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """翻譯一批文字，回傳順序需與輸入相同 (無法翻譯的項目回傳 None)"""
+
+
+class GoogleBackend(TranslationBackend):
+    """Google 翻譯後端 (deep_translator)，將多段文字合併為單一請求"""
+
+    name = "google"
+
+    def __init__(self, target: str = TRANSLATION_TARGET):
+        from deep_translator import GoogleTranslator  # 延遲載入
+        self._translator_cls = GoogleTranslator
+        self.target = target
+        # GoogleTranslator 會修改實例上的請求參數，每個執行緒各用一個實例
+        self._local = threading.local()
+
+    def _translator(self):
+        if not hasattr(self._local, "translator"):
+            self._local.translator = self._translator_cls(source='auto', target=self.target)
+        return self._local.translator
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        translator = self._translator()
+        if len(texts) == 1:
+            return [translator.translate(texts[0][:self.max_chars])]
+
+        result = translator.translate(BATCH_SEPARATOR.join(texts))
+        parts = _SEPARATOR_PATTERN.split(result.strip()) if result else []
+        if len(parts) == len(texts):
+            return parts
+
+        # 分隔標記遭翻譯破壞時改為逐段翻譯
+        return [translator.translate(t[:self.max_chars]) for t in texts]
+
+
+class LocalBackend(TranslationBackend):
+    """
+    本機替代後端 (不需網路)
+    依對照表回傳譯文，查無對照時視為未翻譯 (不寫入快取)；可用於離線環境與測試。
+    """
+
+    name = "local"
+    max_chars = 1 << 30
+
+    def __init__(self, mapping: Optional[Dict[str, str]] = None, mapping_file: str = TRANSLATION_LOCAL_FILE):
+        self.mapping = dict(mapping or {})
+        if mapping_file:
+            try:
+                with open(mapping_file, 'r', encoding='utf-8') as f:
+                    self.mapping.update(json.load(f))
+            except Exception as e:
+                print(f"載入本機翻譯對照表失敗: {e}")
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        return [self.mapping.get(t) for t in texts]
+
+
+def create_backend(name: str) -> Optional[TranslationBackend]:
+    """
+    依名稱建立翻譯後端
+
+    Args:
+        name: google / local / none
+
+    Returns:
+        TranslationBackend: 後端實例，停用或無法建立時回傳 None
+    """
+    if name == "local":
+        return LocalBackend()
+    if name == "google":
+        try:
+            return GoogleBackend()
+        except ImportError:
+            print("警告: 找不到 deep-translator 模組，將跳過翻譯功能。")
+        except Exception as e:
+            print(f"翻譯器初始化失敗: {e}")
+    return None
+
+
+class TranslationEngine:
+    """批次並行翻譯引擎"""
+
+    def __init__(
+        self,
+        backend: TranslationBackend,
+        workers: int = TRANSLATION_WORKERS,
+        rate: float = TRANSLATION_RATE,
+        max_retries: int = TRANSLATION_MAX_RETRIES,
+        backoff: float = 0.5
+    ):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """依後端字元上限將文字分批 (過長或含分隔標記的文字單獨成批)"""
+        limit = self.backend.max_chars
+        batches, current, size = [], [], 0
+
+        for text in texts:
+            if len(text) >= limit or '[[[#]]]' in text:
+                batches.append([text])
+                continue
+            extra = len(text) + (len(BATCH_SEPARATOR) if current else 0)
+            if current and size + extra > limit:
+                batches.append(current)
+                current, size = [], 0
+                extra = len(text)
+            current.append(text)
+            size += extra
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _translate_batch(self, batch: List[str]) -> Dict[str, str]:
+        """翻譯單一批次 (含速率限制與指數退避重試)"""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                translated = self.backend.translate_batch(batch)
+                return {src: dst for src, dst in zip(batch, translated) if dst}
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    print(f"翻譯失敗: {e}")
+                    return {}
+                time.sleep(self.backoff * (2 ** attempt) + random.uniform(0, self.backoff))
+        return {}
+
+    def translate_all(self, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        翻譯所有文字 (自動去重)
+
+        Args:
+            texts: 待翻譯文字
+
+        Returns:
+            dict: 原文 -> 譯文 (翻譯失敗的項目不會出現在結果中)
+        """
+        unique = list(dict.fromkeys(t for t in texts if t))
+        if not unique:
+            return {}
+
+        batches = self._make_batches(unique)
+        resolved: Dict[str, str] = {}
+
+        if self.workers == 1 or len(batches) == 1:
+            for batch in batches:
+                resolved.update(self._translate_batch(batch))
+            return resolved
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+            for result in pool.map(self._translate_batch, batches):
+                resolved.update(result)
+        return resolved
@@ -2,87 +2,116 @@
 翻譯服務模組
 """
 import os
-import json
-from typing import Optional
+import sqlite3
+from typing import Dict, Iterable, List, Optional
 
-from config.settings import CACHE_FILE, MAX_TEXT_LENGTH
-
-# 條件載入翻譯模組
-try:
-    from deep_translator import GoogleTranslator
-    HAS_TRANSLATOR = True
-except ImportError:
-    HAS_TRANSLATOR = False
-    print("警告: 找不到 deep-translator 模組，將跳過翻譯功能。")
+from config.settings import CACHE_DB_FILE, CACHE_FILE, TRANSLATION_BACKEND
+from services.translation_engine import TranslationEngine, create_backend
+from services.translation_cache import TranslationCacheStore
+from services.segmenter import split_segments, translatable_segments, join_segments
 
 
 class TranslationService:
     """翻譯服務類"""
 
-    def __init__(self, cache_file: str = CACHE_FILE):
-        self.cache_file = cache_file
-        self.cache = self._load_cache()
-        self.translator = None
+    def __init__(
+        self,
+        cache_db: str = CACHE_DB_FILE,
+        backend: Optional[str] = None,
+        legacy_cache_file: str = CACHE_FILE
+    ):
+        self.store = TranslationCacheStore(cache_db)
+        # 本次執行中已取得的譯文 (記憶體層) 與尚未寫入儲存的新譯文
+        self.cache: Dict[str, str] = {}
+        self.pending: Dict[str, str] = {}
+        self.engine = None
+        # 本次執行中已翻譯失敗的文字 (避免逐段渲染時重複重試)
+        self.failed = set()
+
+        self._migrate_legacy_cache(legacy_cache_file)
+
+        translation_backend = create_backend(backend or TRANSLATION_BACKEND)
+        if translation_backend is not None:
+            self.engine = TranslationEngine(translation_backend)
+
+    def _migrate_legacy_cache(self, legacy_cache_file: str):
+        """首次使用 SQLite 快取時匯入舊版 JSON 快取"""
+        if not legacy_cache_file or not os.path.exists(legacy_cache_file):
+            return
+        try:
+            if self.store.count() == 0:
+                imported = self.store.import_json(legacy_cache_file)
+                print(f"已匯入舊版翻譯快取 {imported} 筆")
+        except Exception as e:
+            print(f"匯入舊版翻譯快取失敗: {e}")
 
-        if HAS_TRANSLATOR:
+    def _lookup(self, texts: List[str]) -> List[str]:
+        """從記憶體層與儲存查詢譯文，回傳仍未命中的文字"""
+        missing = [t for t in texts if t not in self.cache]
+        if missing:
             try:
-                self.translator = GoogleTranslator(source='auto', target='zh-TW')
-            except Exception as e:
-                print(f"翻譯器初始化失敗: {e}")
+                self.cache.update(self.store.get_many(missing))
+            except sqlite3.Error as e:
+                print(f"讀取翻譯快取失敗: {e}")
+        return [t for t in missing if t not in self.cache]
 
-    def _load_cache(self) -> dict:
-        """載入翻譯快取"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {}
+    def reload_cache(self):
+        """清除記憶體層 (常駐程序在子程序寫入新翻譯後呼叫，下次查詢改由儲存讀取)"""
+        self.cache = {}
+        self.failed = set()
 
     def save_cache(self) -> bool:
-        """儲存翻譯快取"""
+        """將新譯文寫入儲存，並更新使用時間、淘汰超量項目"""
         try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            self.store.put_many(self.pending)
+            self.pending = {}
+            self.store.flush_usage()
+            self.store.evict()
             return True
         except Exception as e:
             print(f"儲存快取失敗: {e}")
             return False
 
+    def _translate_segments(self, segments: List[str]) -> int:
+        """翻譯快取中沒有的片段，回傳新翻譯的數量"""
+        pending = [t for t in self._lookup(segments) if t not in self.failed]
+        if not pending or not self.engine:
+            return 0
+
+        resolved = self.engine.translate_all(pending)
+        self.cache.update(resolved)
+        self.pending.update(resolved)
+        self.failed.update(t for t in pending if t not in resolved)
+        return len(resolved)
+
+    def prefetch(self, texts: Iterable[str]) -> int:
+        """
+        預先批次翻譯多段文字並寫入快取，之後的 translate 呼叫直接命中快取
+
+        Args:
+            texts: 報告所需的全部待翻譯文字
+
+        Returns:
+            int: 新翻譯的片段數量
+        """
+        return self._translate_segments(translatable_segments(t for t in texts if t))
+
     def translate(self, text: str) -> str:
         """
-        自動翻譯文字
+        自動翻譯文字 (依段落與句子分段翻譯後組回，各片段獨立快取)
 
         Args:
             text: 待翻譯文字
 
         Returns:
-            str: 翻譯後的文字，若翻譯失敗則回傳原文
+            str: 翻譯後的文字，翻譯失敗的片段保留原文
         """
         if not text or len(text) < 2:
             return text
 
-        # 檢查快取
-        if text in self.cache:
-            return self.cache[text]
-
-        # 無翻譯器時回傳原文
-        if not self.translator:
-            return text
-
-        try:
-            # 限制文字長度
-            truncated = text[:MAX_TEXT_LENGTH] if len(text) > MAX_TEXT_LENGTH else text
-            result = self.translator.translate(truncated)
-
-            # 更新快取
-            self.cache[text] = result
-            return result
-        except Exception as e:
-            print(f"翻譯失敗: {e}")
-            return text
+        segments = split_segments(text)
+        self._translate_segments([s for s, translatable in segments if translatable])
+        return join_segments(segments, self.cache)
 
 
 # 全局翻譯服務實例
@@ -102,6 +131,11 @@ def auto_translate(text: str) -> str:
     return get_translator().translate(text)
 
 
+def prefetch_translations(texts: Iterable[str]) -> int:
+    """預先批次翻譯"""
+    return get_translator().prefetch(texts)
+
+
 def save_translation_cache() -> bool:
     """儲存翻譯快取"""
     return get_translator().save_cache()
@@ -0,0 +1,33 @@
+# ZAP Reporter Lightweight Writers (不載入 python-docx / matplotlib)
+import os
+from typing import Callable, Dict, Tuple
+
+from .model import build_report_model
+from .json_writer import render_json
+from .sarif import render_sarif, to_sarif
+from .markdown import render_md
+from .html import render_html
+
+# 輸出格式 -> (副檔名, 轉換函式)
+WRITERS: Dict[str, Tuple[str, Callable[[dict], str]]] = {
+    "html": (".html", render_html),
+    "md": (".md", render_md),
+    "json": (".json", render_json),
+    "sarif": (".sarif", render_sarif),
+}
+
+
+def write_report(fmt: str, model: dict, output_path: str):
+    """
+    以指定格式寫出正規化報告 (先寫入暫存檔再改名，讀取端不會看到半成品)
+
+    Args:
+        fmt: 輸出格式 (html / md / json / sarif)
+        model: build_report_model 的結果
+        output_path: 輸出路徑
+    """
+    _, render = WRITERS[fmt]
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render(model))
+    os.replace(tmp_path, output_path)
@@ -0,0 +1,121 @@
+"""
+HTML 寫入器
+輸出單一自足的 HTML 檔 (內嵌樣式)，適合直接於儀表板或瀏覽器檢視。
+"""
+from html import escape
+from typing import List
+
+from config.settings import DETAIL_MAX_INSTANCES
+from config.translations import RISK_MAPPING
+from services.findings import RISK_LEVELS
+
+# 風險等級顏色 (與 Word 報告一致)
+RISK_COLORS = {"High": "#ff0000", "Medium": "#ffa500", "Low": "#c8c800", "Informational": "#0000ff"}
+
+_STYLE = """
+body { font-family: "Noto Sans CJK TC", "Microsoft JhengHei", sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin: 0.5em 0 1em; }
+th, td { border: 1px solid #999; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #d9e2f3; }
+.risk { font-weight: bold; }
+.text { white-space: pre-wrap; }
+"""
+
+
+def _text(value) -> str:
+    return f'<div class="text">{escape(str(value))}</div>'
+
+
+def _risk(risk: str) -> str:
+    return f'<span class="risk" style="color:{RISK_COLORS.get(risk, "#000")}">{escape(RISK_MAPPING.get(risk, risk))}</span>'
+
+
+def _table(headers: List[str], rows: List[List[str]]) -> str:
+    head = "".join(f"<th>{escape(h)}</th>" for h in headers)
+    body = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in row) + "</tr>" for row in rows)
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def render_html(model: dict, max_instances: int = DETAIL_MAX_INSTANCES) -> str:
+    """
+    將正規化報告輸出為 HTML
+
+    Args:
+        model: build_report_model 的結果
+        max_instances: 每個發現列出的受影響實例上限
+
+    Returns:
+        str: HTML 文字
+    """
+    summary = model['summary']
+    scanner = model['scanner']
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="zh-Hant"><head><meta charset="utf-8"><title>弱點掃描報告</title>',
+        f"<style>{_STYLE}</style></head><body>",
+        "<h1>弱點掃描報告</h1>",
+        f"<p>掃描工具: {escape(scanner['name'])} {escape(scanner['version'])}　產生時間: {escape(model['generated_at'])}</p>",
+        "<h2>1. 掃描結果摘要</h2>",
+        f"<p>共 {summary['sites']} 個網站，發現 {summary['alerts']} 個潛在弱點 ({summary['findings']} 項)。</p>",
+        _table(["風險等級", "數量"], [[_risk(r), str(c)] for r, c in summary['risk_counts'].items()]),
+    ]
+
+    if model['targets']:
+        rows = [
+            [escape(target['name']), escape(target['target']), target['sites'], target['alerts']]
+            + [target['risk_counts'][risk] for risk in RISK_LEVELS] + [target['duplicates']]
+            for target in model['targets']
+        ]
+        parts += ["<h3>目標總覽</h3>", _table(["來源", "目標", "網站", "弱點", "高", "中", "低", "資訊", "重複實例"], rows)]
+
+    if model['ai']['executive_summary']:
+        parts += ["<h3>生成式 AI 總結</h3>", _text(model['ai']['executive_summary'])]
+
+    if model['hosts']:
+        rows = [
+            [
+                escape(host['ip']), escape(host['hostname'] or 'N/A'),
+                escape(f"{port['port']}/{port['protocol']}"),
+                escape(f"{port['service']} {port['product']}".strip()),
+                escape(", ".join(c.get('id', '') for c in port['cves'])),
+            ]
+            for host in model['hosts'] for port in host['ports']
+        ]
+        parts += ["<h3>基礎設施偵察摘要 (Nmap)</h3>", _table(["主機", "名稱", "連接埠", "服務", "CVE"], rows)]
+
+    parts.append("<h2>2. 弱點詳情分析</h2>")
+    for finding in model['findings']:
+        detail = [
+            ["弱點原名", escape(finding['name'])],
+            ["風險等級", _risk(finding['risk'])],
+            ["影響範圍", f"{len(finding['sites'])} 個網站，共 {finding['instance_count']} 個實例"],
+            ["弱點描述", _text(finding['description'])],
+        ]
+        ai = finding.get('ai')
+        if ai:
+            if ai.get('explanation'):
+                detail.append(["弱點分析 (AI)", _text(ai['explanation'])])
+            detail.append(["修復建議 (AI)", _text(ai['solution'])])
+        else:
+            detail.append(["修復建議", _text(finding['solution'])])
+        if finding['references']:
+            detail.append(["參考資料", "<br>".join(escape(ref) for ref in finding['references'])])
+
+        instances = []
+        for site in finding['sites']:
+            for instance in site['instances'] or [{"uri": "", "method": "", "param": ""}]:
+                if len(instances) < max_instances:
+                    instances.append([escape(site['name']), escape(instance['uri']),
+                                      escape(instance['method']), escape(instance['param'])])
+
+        parts += [
+            f"<h3>{escape(finding['title'])}</h3>",
+            "<table>" + "".join(f"<tr><th>{label}</th><td>{value}</td></tr>" for label, value in detail) + "</table>",
+            _table(["網站", "URI", "方法", "參數"], instances),
+        ]
+        hidden = finding['instance_count'] - len(instances)
+        if hidden > 0:
+            parts.append(f"<p>(另有 {hidden} 筆受影響實例未列出)</p>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
@@ -0,0 +1,17 @@
+"""
+正規化 JSON 寫入器
+"""
+import json
+
+
+def render_json(model: dict) -> str:
+    """
+    將正規化報告輸出為 JSON (不縮排：縮排輸出會改用純 Python 編碼器，大型報告慢數倍)
+
+    Args:
+        model: build_report_model 的結果
+
+    Returns:
+        str: JSON 文字
+    """
+    return json.dumps(model, ensure_ascii=False, separators=(',', ':'))
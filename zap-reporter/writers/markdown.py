@@ -0,0 +1,108 @@
+"""
+Markdown 寫入器
+"""
+from typing import List
+
+from config.settings import DETAIL_MAX_INSTANCES
+from config.translations import RISK_MAPPING
+
+
+def _cell(text) -> str:
+    """表格儲存格內容 (跳脫直線並合併換行)"""
+    return str(text).replace('|', '\\|').replace('\n', ' ')
+
+
+def _instance_rows(finding: dict, max_rows: int) -> List[str]:
+    rows = []
+    for site in finding['sites']:
+        for instance in site['instances'] or [{"uri": "", "method": "", "param": ""}]:
+            if len(rows) >= max_rows:
+                return rows
+            rows.append(
+                f"| {_cell(site['name'])} | {_cell(instance['uri'])} | "
+                f"{_cell(instance['method'])} | {_cell(instance['param'])} |"
+            )
+    return rows
+
+
+def render_md(model: dict, max_instances: int = DETAIL_MAX_INSTANCES) -> str:
+    """
+    將正規化報告輸出為 Markdown
+
+    Args:
+        model: build_report_model 的結果
+        max_instances: 每個發現列出的受影響實例上限
+
+    Returns:
+        str: Markdown 文字
+    """
+    summary = model['summary']
+    lines = [
+        "# 弱點掃描報告",
+        "",
+        f"- 掃描工具: {model['scanner']['name']} {model['scanner']['version']}",
+        f"- 產生時間: {model['generated_at']}",
+        f"- 網站數: {summary['sites']}，弱點總數: {summary['alerts']}，發現: {summary['findings']}",
+        "",
+        "## 1. 掃描結果摘要",
+        "",
+        "| 風險等級 | 數量 |",
+        "| --- | ---: |",
+    ]
+    lines += [f"| {RISK_MAPPING.get(risk, risk)} | {count} |" for risk, count in summary['risk_counts'].items()]
+
+    if model['targets']:
+        lines += ["", "### 目標總覽", "", "| 來源 | 目標 | 網站 | 弱點 | 高 | 中 | 低 | 資訊 | 重複實例 |",
+                  "| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |"]
+        for target in model['targets']:
+            counts = target['risk_counts']
+            lines.append(
+                f"| {_cell(target['name'])} | {_cell(target['target'])} | {target['sites']} | {target['alerts']} | {counts['High']} | "
+                f"{counts['Medium']} | {counts['Low']} | {counts['Informational']} | {target['duplicates']} |"
+            )
+
+    if model['ai']['executive_summary']:
+        lines += ["", "### 生成式 AI 總結", "", model['ai']['executive_summary']]
+
+    if model['hosts']:
+        lines += ["", "### 基礎設施偵察摘要 (Nmap)", "", "| 主機 | 名稱 | 連接埠 | 服務 | CVE |", "| --- | --- | --- | --- | --- |"]
+        for host in model['hosts']:
+            for port in host['ports']:
+                cves = ", ".join(c.get('id', '') for c in port['cves'])
+                lines.append(
+                    f"| {_cell(host['ip'])} | {_cell(host['hostname'])} | {port['port']}/{port['protocol']} | "
+                    f"{_cell((port['service'] + ' ' + port['product']).strip())} | {_cell(cves)} |"
+                )
+
+    lines += ["", "## 2. 弱點詳情分析"]
+    for finding in model['findings']:
+        lines += [
+            "",
+            f"### {finding['title']}",
+            "",
+            f"- 弱點原名: {finding['name']}",
+            f"- 風險等級: {RISK_MAPPING.get(finding['risk'], finding['risk'])}",
+            f"- 影響範圍: {len(finding['sites'])} 個網站，共 {finding['instance_count']} 個實例",
+            "",
+            "**弱點描述**",
+            "",
+            finding['description'],
+            "",
+        ]
+        ai = finding.get('ai')
+        if ai:
+            if ai.get('explanation'):
+                lines += ["**弱點分析 (AI)**", "", ai['explanation'], ""]
+            lines += ["**修復建議 (AI)**", "", ai['solution'], ""]
+        else:
+            lines += ["**修復建議**", "", finding['solution'], ""]
+        if finding['references']:
+            lines += ["**參考資料**", ""] + [f"- {ref}" for ref in finding['references']] + [""]
+
+        rows = _instance_rows(finding, max_instances)
+        lines += ["| 網站 | URI | 方法 | 參數 |", "| --- | --- | --- | --- |"] + rows
+        hidden = finding['instance_count'] - len(rows)
+        if hidden > 0:
+            lines += ["", f"(另有 {hidden} 筆受影響實例未列出)"]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,144 @@
+"""
+正規化報告模型
+將弱點模型 (services.findings) 與 Nmap / AI 分析數據整理為與輸出格式無關的結構，供各輕量寫入器共用。
+僅使用翻譯目錄與名稱對照表的離線譯文，不呼叫線上翻譯，也不載入 python-docx / matplotlib。
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config.alert_catalog import catalog_text
+from config.settings import DETAIL_GROUP_ALERTS
+from services.formatter import parse_ai_response
+from services.ai_matching import AISolutionIndex, alert_title, build_ai_index
+from services.findings import RISK_LEVELS, FindingGroup, ScanFindings
+
+# 正規化模型版本 (欄位變更時遞增)
+MODEL_VERSION = 1
+
+
+def _build_finding(group: FindingGroup, ai_index: AISolutionIndex) -> dict:
+    alert = group.alert
+    title = alert_title(alert)
+
+    finding = {
+        "id": alert.rule,
+        "plugin_id": alert.plugin_id,
+        "name": alert.name,
+        "title": title,
+        "risk": group.risk,
+        "confidence": alert.confidence,
+        "cwe": alert.cwe,
+        "wasc": alert.wasc,
+        "description": catalog_text(alert.catalog, 'desc') or alert.desc,
+        "solution": catalog_text(alert.catalog, 'solution') or alert.solution,
+        "references": [line.strip() for line in alert.reference.split('\n') if line.strip()],
+        "instance_count": group.instance_count,
+        "sites": [
+            {
+                "name": site_name,
+                "instances": [
+                    {"uri": i.uri, "method": i.method, "param": i.param, "evidence": i.evidence}
+                    for i in instances
+                ],
+            }
+            for site_name, instances in group.sites.items()
+        ],
+    }
+
+    if len(ai_index):
+        match = ai_index.match_alert(alert, title)
+        finding["ai_match"] = match.as_dict()
+        if match.content:
+            ai = parse_ai_response(match.content)
+            # 與 Word 報告相同: 沒有「修復建議」段落時以完整的 AI 建議作為修復建議
+            ai["solution"] = ai.get("solution") or match.content
+            finding["ai"] = ai
+    return finding
+
+
+def _build_hosts(nmap_data) -> List[dict]:
+    """Nmap 主機列表 (接受 Nmap 正規化結果或主機列表)"""
+    if not nmap_data:
+        return []
+    hosts = nmap_data.get('hosts', []) if isinstance(nmap_data, dict) else nmap_data
+    return [
+        {
+            "ip": host.get('ip', ''),
+            "hostname": host.get('hostname', ''),
+            "os": list(host.get('os', [])),
+            "ports": [
+                {
+                    "port": str(port.get('port', '')),
+                    "protocol": port.get('protocol', ''),
+                    "service": port.get('service', ''),
+                    "product": " ".join(p for p in (port.get('product', ''), port.get('version', '')) if p),
+                    "cves": list(port.get('cves', [])),
+                }
+                for port in host.get('ports', [])
+            ],
+        }
+        for host in hosts
+    ]
+
+
+def _match_summary(groups: List[dict], ai_index: AISolutionIndex) -> Optional[dict]:
+    """AI 建議對應方式的統計 (各發現的明細見 ai_match)"""
+    if not len(ai_index):
+        return None
+    methods: Dict[str, int] = {}
+    for finding in groups:
+        method = finding['ai_match']['method']
+        methods[method] = methods.get(method, 0) + 1
+    return {"threshold": ai_index.threshold, "entries": len(ai_index), "methods": methods}
+
+
+def build_report_model(
+    findings: ScanFindings,
+    nmap_data=None,
+    ai_data: Optional[dict] = None,
+    grouped: bool = DETAIL_GROUP_ALERTS,
+    targets: Optional[List[dict]] = None
+) -> dict:
+    """
+    建立正規化報告模型
+
+    Args:
+        findings: 弱點模型
+        nmap_data: Nmap 正規化結果 (可選)
+        ai_data: AI 分析數據 (可選)
+        grouped: 同一規則跨網站是否合併為單一發現
+        targets: 多目標合併報告的各目標摘要 (可選，見 services.portfolio.merge_scans)
+
+    Returns:
+        dict: 正規化報告 (scanner / summary / sites / findings / hosts / ai / targets)
+    """
+    ai_index = build_ai_index(ai_data, findings=findings)
+    groups = [_build_finding(g, ai_index) for g in findings.groups(grouped)]
+
+    sites = []
+    for site in findings.sites:
+        site_counts = dict.fromkeys(RISK_LEVELS, 0)
+        for alert in site.alerts:
+            site_counts[alert.risk] += 1
+        sites.append({"name": site.name, "host": site.host, "port": site.port, "risk_counts": site_counts})
+
+    return {
+        "version": MODEL_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "scanner": {"name": findings.scanner, "version": findings.version, "generated": findings.generated},
+        "summary": {
+            "risk_counts": dict(findings.risk_counts),
+            "alerts": findings.total,
+            "findings": len(groups),
+            "sites": len(sites),
+            "instances": sum(f['instance_count'] for f in groups),
+        },
+        "sites": sites,
+        "findings": groups,
+        "hosts": _build_hosts(nmap_data),
+        "ai": {
+            "executive_summary": (ai_data or {}).get('executive_summary', ''),
+            "matching": _match_summary(groups, ai_index),
+        },
+        "targets": list(targets or []),
+    }
@@ -0,0 +1,138 @@
+"""
+SARIF 2.1.0 寫入器
+ZAP 的每個發現對應一條規則與其各實例的結果；Nmap 偵測到的 CVE 另列為一個 run，
+供 CI 安全閘道與程式碼掃描平台直接匯入。
+"""
+import json
+from typing import Dict, List
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# 風險等級 -> (SARIF level, security-severity)
+_RISK_LEVELS = {
+    "High": ("error", "8.0"),
+    "Medium": ("warning", "5.0"),
+    "Low": ("note", "3.0"),
+    "Informational": ("note", "0.0"),
+}
+
+
+def _cvss_level(cvss: float) -> str:
+    if cvss >= 7.0:
+        return "error"
+    if cvss >= 4.0:
+        return "warning"
+    return "note"
+
+
+def _zap_run(model: dict) -> dict:
+    rules: List[dict] = []
+    rule_index: Dict[str, int] = {}
+    results: List[dict] = []
+
+    for finding in model['findings']:
+        level, severity = _RISK_LEVELS[finding['risk']]
+        rule_id = finding['id']
+        if rule_id not in rule_index:
+            rule_index[rule_id] = len(rules)
+            rule = {
+                "id": rule_id,
+                "name": finding['name'],
+                "shortDescription": {"text": finding['name']},
+                "fullDescription": {"text": finding['description'] or finding['name']},
+                "help": {"text": finding['solution'] or finding['name']},
+                "properties": {
+                    "security-severity": severity,
+                    "tags": ["security"] + ([f"CWE-{finding['cwe']}"] if finding['cwe'] not in ('', '-1', '0') else []),
+                },
+            }
+            if finding['references']:
+                rule["helpUri"] = finding['references'][0]
+            rules.append(rule)
+
+        message = f"{finding['name']} ({finding['risk']}, {finding['confidence'] or 'Unknown'})"
+        # 同一規則的描述隨網站而異時 (如 Vulnerable JS Library)，規則只記錄第一種描述，其餘附於結果訊息
+        rule_description = rules[rule_index[rule_id]]["fullDescription"]["text"]
+        if finding['description'] and finding['description'] != rule_description:
+            message = f"{message}: {finding['description']}"
+
+        for site in finding['sites']:
+            for instance in site['instances'] or [{"uri": site['name'], "method": "", "param": "", "evidence": ""}]:
+                result = {
+                    "ruleId": rule_id,
+                    "ruleIndex": rule_index[rule_id],
+                    "level": level,
+                    "message": {"text": message},
+                    "locations": [{"physicalLocation": {"artifactLocation": {"uri": instance['uri'] or site['name']}}}],
+                    "properties": {"site": site['name'], "method": instance['method'], "param": instance['param']},
+                }
+                if instance['evidence']:
+                    result["properties"]["evidence"] = instance['evidence']
+                results.append(result)
+
+    return {
+        "tool": {
+            "driver": {
+                "name": model['scanner']['name'],
+                "version": model['scanner']['version'],
+                "informationUri": "https://www.zaproxy.org/",
+                "rules": rules,
+            }
+        },
+        "results": results,
+    }
+
+
+def _nmap_run(model: dict) -> dict:
+    rules: List[dict] = []
+    rule_index: Dict[str, int] = {}
+    results: List[dict] = []
+
+    for host in model['hosts']:
+        for port in host['ports']:
+            for cve in port['cves']:
+                cve_id = cve.get('id', '')
+                if cve_id not in rule_index:
+                    rule_index[cve_id] = len(rules)
+                    rules.append({
+                        "id": cve_id,
+                        "shortDescription": {"text": cve_id},
+                        "properties": {"security-severity": f"{float(cve.get('cvss', 0.0)):.1f}", "tags": ["security"]},
+                    })
+                results.append({
+                    "ruleId": cve_id,
+                    "ruleIndex": rule_index[cve_id],
+                    "level": _cvss_level(float(cve.get('cvss', 0.0))),
+                    "message": {"text": f"{cve_id} on {port['service'] or 'unknown'} {port['product']}".strip()},
+                    "locations": [{"physicalLocation": {"artifactLocation": {
+                        "uri": f"{port['protocol'] or 'tcp'}://{host['ip']}:{port['port']}"
+                    }}}],
+                    "properties": {"hostname": host['hostname'], "is_exploit": bool(cve.get('is_exploit'))},
+                })
+
+    return {
+        "tool": {"driver": {"name": "Nmap", "informationUri": "https://nmap.org/", "rules": rules}},
+        "results": results,
+    }
+
+
+def to_sarif(model: dict) -> dict:
+    """
+    將正規化報告轉換為 SARIF 結構
+
+    Args:
+        model: build_report_model 的結果
+
+    Returns:
+        dict: SARIF 2.1.0 log
+    """
+    runs = [_zap_run(model)]
+    if any(port['cves'] for host in model['hosts'] for port in host['ports']):
+        runs.append(_nmap_run(model))
+    return {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION, "runs": runs}
+
+
+def render_sarif(model: dict) -> str:
+    """將正規化報告輸出為 SARIF JSON 文字 (不縮排，使用 C 實作的編碼器)"""
+    return json.dumps(to_sarif(model), ensure_ascii=False, separators=(',', ':'))
@@ -2,25 +2,18 @@ import json
 import re
 import os
 import time
-import shutil
 from datetime import datetime
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 
 # ==========================================
 # 0. 字型與環境設定 (修復亂碼關鍵)
 # ==========================================
 
-# 嘗試清除 Matplotlib 快取，確保能讀到新安裝的字型
-try:
-    cache_dir = fm.get_cachedir()
-    if os.path.exists(cache_dir):
-        shutil.rmtree(cache_dir)
-except: pass
+# Matplotlib 字型快取已於映像建置時建立 (含新安裝的字型)，不再於每次執行時清除重建
 
 # 設定中文字型優先順序
 # 容器內通常是 'Noto Sans CJK TC' 或 'Noto Sans CJK SC'